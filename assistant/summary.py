@@ -0,0 +1,65 @@
+"""
+Record counters shown to an assistant on the dashboard and profile pages.
+
+All counters come from one conditional aggregate over the assistant's
+assigned records and are cached per user under the user's record version
+(see ``cleaning.caching``), so any write to one of their records makes the
+cached summary unreachable.
+"""
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from cleaning.caching import user_version
+from cleaning.models import CleaningRecord
+
+# Versions already invalidate on every write; the timeout only bounds how
+# long summaries of inactive users stay in the cache
+SUMMARY_TIMEOUT = 60 * 60
+
+
+class AssistantSummary:
+    """Status counters and unit count of the records assigned to one user"""
+
+    FIELDS = ('total_assigned', 'total_completed', 'total_pending', 'total_in_progress', 'total_verified', 'total_units')
+
+    def __init__(self, **counters):
+        for field in self.FIELDS:
+            setattr(self, field, counters.get(field) or 0)
+
+    @classmethod
+    def cache_key(cls, user_id):
+        return f'assistant:summary:{user_id}:{user_version(user_id)}'
+
+    @classmethod
+    def compute(cls, user):
+        """Count the user's records by status in a single query"""
+        counters = CleaningRecord.objects.filter(assigned_to=user).aggregate(
+            total_assigned=Count('id'),
+            total_completed=Count('id', filter=Q(status__in=['COMPLETED', 'VERIFIED'])),
+            total_pending=Count('id', filter=Q(status='PENDING')),
+            total_in_progress=Count('id', filter=Q(status='IN_PROGRESS')),
+            total_verified=Count('id', filter=Q(status='VERIFIED')),
+            total_units=Count('unit', distinct=True),
+        )
+        return cls(**counters)
+
+    @classmethod
+    def for_user(cls, user):
+        """Return the user's summary from the cache, computing it on a miss"""
+        key = cls.cache_key(user.pk)
+        counters = cache.get(key)
+        if counters is not None:
+            return cls(**counters)
+        summary = cls.compute(user)
+        cache.set(key, summary.as_dict(), SUMMARY_TIMEOUT)
+        return summary
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    @property
+    def completion_rate(self):
+        """Completed or verified records as a percentage of all assigned records"""
+        if not self.total_assigned:
+            return 0
+        return round((self.total_completed / self.total_assigned) * 100, 1)
@@ -1,3 +1,80 @@
-from django.test import TestCase
+"""
+Tests for the assistant dashboard, profile and their cached record summary
+"""
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+from cleaning.models import CleaningRecord
+from cleaning.tests.fixtures import TestDataFactory, BaseTestCase
+from assistant.summary import AssistantSummary
+from datetime import date
 
-# Create your tests here.
+
+class AssistantSummaryTest(BaseTestCase, TestCase):
+    """Test AssistantSummary counters, caching and invalidation"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.create_test_users()
+        self.create_test_hierarchy()
+        self.other_unit = TestDataFactory.create_unit(unit_name='Other Unit', zone=self.zone, faculty=self.faculty)
+        self.activity = TestDataFactory.create_activity(unit=self.unit)
+        for day, status in enumerate(['PENDING', 'IN_PROGRESS', 'COMPLETED', 'VERIFIED', 'VERIFIED'], start=1):
+            TestDataFactory.create_cleaning_record(
+                activity=self.activity, scheduled_date=date(2025, 10, day), status=status, assigned_to=self.assistant
+            )
+        TestDataFactory.create_cleaning_record(
+            unit=self.other_unit, activity=self.activity, scheduled_date=date(2025, 10, 9), assigned_to=self.assistant
+        )
+
+    def test_counters_come_from_one_query(self):
+        """Test that every status counter is computed by a single aggregate"""
+        with self.assertNumQueries(1):
+            summary = AssistantSummary.compute(self.assistant)
+
+        self.assertEqual(summary.total_assigned, 6)
+        self.assertEqual(summary.total_completed, 3)
+        self.assertEqual(summary.total_pending, 2)
+        self.assertEqual(summary.total_in_progress, 1)
+        self.assertEqual(summary.total_verified, 2)
+        self.assertEqual(summary.total_units, 2)
+        self.assertEqual(summary.completion_rate, 50.0)
+
+    def test_summary_is_cached_until_a_record_changes(self):
+        """Test that the cached summary is reused and dropped on the user's record writes"""
+        AssistantSummary.for_user(self.assistant)
+        with self.assertNumQueries(0):
+            AssistantSummary.for_user(self.assistant)
+
+        record = CleaningRecord.objects.filter(assigned_to=self.assistant, status='PENDING').first()
+        record.status = 'COMPLETED'
+        record.save()
+        self.assertEqual(AssistantSummary.for_user(self.assistant).total_completed, 4)
+
+        record.assigned_to = None
+        record.save()
+        self.assertEqual(AssistantSummary.for_user(self.assistant).total_assigned, 5)
+
+    def test_batch_marking_invalidates(self):
+        """Test that bulk writes from the batch marking endpoint also drop the summary"""
+        AssistantSummary.for_user(self.assistant)
+        self.login_as_manager()
+        self.client.post(
+            reverse('cleaning:mark_activity_days_completed'),
+            {'items': [{'activity_id': self.activity.pk, 'date': '2025-10-20', 'assigned_to': self.assistant.pk}]},
+            content_type='application/json',
+        )
+        self.assertEqual(AssistantSummary.for_user(self.assistant).total_assigned, 7)
+
+    def test_dashboard_and_profile_share_the_summary(self):
+        """Test that both pages show the cached counters"""
+        self.login_as_assistant()
+        dashboard = self.client.get(reverse('assistant:dashboard'))
+        self.assertEqual(dashboard.context['total_assigned'], 6)
+        self.assertEqual(dashboard.context['completion_rate'], 50.0)
+        self.assertEqual(dashboard.context['total_units'], 2)
+
+        profile = self.client.get(reverse('assistant:profile'))
+        self.assertEqual(profile.context['total_completed'], 3)
+        self.assertEqual(profile.context['total_verified'], 2)
@@ -8,6 +8,7 @@ from django.db.models import Q, Count
 from cleaning.models import CleaningRecord, Unit, CleaningActivity
 from .models import Schedule, ScheduleEntry, Assistant
 from .forms import ScheduleEntryForm
+from .summary import AssistantSummary
 
 @login_required
 def dashboard(request):
@@ -17,23 +18,13 @@ def dashboard(request):
         messages.error(request, "You do not have permission to access the assistant dashboard.")
         return redirect('dashboard')
     
-    today = timezone.localdate()
+    # Status counters come from one cached aggregate
+    summary = AssistantSummary.for_user(request.user)
     
-    # Get all records assigned to this assistant
-    all_records = CleaningRecord.objects.filter(assigned_to=request.user).select_related(
-        'unit', 'activity', 'unit__zone', 'unit__section', 'unit__faculty'
-    )
-    
-    # Statistics
-    total_assigned = all_records.count()
-    total_completed = all_records.filter(status__in=['COMPLETED', 'VERIFIED']).count()
-    total_pending = all_records.filter(status='PENDING').count()
-    total_in_progress = all_records.filter(status='IN_PROGRESS').count()
-    total_verified = all_records.filter(status='VERIFIED').count()
-    
-    # Assigned units
-    assigned_unit_ids = all_records.values_list('unit_id', flat=True).distinct()
-    assigned_units = Unit.objects.filter(id__in=assigned_unit_ids).select_related('zone', 'section', 'faculty')
+    # Assigned units (lazy; only queried if the template uses it)
+    assigned_units = Unit.objects.filter(
+        id__in=CleaningRecord.objects.filter(assigned_to=request.user).values('unit_id')
+    ).select_related('zone', 'section', 'faculty')
     
     # Relevant cleaning activities for this assistant (from units assigned to them)
     my_activities_qs = CleaningActivity.objects.filter(
@@ -44,25 +35,21 @@ def dashboard(request):
     my_activities = list(my_activities_qs[:12])
     
     # Recent completed activities (completed/verified records)
-    completed_activities = all_records.filter(
+    completed_activities = CleaningRecord.objects.filter(
+        assigned_to=request.user,
         status__in=['COMPLETED', 'VERIFIED']
     ).select_related('unit', 'activity').order_by('-completed_date')[:10]
     
-    # Completion rate
-    completion_rate = 0
-    if total_assigned > 0:
-        completion_rate = round((total_completed / total_assigned) * 100, 1)
-    
     context = {
         'user': request.user,
         'assigned_units': assigned_units,
-        'total_assigned': total_assigned,
-        'total_completed': total_completed,
-        'total_pending': total_pending,
-        'total_in_progress': total_in_progress,
-        'total_verified': total_verified,
-        'completion_rate': completion_rate,
-        'total_units': assigned_units.count(),
+        'total_assigned': summary.total_assigned,
+        'total_completed': summary.total_completed,
+        'total_pending': summary.total_pending,
+        'total_in_progress': summary.total_in_progress,
+        'total_verified': summary.total_verified,
+        'completion_rate': summary.completion_rate,
+        'total_units': summary.total_units,
         'my_activities': my_activities,
         'activities_total': activities_total,
         'completed_activities': completed_activities,
@@ -140,16 +127,13 @@ def profile(request):
         messages.error(request, "You do not have permission to access the assistant profile.")
         return redirect('dashboard')
     
-    # Get statistics for the profile
-    all_records = CleaningRecord.objects.filter(assigned_to=request.user)
-    total_assigned = all_records.count()
-    total_completed = all_records.filter(status__in=['COMPLETED', 'VERIFIED']).count()
-    total_verified = all_records.filter(status='VERIFIED').count()
+    # Get statistics for the profile (shared with the dashboard's cached summary)
+    summary = AssistantSummary.for_user(request.user)
     
     context = {
         'user': request.user,
-        'total_assigned': total_assigned,
-        'total_completed': total_completed,
-        'total_verified': total_verified,
+        'total_assigned': summary.total_assigned,
+        'total_completed': summary.total_completed,
+        'total_verified': summary.total_verified,
     }
     return render(request, 'assistant/profile.html', context)
\ No newline at end of file
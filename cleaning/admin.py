@@ -1,5 +1,7 @@
-from django.contrib import admin
-from .models import Zone, Section, Faculty, Unit, CleaningActivity, CleaningRecord
+from django.contrib import admin, messages
+from django.db import IntegrityError, transaction
+from .caching import bump_activity_versions, bump_user_versions
+from .models import Zone, Section, Faculty, Unit, CleaningActivity, CleaningRecord, ActivityMonthStats, ReportJob
 
 
 @admin.register(Zone)
@@ -19,17 +21,23 @@ class ZoneAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_counts()
+    
     def get_sections_count(self, obj):
         return obj.get_sections_count()
     get_sections_count.short_description = 'Sections'
+    get_sections_count.admin_order_field = 'sections_count'
     
     def get_units_count(self, obj):
         return obj.get_units_count()
     get_units_count.short_description = 'Total Units'
+    get_units_count.admin_order_field = 'units_count'
     
     def get_faculties_count(self, obj):
         return obj.get_faculties_count()
     get_faculties_count.short_description = 'Faculties'
+    get_faculties_count.admin_order_field = 'faculties_count'
 
 
 @admin.register(Section)
@@ -53,13 +61,18 @@ class SectionAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_counts()
+    
     def get_units_count(self, obj):
         return obj.get_units_count()
     get_units_count.short_description = 'Total Units'
+    get_units_count.admin_order_field = 'units_count'
     
     def get_active_units_count(self, obj):
         return obj.get_active_units_count()
     get_active_units_count.short_description = 'Active Units'
+    get_active_units_count.admin_order_field = 'active_units_count'
 
 
 @admin.register(Faculty)
@@ -80,13 +93,18 @@ class FacultyAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_counts()
+    
     def get_units_count(self, obj):
         return obj.get_units_count()
     get_units_count.short_description = 'Total Units'
+    get_units_count.admin_order_field = 'units_count'
     
     def get_active_units_count(self, obj):
         return obj.get_active_units_count()
     get_active_units_count.short_description = 'Active Units'
+    get_active_units_count.admin_order_field = 'active_units_count'
 
 
 @admin.register(Unit)
@@ -181,11 +199,13 @@ class CleaningActivityAdmin(admin.ModelAdmin):
     
     def activate_activities(self, request, queryset):
         updated = queryset.update(is_active=True)
+        bump_activity_versions(*queryset.values_list('pk', flat=True))
         self.message_user(request, f'{updated} activity(ies) activated successfully.')
     activate_activities.short_description = 'Activate selected activities'
     
     def deactivate_activities(self, request, queryset):
         updated = queryset.update(is_active=False)
+        bump_activity_versions(*queryset.values_list('pk', flat=True))
         self.message_user(request, f'{updated} activity(ies) deactivated successfully.')
     deactivate_activities.short_description = 'Deactivate selected activities'
 
@@ -243,18 +263,66 @@ class CleaningRecordAdmin(admin.ModelAdmin):
     def mark_as_completed(self, request, queryset):
         from django.utils import timezone
         queryset = queryset.filter(status__in=['PENDING', 'IN_PROGRESS'])
-        updated = queryset.update(status='COMPLETED', completed_date=timezone.now())
+        activity_ids = list(queryset.values_list('activity_id', flat=True).distinct())
+        assignee_ids = list(queryset.values_list('assigned_to_id', flat=True).distinct())
+        try:
+            with transaction.atomic():
+                updated = queryset.update(status='COMPLETED', completed_date=timezone.now())
+        except IntegrityError:
+            # The unique completion slot constraint: nothing is updated
+            self.message_user(
+                request,
+                'No records were marked as completed: some of their time slots are already completed '
+                'for the activity, or several selected records share one slot.',
+                level=messages.ERROR,
+            )
+            return
+        ActivityMonthStats.rebuild(activity_ids)
+        bump_activity_versions(*activity_ids)
+        bump_user_versions(*assignee_ids)
         self.message_user(request, f'{updated} record(s) marked as completed.')
     mark_as_completed.short_description = 'Mark selected records as completed'
     
     def mark_as_verified(self, request, queryset):
         from django.utils import timezone
         queryset = queryset.filter(status='COMPLETED')
+        activity_ids = list(queryset.values_list('activity_id', flat=True).distinct())
+        assignee_ids = list(queryset.values_list('assigned_to_id', flat=True).distinct())
         updated = queryset.update(
             status='VERIFIED',
             verified_by=request.user,
             verified_date=timezone.now()
         )
+        ActivityMonthStats.rebuild(activity_ids)
+        bump_activity_versions(*activity_ids)
+        bump_user_versions(*assignee_ids)
         self.message_user(request, f'{updated} record(s) marked as verified.')
     mark_as_verified.short_description = 'Mark selected records as verified'
 
+
+
+@admin.register(ActivityMonthStats)
+class ActivityMonthStatsAdmin(admin.ModelAdmin):
+    list_display = ['activity', 'year', 'month', 'total', 'pending', 'in_progress', 'completed', 'verified']
+    list_filter = ['year', 'month']
+    search_fields = ['activity__activity_name', 'activity__unit__unit_name']
+    list_select_related = ['activity', 'activity__unit']
+    readonly_fields = ['activity', 'year', 'month', 'total', 'pending', 'in_progress', 'completed', 'verified']
+    
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'report_type', 'export_format', 'requested_by', 'status', 'progress', 'created_at', 'finished_at']
+    list_filter = ['status', 'report_type', 'export_format']
+    search_fields = ['requested_by__username']
+    list_select_related = ['requested_by']
+    readonly_fields = [
+        'requested_by', 'report_type', 'export_format', 'parameters', 'status', 'progress',
+        'rows_written', 'file', 'error', 'created_at', 'started_at', 'finished_at',
+    ]
+    
+    def has_add_permission(self, request):
+        return False
@@ -5,3 +5,6 @@ class CleaningConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'cleaning'
     verbose_name = 'Cleaning Management'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
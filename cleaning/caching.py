@@ -0,0 +1,83 @@
+"""
+Versioned caching for data derived from cleaning records.
+
+Each activity, and each user records are assigned to, has a version number
+in the cache. Cache keys for anything derived from the activity (or from the
+user's assigned records) include that version, so bumping it makes every
+older entry unreachable at once instead of deleting keys one by one.
+``signals.py`` bumps the versions whenever a record or activity is saved or
+deleted; code that writes records with ``bulk_create()``, ``bulk_update()``
+or ``QuerySet.update()`` must call ``bump_activity_versions()`` and
+``bump_user_versions()`` itself.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+# Rendered calendar fragments only change when their version does, so the
+# timeout just bounds how long unused entries occupy the cache
+CALENDAR_PARTIAL_TIMEOUT = 60 * 60 * 24
+
+
+def _version_key(kind, pk):
+    return f'cleaning:{kind}:{pk}:version'
+
+
+def _version(kind, pk):
+    key = _version_key(kind, pk)
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock rather than 1, so an evicted version can never
+        # come back as a number an older cache entry was stored under
+        version = time.time_ns()
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def _bump(kind, pks):
+    for pk in pks:
+        try:
+            cache.incr(_version_key(kind, pk))
+        except ValueError:
+            cache.set(_version_key(kind, pk), time.time_ns(), None)
+
+
+def _bump_versions(kind, pks):
+    """Bump versions now and again once the current transaction commits.
+
+    A request that read the new version before the commit could otherwise
+    cache data from before it under that version.
+    """
+    pks = {pk for pk in pks if pk is not None}
+    if not pks:
+        return
+    _bump(kind, pks)
+    transaction.on_commit(lambda: _bump(kind, pks))
+
+
+def activity_version(activity_id):
+    """Return the current cache version of an activity"""
+    return _version('activity', activity_id)
+
+
+def bump_activity_versions(*activity_ids):
+    """Invalidate everything cached for the given activities"""
+    _bump_versions('activity', activity_ids)
+
+
+def user_version(user_id):
+    """Return the current cache version of the records assigned to a user"""
+    return _version('user', user_id)
+
+
+def bump_user_versions(*user_ids):
+    """Invalidate everything cached from the given users' assigned records"""
+    _bump_versions('user', user_ids)
+
+
+def calendar_partial_key(activity_id, year, month, lock_nav):
+    """Cache key of a rendered calendar partial at the activity's current version"""
+    version = activity_version(activity_id)
+    return f'cleaning:calendar-partial:{activity_id}:{version}:{year}-{month:02d}:{int(lock_nav)}'
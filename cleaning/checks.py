@@ -0,0 +1,32 @@
+"""
+System checks for deployment settings the cleaning app relies on.
+"""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+PROCESS_LOCAL_CACHES = ('django.core.cache.backends.locmem.LocMemCache',)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Warn when DEBUG is off and the default cache is private to each process.
+
+    Cached calendar and summary fragments are invalidated by bumping version
+    numbers in the cache (see ``cleaning.caching``). With a process-local
+    backend, other web workers and Celery never see the bump and keep serving
+    stale fragments until they expire.
+    """
+    if settings.DEBUG:
+        return []
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Warning(
+        f'The default cache ({backend}) is private to each process while DEBUG is False.',
+        hint=(
+            'Record writes in one process cannot invalidate cached calendar and summary fragments '
+            'in another, so other workers serve stale pages. Set CACHE_REDIS_URL, or silence '
+            'cleaning.W001 only if a single process serves every request and runs every task.'
+        ),
+        id='cleaning.W001',
+    )]
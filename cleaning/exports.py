@@ -0,0 +1,330 @@
+"""
+CSV and XLSX exports for cleaning records and reports.
+
+Exports never build the whole file in memory. Record exports read the
+database with ``.iterator(chunk_size=...)`` over ``values_list`` rows, so
+no model instances or result cache accumulate. CSV is streamed to the
+client line by line through ``StreamingHttpResponse``; XLSX is written with
+openpyxl's write-only workbook into a temporary file on disk and streamed
+from there, because the zip container can only be finalised once every row
+has been written.
+
+The same row builders and writers (plus a PDF writer) are used by the
+background report jobs in ``cleaning.tasks``.
+"""
+import csv
+import tempfile
+
+from collections import namedtuple
+from datetime import date
+
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from openpyxl import Workbook
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.pdfgen import canvas
+
+from .forms import CleaningRecordFilterForm
+from .models import CleaningActivity, CleaningRecord, Faculty
+from .reports import activity_performance_stats, faculty_rollup, months_back
+
+
+EXPORT_FORMATS = ('csv', 'xlsx')
+EXPORT_CHUNK_SIZE = 2000
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+RECORD_EXPORT_HEADER = [
+    'ID', 'Scheduled Date', 'Scheduled Time', 'Zone', 'Section', 'Unit', 'Activity',
+    'Status', 'Assigned To', 'Completed Date', 'Verified By', 'Verified Date', 'Notes',
+]
+
+ACTIVITY_EXPORT_HEADER = [
+    'Unit', 'Location', 'Activity', 'Frequency', 'Expected', 'Actual',
+    'Actual %', 'Budgeted %', 'Variance',
+]
+
+
+# What a background report job writes: rows may be a generator, total is an estimate for progress
+ReportSource = namedtuple('ReportSource', ['filename', 'title', 'header', 'rows', 'total'])
+
+
+class _Echo:
+    """File-like object whose write() hands the line straight back to the caller"""
+
+    def write(self, value):
+        return value
+
+
+def _display_name(first_name, last_name, username):
+    """Return the same name get_full_name()/username would show in the templates"""
+    full_name = f"{first_name or ''} {last_name or ''}".strip()
+    return full_name or username or ''
+
+
+def filter_records(user, data):
+    """Return (records, filter_form) for the record list filters in ``data`` and ``user``'s role"""
+    records = CleaningRecord.objects.select_related(
+        'unit', 'activity', 'assigned_to', 'verified_by'
+    )
+
+    filter_form = CleaningRecordFilterForm(data)
+    if filter_form.is_valid():
+        if filter_form.cleaned_data.get('status'):
+            records = records.filter(status=filter_form.cleaned_data['status'])
+        if filter_form.cleaned_data.get('unit'):
+            records = records.filter(unit=filter_form.cleaned_data['unit'])
+        if filter_form.cleaned_data.get('assigned_to'):
+            records = records.filter(assigned_to=filter_form.cleaned_data['assigned_to'])
+        if filter_form.cleaned_data.get('date_from'):
+            records = records.filter(scheduled_date__gte=filter_form.cleaned_data['date_from'])
+        if filter_form.cleaned_data.get('date_to'):
+            records = records.filter(scheduled_date__lte=filter_form.cleaned_data['date_to'])
+
+    # Assistants see only their assigned tasks
+    if user.is_assistant():
+        records = records.filter(assigned_to=user)
+
+    return records, filter_form
+
+
+def export_records(user, data):
+    """Return the newest-first records an export for ``user`` may contain.
+
+    Applies the record list filters plus a ``faculty`` id filter; dean office
+    users tied to a faculty only ever get that faculty's records.
+    """
+    records, _ = filter_records(user, data)
+    faculty_id = str(data.get('faculty') or '')
+    if user.is_dean_office() and user.faculty_id and not (user.is_staff or user.is_superuser):
+        records = records.filter(unit__faculty_id=user.faculty_id)
+    elif faculty_id.isdigit():
+        records = records.filter(unit__faculty_id=faculty_id)
+    return records.order_by('-scheduled_date', '-scheduled_time', '-id')
+
+
+def record_export_rows(records):
+    """Yield one export row per record in ``records``, reading the database in chunks"""
+    status_labels = dict(CleaningRecord.STATUS_CHOICES)
+    rows = records.values_list(
+        'id', 'scheduled_date', 'scheduled_time',
+        'unit__zone__zone_name', 'unit__section__section_name', 'unit__unit_name',
+        'activity__activity_name', 'status',
+        'assigned_to__first_name', 'assigned_to__last_name', 'assigned_to__username',
+        'completed_date',
+        'verified_by__first_name', 'verified_by__last_name', 'verified_by__username',
+        'verified_date', 'notes',
+    )
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        (pk, scheduled_date, scheduled_time, zone, section, unit, activity, status,
+         assignee_first, assignee_last, assignee_username, completed_date,
+         verifier_first, verifier_last, verifier_username, verified_date, notes) = row
+        yield [
+            pk,
+            scheduled_date,
+            scheduled_time,
+            zone,
+            section or '',
+            unit,
+            activity or '',
+            status_labels.get(status, status),
+            _display_name(assignee_first, assignee_last, assignee_username),
+            completed_date,
+            _display_name(verifier_first, verifier_last, verifier_username),
+            verified_date,
+            notes or '',
+        ]
+
+
+def activity_export_rows(activity_stats):
+    """Yield export rows for report rows built by ``reports.build_activity_stat``"""
+    for stat in activity_stats:
+        yield [
+            stat['unit'].unit_name,
+            stat['unit'].get_full_location(),
+            stat['activity'].activity_name,
+            stat['frequency'],
+            stat['expected_completions'],
+            stat['actual_completions'],
+            stat['actual_percentage'],
+            stat['budgeted_percentage'],
+            stat['variance'],
+        ]
+
+
+def faculty_export_rows(units_data):
+    """Yield export rows for the ``units_data`` of ``reports.faculty_rollup``"""
+    for unit_data in units_data:
+        yield from activity_export_rows(unit_data['activities'])
+
+
+def _csv_value(value):
+    """Render dates and times in ISO form; everything else as str()"""
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def write_csv(output, header, rows, title='Export'):
+    """Write ``rows`` as UTF-8 CSV to the binary file ``output`` (``title`` is unused)"""
+    writer = csv.writer(_Echo())
+    output.write(writer.writerow(header).encode('utf-8'))
+    for row in rows:
+        output.write(writer.writerow([_csv_value(value) for value in row]).encode('utf-8'))
+
+
+def csv_response(filename, header, rows):
+    """Return a StreamingHttpResponse that writes ``rows`` as CSV one line at a time"""
+    writer = csv.writer(_Echo())
+
+    def lines():
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow([_csv_value(value) for value in row])
+
+    response = StreamingHttpResponse(lines(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+    return response
+
+
+def _xlsx_value(value):
+    """Excel cannot store timezone-aware datetimes; export them as naive local values"""
+    if getattr(value, 'tzinfo', None) is not None:
+        return timezone.localtime(value).replace(tzinfo=None)
+    return value
+
+
+def write_xlsx(output, header, rows, title='Export'):
+    """Write ``rows`` to ``output`` as an XLSX workbook built in write-only mode.
+
+    Write-only worksheets spool rows to disk as they are appended, so memory
+    use does not grow with the number of rows.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=title[:31])
+    sheet.append(header)
+    for row in rows:
+        sheet.append([_xlsx_value(value) for value in row])
+    workbook.save(output)
+
+
+def xlsx_response(filename, header, rows, title='Export'):
+    """Return a FileResponse streaming an XLSX workbook from a temporary file"""
+    output = tempfile.TemporaryFile()
+    write_xlsx(output, header, rows, title)
+    output.seek(0)
+    return FileResponse(
+        output, as_attachment=True, filename=f'{filename}.xlsx', content_type=XLSX_CONTENT_TYPE
+    )
+
+
+PDF_FONT = 'Helvetica'
+PDF_FONT_SIZE = 7
+PDF_LINE_HEIGHT = 10
+PDF_MARGIN = 30
+
+
+def write_pdf(output, header, rows, title='Export'):
+    """Write ``rows`` to ``output`` as a plain tabular PDF, one line per row.
+
+    Draws directly on a reportlab canvas (no platypus Table), splitting the
+    page width evenly between columns and truncating long cells.
+    """
+    page_width, page_height = landscape(A4)
+    pdf = canvas.Canvas(output, pagesize=(page_width, page_height))
+    pdf.setTitle(title)
+    column_width = (page_width - 2 * PDF_MARGIN) / len(header)
+    max_chars = max(4, int(column_width / (PDF_FONT_SIZE * 0.5)))
+
+    def draw_line(values, y, font=PDF_FONT):
+        pdf.setFont(font, PDF_FONT_SIZE)
+        for i, value in enumerate(values):
+            text = str(_csv_value(value))
+            if len(text) > max_chars:
+                text = text[:max_chars - 1] + '…'
+            pdf.drawString(PDF_MARGIN + i * column_width, y, text)
+
+    def start_page(page):
+        pdf.setFont(PDF_FONT + '-Bold', 11)
+        pdf.drawString(PDF_MARGIN, page_height - PDF_MARGIN, f"{title} (page {page})")
+        y = page_height - PDF_MARGIN - 2 * PDF_LINE_HEIGHT
+        draw_line(header, y, PDF_FONT + '-Bold')
+        return y - PDF_LINE_HEIGHT
+
+    page = 1
+    y = start_page(page)
+    for row in rows:
+        if y < PDF_MARGIN:
+            pdf.showPage()
+            page += 1
+            y = start_page(page)
+        draw_line(row, y)
+        y -= PDF_LINE_HEIGHT
+    pdf.save()
+
+
+WRITERS = {
+    'csv': write_csv,
+    'xlsx': write_xlsx,
+    'pdf': write_pdf,
+}
+
+
+def export_response(export_format, filename, header, rows, title='Export'):
+    """Return the CSV or XLSX response for ``export_format`` (one of EXPORT_FORMATS)"""
+    if export_format == 'xlsx':
+        return xlsx_response(filename, header, rows, title)
+    return csv_response(filename, header, rows)
+
+
+def _monthly_rows(periods, rows_for_month):
+    """Yield report rows for each (year, month), prefixed with the month"""
+    for year, month in periods:
+        for row in rows_for_month(year, month):
+            yield [f"{year}-{month:02d}"] + row
+
+
+def job_report_source(job):
+    """Return the ReportSource describing what ``job`` should write"""
+    parameters = job.parameters
+    user = job.requested_by
+    today = date.today()
+
+    if job.report_type == 'RECORDS':
+        records = export_records(user, parameters)
+        return ReportSource(
+            f"cleaning-records-{today.isoformat()}", 'Cleaning Records',
+            RECORD_EXPORT_HEADER, record_export_rows(records), records.count(),
+        )
+
+    year = int(parameters.get('year') or today.year)
+    month = int(parameters.get('month') or today.month)
+    periods = months_back(year, month, int(parameters.get('months') or 1))
+    header = ['Month'] + ACTIVITY_EXPORT_HEADER
+    activities = CleaningActivity.objects.filter(is_active=True)
+
+    if job.report_type == 'FACULTY':
+        faculty = Faculty.objects.get(pk=parameters['faculty'])
+        rows = _monthly_rows(
+            periods,
+            lambda y, m: faculty_export_rows(faculty_rollup(faculty, y, m)['units_data']),
+        )
+        total = activities.filter(unit__faculty=faculty, unit__is_active=True).count() * len(periods)
+        return ReportSource(
+            f"faculty-{faculty.pk}-cleaning-{year}-{month:02d}", faculty.faculty_name,
+            header, rows, total,
+        )
+
+    unit_id = parameters.get('unit')
+    if unit_id:
+        activities = activities.filter(unit_id=unit_id)
+    rows = _monthly_rows(
+        periods,
+        lambda y, m: activity_export_rows(activity_performance_stats(y, m, unit_id)),
+    )
+    return ReportSource(
+        f"activity-performance-{year}-{month:02d}", 'Performance',
+        header, rows, activities.count() * len(periods),
+    )
@@ -0,0 +1,60 @@
+"""
+Facet counts for filtered list pages.
+
+``facet_counts()`` groups a queryset by every facet column at once, so all
+facets of a page cost one ``GROUP BY`` query. The grouped rows are then
+combined in Python: each facet counts the rows that match the selections in
+the *other* facets, but ignores its own selection, so picking "Weekly" still
+shows how many "Daily" activities there are to switch to.
+"""
+from django.db.models import Count
+
+
+def facet_counts(queryset, facets, selected, labels=None):
+    """Return ``{facet: [(value, label, count), ...]}`` for ``queryset``.
+
+    ``facets`` maps a facet name to the field it groups by, ``selected`` maps
+    facet names to the chosen value (None when not filtered), and ``labels``
+    optionally maps a facet name to a field holding each value's label, or to
+    a dict of labels. Values with field labels are listed alphabetically,
+    values with dict labels in the dict's order.
+    """
+    labels = labels or {}
+    label_fields = {name: field for name, field in labels.items() if isinstance(field, str)}
+    group_fields = list(dict.fromkeys([*facets.values(), *label_fields.values()]))
+    rows = queryset.order_by().values(*group_fields).annotate(facet_count=Count('pk'))
+
+    counts = {name: {} for name in facets}
+    names = {name: {} for name in facets}
+    for row in rows:
+        matches = {
+            name: selected.get(name) is None or row[field] == selected[name]
+            for name, field in facets.items()
+        }
+        for name, field in facets.items():
+            if all(match for other, match in matches.items() if other != name):
+                value = row[field]
+                counts[name][value] = counts[name].get(value, 0) + row['facet_count']
+                if name in label_fields:
+                    names[name][value] = row[label_fields[name]]
+
+    result = {}
+    for name in facets:
+        if name in label_fields:
+            items = [(value, names[name][value], count) for value, count in counts[name].items()]
+            result[name] = sorted(items, key=lambda item: str(item[1]).lower())
+        else:
+            # Fixed labels (e.g. model choices) keep their own order
+            label_map = labels.get(name) or {}
+            order = list(label_map)
+            items = [(value, label_map.get(value, value), count) for value, count in counts[name].items()]
+            result[name] = sorted(
+                items, key=lambda item: (order.index(item[0]) if item[0] in order else len(order), str(item[1]))
+            )
+    return result
+
+
+def matching_total(facets, selected):
+    """Return how many rows match every selection, from a ``facet_counts()`` result"""
+    name, items = next(iter(facets.items()))
+    return sum(count for value, _label, count in items if selected.get(name) is None or value == selected[name])
@@ -1,10 +1,26 @@
 from django import forms
 from django.contrib.auth import get_user_model
-from .models import CleaningRecord, Unit, CleaningActivity
+from .models import CleaningRecord, Unit, CleaningActivity, Faculty, ReportJob
+from .widgets import AutocompleteSelect
 
 User = get_user_model()
 
 
+def assistant_label(user):
+    """Option label for an assistant in forms and the assistant autocomplete"""
+    return f"{user.get_full_name() or user.username} ({user.username})"
+
+
+def section_label(section):
+    """Option label for a section in forms and the section autocomplete"""
+    return section.section_name
+
+
+def unit_label(unit):
+    """Option label for a unit in forms and the unit autocomplete"""
+    return unit.get_full_location()
+
+
 class CleaningRecordForm(forms.ModelForm):
     """Form for creating and updating cleaning records"""
     
@@ -12,17 +28,15 @@ class CleaningRecordForm(forms.ModelForm):
         model = CleaningRecord
         fields = ['unit', 'activity', 'assigned_to', 'scheduled_date', 'notes']
         widgets = {
-            'unit': forms.Select(attrs={
-                'class': 'form-select',
+            'unit': AutocompleteSelect('cleaning:autocomplete_units', attrs={
                 'required': True,
                 'id': 'id_unit'
             }),
-            'activity': forms.Select(attrs={
-                'class': 'form-select',
-                'id': 'id_activity'
+            'activity': AutocompleteSelect('cleaning:autocomplete_activities', attrs={
+                'id': 'id_activity',
+                'data-autocomplete-forward': 'unit=id_unit',
             }),
-            'assigned_to': forms.Select(attrs={
-                'class': 'form-select',
+            'assigned_to': AutocompleteSelect('cleaning:autocomplete_assistants', attrs={
                 'required': True
             }),
             # Render as month picker; format is set in __init__
@@ -42,14 +56,14 @@ class CleaningRecordForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         # Filter users to show only assistants
         self.fields['assigned_to'].queryset = User.objects.filter(role='ASSISTANT')
-        self.fields['assigned_to'].label_from_instance = lambda obj: f"{obj.get_full_name() or obj.username} ({obj.username})"
+        self.fields['assigned_to'].label_from_instance = assistant_label
         
-        # Filter units to show only active units
+        # Filter units to show only active units; options load as the user types
         self.fields['unit'].queryset = Unit.objects.filter(is_active=True)
-        self.fields['unit'].label_from_instance = lambda obj: obj.get_full_location()
+        self.fields['unit'].label_from_instance = unit_label
         
-        # Activity field - will be filtered by unit via JavaScript
-        self.fields['activity'].queryset = CleaningActivity.objects.filter(is_active=True)
+        # Activity field - searched within the selected unit
+        self.fields['activity'].queryset = CleaningActivity.objects.filter(is_active=True).select_related('unit')
         self.fields['activity'].required = False
         self.fields['activity'].empty_label = "-- No specific activity (General cleaning) --"
         
@@ -129,14 +143,14 @@ class CleaningRecordFilterForm(forms.Form):
         queryset=Unit.objects.filter(is_active=True),
         required=False,
         empty_label="All Units",
-        widget=forms.Select(attrs={'class': 'form-select'})
+        widget=AutocompleteSelect('cleaning:autocomplete_units')
     )
     
     assigned_to = forms.ModelChoiceField(
         queryset=User.objects.filter(role='ASSISTANT'),
         required=False,
         empty_label="All Assistants",
-        widget=forms.Select(attrs={'class': 'form-select'})
+        widget=AutocompleteSelect('cleaning:autocomplete_assistants')
     )
     
     date_from = forms.DateField(
@@ -159,8 +173,142 @@ class CleaningRecordFilterForm(forms.Form):
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['assigned_to'].label_from_instance = lambda obj: f"{obj.get_full_name() or obj.username}"
-        self.fields['unit'].label_from_instance = lambda obj: obj.get_full_location()
+        self.fields['assigned_to'].label_from_instance = assistant_label
+        self.fields['unit'].label_from_instance = unit_label
+
+
+class ReportJobForm(CleaningRecordFilterForm):
+    """Form for queueing a background report job.
+
+    Inherits the record list filters, which apply to ``RECORDS`` jobs; the
+    faculty and month fields apply to the performance and faculty reports.
+    """
+    
+    report_type = forms.ChoiceField(
+        choices=ReportJob.TYPE_CHOICES,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    
+    export_format = forms.ChoiceField(
+        choices=ReportJob.FORMAT_CHOICES,
+        initial='csv',
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    
+    faculty = forms.ModelChoiceField(
+        queryset=Faculty.objects.select_related('zone').order_by('faculty_name'),
+        required=False,
+        empty_label="All Faculties",
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    
+    year = forms.IntegerField(
+        required=False,
+        min_value=2000,
+        max_value=2100,
+        widget=forms.NumberInput(attrs={'class': 'form-control'})
+    )
+    
+    month = forms.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=12,
+        widget=forms.NumberInput(attrs={'class': 'form-control'})
+    )
+    
+    months = forms.IntegerField(
+        initial=1,
+        required=False,
+        min_value=1,
+        max_value=24,
+        help_text="Number of months to include, counting back from the selected month",
+        widget=forms.NumberInput(attrs={'class': 'form-control'})
+    )
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get('report_type') == 'FACULTY' and not cleaned_data.get('faculty'):
+            self.add_error('faculty', 'Select the faculty to report on.')
+        return cleaned_data
+    
+    def get_parameters(self):
+        """Return the cleaned filters as JSON-serialisable job parameters"""
+        parameters = {}
+        for name, value in self.cleaned_data.items():
+            if name in ('report_type', 'export_format') or value in (None, ''):
+                continue
+            if hasattr(value, 'pk'):
+                value = value.pk
+            elif hasattr(value, 'isoformat'):
+                value = value.isoformat()
+            parameters[name] = value
+        return parameters
+
+
+class CleaningActivityFilterForm(forms.Form):
+    """Filters, facet selections and sort order for the activity browser (all from the query string)"""
+
+    SORT_CHOICES = [
+        ('location', 'Location'),
+        ('-location', 'Location (Z-A)'),
+        ('name', 'Activity name'),
+        ('-name', 'Activity name (Z-A)'),
+        ('frequency', 'Frequency'),
+        ('-frequency', 'Frequency (least often first)'),
+        ('status', 'Active first'),
+        ('-status', 'Inactive first'),
+    ]
+
+    q = forms.CharField(
+        required=False,
+        max_length=200,
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Activity name starts with...'})
+    )
+
+    unit = forms.ModelChoiceField(
+        queryset=Unit.objects.all(),
+        required=False,
+        empty_label="All Units",
+        widget=AutocompleteSelect('cleaning:autocomplete_units')
+    )
+
+    zone = forms.IntegerField(required=False, min_value=1, widget=forms.HiddenInput)
+
+    frequency = forms.ChoiceField(
+        choices=[('', 'All Frequencies')] + CleaningActivity.FREQUENCY_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+
+    is_active = forms.ChoiceField(
+        choices=[('', 'All'), ('true', 'Active Only'), ('false', 'Inactive Only')],
+        required=False,
+        label='Status',
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+
+    sort = forms.ChoiceField(
+        choices=SORT_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['unit'].label_from_instance = unit_label
+
+    def get_filters(self):
+        """Return the valid filters as a dict, leaving out empty and invalid values"""
+        if not self.is_bound:
+            return {}
+        self.is_valid()
+        filters = {
+            name: value for name, value in self.cleaned_data.items()
+            if value not in (None, '')
+        }
+        if 'is_active' in filters:
+            filters['is_active'] = filters['is_active'] == 'true'
+        return filters
 
 
 class CleaningActivityForm(forms.ModelForm):
@@ -170,8 +318,7 @@ class CleaningActivityForm(forms.ModelForm):
         model = CleaningActivity
         fields = ['unit', 'activity_name', 'description', 'frequency', 'budget_percentage', 'is_active', 'special_instructions']
         widgets = {
-            'unit': forms.Select(attrs={
-                'class': 'form-select',
+            'unit': AutocompleteSelect('cleaning:autocomplete_units', attrs={
                 'required': True
             }),
             'activity_name': forms.TextInput(attrs={
@@ -210,9 +357,9 @@ class CleaningActivityForm(forms.ModelForm):
         unit = kwargs.pop('unit', None)
         super().__init__(*args, **kwargs)
         
-        # Filter units to show only active units
+        # Filter units to show only active units; options load as the user types
         self.fields['unit'].queryset = Unit.objects.filter(is_active=True)
-        self.fields['unit'].label_from_instance = lambda obj: obj.get_full_location()
+        self.fields['unit'].label_from_instance = unit_label
         
         # If unit is provided, set it as initial and make it read-only
         if unit:
@@ -0,0 +1,223 @@
+"""
+Synthetic campus data for load and query-count testing.
+
+``generate_campus()`` writes zones, sections, faculties, assistants, units,
+activities and a history of cleaning records with ``bulk_create`` in
+batches, using a seeded random generator so the same arguments always
+produce the same data. Records are generated lazily and inserted one batch at a
+time, so millions of rows never sit in memory together.
+
+Records follow each activity's frequency: the due days and time slots come
+from ``expected_slots()``, the engine the calendar pages use, so a weekly
+activity gets one record a week and a twice-daily one two a day.
+
+Nothing runs as one long transaction: the locations, users, units and
+activities are committed together, then each batch of records commits on
+its own, and the month counters and stored anchors (which bulk inserts skip)
+are rebuilt ACTIVITY_BATCH_SIZE activities at a time. A run that fails part
+way leaves the rows written so far under its prefix.
+"""
+import random
+from collections import defaultdict, namedtuple
+from datetime import date, datetime, timedelta
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ActivityMonthStats, CleaningActivity, CleaningRecord, Faculty, Section, Unit, Zone
+from .schedule import expected_slots
+
+ACTIVITY_NAMES = (
+    'Sweep floor', 'Mop floor', 'Clean windows', 'Empty trash bins', 'Dust surfaces',
+    'Clean washrooms', 'Wipe desks', 'Vacuum carpets', 'Clean whiteboards', 'Sanitize door handles',
+)
+
+# Frequencies are weighted towards daily work, as on a real campus
+FREQUENCY_WEIGHTS = (
+    ('DAILY', 50), ('TWICE_DAILY', 10), ('EVERY_2_DAYS', 15), ('WEEKLY', 15), ('BIWEEKLY', 5), ('MONTHLY', 5),
+)
+
+# Cyclic activities start their cycle on a random day within the first
+# period, so their records are spread over the week and month
+CYCLE_DAYS = {'EVERY_2_DAYS': 2, 'WEEKLY': 7, 'BIWEEKLY': 14, 'MONTHLY': 28}
+
+# Share of past records in each status; records on or after today stay pending
+STATUS_WEIGHTS = (('VERIFIED', 40), ('COMPLETED', 45), ('IN_PROGRESS', 5), ('PENDING', 10))
+
+# Activities per month-counter and anchor rebuild; each rebuild is one short transaction
+ACTIVITY_BATCH_SIZE = 500
+
+CampusCounts = namedtuple(
+    'CampusCounts', 'zones sections faculties assistants units activities records'
+)
+
+
+def _batched(rows, batch_size):
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        yield batch
+
+
+def _month_windows(start, end):
+    """Yield (first, last) day pairs covering ``start`` to ``end`` one calendar month at a time"""
+    while start <= end:
+        next_month = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+        yield start, min(end, next_month - timedelta(days=1))
+        start = next_month
+
+
+def _choices(weights):
+    values, counts = zip(*weights)
+    return values, counts
+
+
+def generate_campus(
+    zones=3,
+    sections_per_zone=10,
+    faculties=10,
+    assistants=20,
+    units=2000,
+    activities_per_unit=5,
+    history_days=100,
+    end_date=None,
+    seed=0,
+    batch_size=5000,
+    prefix='Load',
+    progress=None,
+):
+    """Create a synthetic campus and return the CampusCounts written.
+
+    Every activity gets a record for each slot it is due in the
+    ``history_days`` days ending on ``end_date`` (today by default).
+    ``prefix`` is used in every name so several campuses can coexist;
+    ``progress`` is called with a message after each stage.
+    """
+    rng = random.Random(seed)
+    end_date = end_date or timezone.localdate()
+    report = progress or (lambda message: None)
+    User = get_user_model()
+
+    with transaction.atomic():
+        zone_objs = Zone.objects.bulk_create([
+            Zone(zone_name=f'{prefix} Zone {i + 1}') for i in range(zones)
+        ])
+        section_objs = Section.objects.bulk_create([
+            Section(zone=zone, section_name=f'{prefix} Section {zone.pk}-{i + 1}')
+            for zone in zone_objs for i in range(sections_per_zone)
+        ])
+        faculty_objs = Faculty.objects.bulk_create([
+            Faculty(faculty_name=f'{prefix} Faculty {i + 1}', zone=zone_objs[i % len(zone_objs)])
+            for i in range(faculties)
+        ])
+        # One hashed password shared by all generated users keeps this fast
+        password = make_password(f'{prefix.lower()}-assistant')
+        assistant_objs = User.objects.bulk_create([
+            User(username=f'{prefix.lower()}_assistant_{i + 1}', role='ASSISTANT', password=password)
+            for i in range(assistants)
+        ])
+        report(f'Created {zones} zones, {len(section_objs)} sections, {faculties} faculties, {assistants} assistants')
+
+        sections_by_zone = {}
+        for section in section_objs:
+            sections_by_zone.setdefault(section.zone_id, []).append(section)
+
+        def unit_rows():
+            for i in range(units):
+                zone = zone_objs[i % len(zone_objs)]
+                zone_sections = sections_by_zone.get(zone.pk)
+                section = rng.choice(zone_sections) if zone_sections else None
+                name = f'{prefix} Unit {i + 1}'
+                # bulk_create skips Unit.save(), so fill in the location path here
+                full_location = Unit.build_full_location(zone.zone_name, section and section.section_name, name)
+                yield Unit(
+                    unit_name=name,
+                    zone=zone,
+                    section=section,
+                    full_location=full_location,
+                    location_key=full_location.lower(),
+                    faculty=rng.choice(faculty_objs) if faculty_objs else None,
+                    assigned_assistant=rng.choice(assistant_objs) if assistant_objs else None,
+                    is_active=rng.random() > 0.05,
+                )
+
+        unit_objs = Unit.objects.bulk_create(list(unit_rows()), batch_size=batch_size)
+        report(f'Created {len(unit_objs)} units')
+
+        frequencies, frequency_weights = _choices(FREQUENCY_WEIGHTS)
+        first_day = end_date - timedelta(days=history_days - 1)
+
+        def activity_rows():
+            for unit in unit_objs:
+                for name in rng.sample(ACTIVITY_NAMES, min(activities_per_unit, len(ACTIVITY_NAMES))):
+                    yield CleaningActivity(
+                        unit=unit,
+                        activity_name=name,
+                        frequency=rng.choices(frequencies, frequency_weights)[0],
+                        budget_percentage=rng.choice((80, 90, 95, 100)),
+                    )
+
+        activity_objs = CleaningActivity.objects.bulk_create(list(activity_rows()), batch_size=batch_size)
+        activity_rows_db = [
+            (a.pk, a.unit.pk, a.unit.assigned_assistant_id, a.frequency,
+             first_day + timedelta(days=rng.randrange(CYCLE_DAYS.get(a.frequency, 1))))
+            for a in activity_objs
+        ]
+        report(f'Created {len(activity_rows_db)} activities')
+
+    statuses, status_weights = _choices(STATUS_WEIGHTS)
+    tz = timezone.get_current_timezone()
+
+    def record_rows():
+        # One month at a time keeps the due slots of a single month in
+        # memory while records still come out in date order
+        for window_start, window_end in _month_windows(first_day, end_date):
+            due = defaultdict(list)
+            for activity_id, unit_id, assistant_id, frequency, anchor in activity_rows_db:
+                for day, slots in expected_slots(frequency, anchor, window_start, window_end).items():
+                    for slot in slots:
+                        due[day].append((activity_id, unit_id, assistant_id, slot))
+            for day in sorted(due):
+                for activity_id, unit_id, assistant_id, slot in due[day]:
+                    status = rng.choices(statuses, status_weights)[0] if day < end_date else 'PENDING'
+                    done_at = datetime.combine(day, slot) + timedelta(hours=2)
+                    yield CleaningRecord(
+                        unit_id=unit_id,
+                        activity_id=activity_id,
+                        assigned_to_id=assistant_id,
+                        scheduled_date=day,
+                        scheduled_time=slot,
+                        status=status,
+                        completed_date=(
+                            timezone.make_aware(done_at, tz) if status in ('COMPLETED', 'VERIFIED') else None
+                        ),
+                    )
+
+    record_count = 0
+    for batch in _batched(record_rows(), batch_size):
+        with transaction.atomic():
+            CleaningRecord.objects.bulk_create(batch, batch_size=batch_size)
+        record_count += len(batch)
+        if record_count % (batch_size * 20) == 0:
+            report(f'Created {record_count} records')
+    report(f'Created {record_count} records')
+
+    activity_ids = [row[0] for row in activity_rows_db]
+    for start in range(0, len(activity_ids), ACTIVITY_BATCH_SIZE):
+        batch_ids = activity_ids[start:start + ACTIVITY_BATCH_SIZE]
+        with transaction.atomic():
+            ActivityMonthStats.rebuild(batch_ids)
+            CleaningActivity.refresh_first_record_date(batch_ids)
+    report('Rebuilt month counters and cycle anchors')
+
+    return CampusCounts(
+        zones=zones,
+        sections=len(section_objs),
+        faculties=faculties,
+        assistants=assistants,
+        units=len(unit_objs),
+        activities=len(activity_rows_db),
+        records=record_count,
+    )
@@ -0,0 +1,95 @@
+"""
+Management command to generate a synthetic campus for load testing and
+benchmarking reports and dashboards.
+Every name starts with --prefix, so generated data can sit next to real data
+and several campuses can be generated side by side.
+Example (about 1M records): --units 2000 --activities-per-unit 5 --months 4
+"""
+import time
+from calendar import monthrange
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from cleaning.load_data import ACTIVITY_NAMES, generate_campus
+from cleaning.models import Zone
+
+
+def months_before(day, months):
+    """Return the same day ``months`` months earlier, clamped to the month's length"""
+    year, month = divmod(day.year * 12 + day.month - 1 - months, 12)
+    return date(year, month + 1, min(day.day, monthrange(year, month + 1)[1]))
+
+
+class Command(BaseCommand):
+    help = 'Generate a synthetic campus (locations, activities and record history) with bulk inserts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--zones', type=int, default=3, help='Number of zones (default 3).')
+        parser.add_argument('--sections-per-zone', type=int, default=10, help='Sections in each zone (default 10).')
+        parser.add_argument('--faculties', type=int, default=10, help='Number of faculties (default 10).')
+        parser.add_argument('--assistants', type=int, default=20, help='Number of assistant users (default 20).')
+        parser.add_argument('--units', type=int, default=2000, help='Number of units (default 2000).')
+        parser.add_argument(
+            '--activities-per-unit', type=int, default=5,
+            help=f'Activities in each unit, at most {len(ACTIVITY_NAMES)} (default 5).'
+        )
+        parser.add_argument(
+            '--months', type=int, default=3,
+            help='Months of record history ending on --end-date (default 3).'
+        )
+        parser.add_argument(
+            '--end-date', type=date.fromisoformat, default=None,
+            help='Last day of history as YYYY-MM-DD (default today).'
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; the same seed gives the same data.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per INSERT (default 5000).')
+        parser.add_argument('--prefix', default='Load', help='Prefix for every generated name (default "Load").')
+
+    def handle(self, *args, **options):
+        for name in ('zones', 'units', 'batch_size'):
+            if options[name] < 1:
+                raise CommandError(f'--{name.replace("_", "-")} must be at least 1.')
+        for name in ('sections_per_zone', 'faculties', 'assistants'):
+            if options[name] < 0:
+                raise CommandError(f'--{name.replace("_", "-")} cannot be negative.')
+        if not 0 <= options['activities_per_unit'] <= len(ACTIVITY_NAMES):
+            raise CommandError(f'--activities-per-unit must be between 0 and {len(ACTIVITY_NAMES)}.')
+        if options['months'] < 1:
+            raise CommandError('--months must be at least 1.')
+
+        prefix = options['prefix']
+        if Zone.objects.filter(zone_name__startswith=f'{prefix} Zone ').exists():
+            raise CommandError(
+                f'Data with the prefix "{prefix}" already exists. Choose another --prefix '
+                'or remove it first.'
+            )
+
+        end_date = options['end_date'] or timezone.localdate()
+        history_days = (end_date - months_before(end_date, options['months'])).days
+
+        started = time.monotonic()
+
+        def progress(message):
+            self.stdout.write(f'[{time.monotonic() - started:7.1f}s] {message}')
+
+        result = generate_campus(
+            zones=options['zones'],
+            sections_per_zone=options['sections_per_zone'],
+            faculties=options['faculties'],
+            assistants=options['assistants'],
+            units=options['units'],
+            activities_per_unit=options['activities_per_unit'],
+            history_days=history_days,
+            end_date=end_date,
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            prefix=prefix,
+            progress=progress,
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {result.zones} zones, {result.sections} sections, {result.faculties} faculties, '
+            f'{result.assistants} assistants, {result.units} units, {result.activities} activities and '
+            f'{result.records} records in {time.monotonic() - started:.1f}s.'
+        ))
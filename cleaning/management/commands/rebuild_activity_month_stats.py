@@ -0,0 +1,30 @@
+"""
+Management command to rebuild the ActivityMonthStats counters and each
+activity's stored earliest record date from CleaningRecord.
+Use after bulk imports or any write that bypassed the model signals.
+Optional: --activity <id> (repeatable) to limit the rebuild.
+"""
+from django.core.management.base import BaseCommand
+from cleaning.caching import bump_activity_versions
+from cleaning.models import ActivityMonthStats, CleaningActivity
+
+
+class Command(BaseCommand):
+    help = 'Rebuild per-activity monthly record counters from scratch.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--activity', action='append', type=int, dest='activity_ids',
+            help='Only rebuild counters for this activity id (can be given more than once).'
+        )
+
+    def handle(self, *args, **options):
+        activity_ids = options.get('activity_ids')
+        ActivityMonthStats.rebuild(activity_ids)
+        CleaningActivity.refresh_first_record_date(activity_ids)
+        bump_activity_versions(*(activity_ids or CleaningActivity.objects.values_list('pk', flat=True)))
+
+        rows = ActivityMonthStats.objects.all()
+        if activity_ids:
+            rows = rows.filter(activity_id__in=activity_ids)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows.count()} activity month counter row(s).'))
@@ -0,0 +1,32 @@
+"""
+Management command to recompute every unit's stored location path
+(full_location and location_key) from its zone and section names.
+Use after bulk imports or renames done with QuerySet.update().
+Optional: --zone <id> (repeatable) to limit the rebuild.
+Also recreates the unit search triggers on SQLite if they are missing.
+"""
+from django.core.management.base import BaseCommand
+from cleaning.models import Unit
+from cleaning.search import ensure_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the stored full location path of units in one UPDATE.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--zone', action='append', type=int, dest='zone_ids',
+            help='Only rebuild units in this zone id (can be given more than once).'
+        )
+
+    def handle(self, *args, **options):
+        units = Unit.objects.all()
+        if options.get('zone_ids'):
+            units = units.filter(zone_id__in=options['zone_ids'])
+        updated = Unit.refresh_full_location(units)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt the location of {updated} unit(s).'))
+        recreated = ensure_search_index()
+        if recreated:
+            self.stdout.write(self.style.WARNING(
+                f'Recreated missing unit search triggers: {", ".join(recreated)}; the search index was rebuilt.'
+            ))
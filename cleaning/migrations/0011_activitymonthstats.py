@@ -0,0 +1,61 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+STATUS_FIELDS = {
+    'PENDING': 'pending',
+    'IN_PROGRESS': 'in_progress',
+    'COMPLETED': 'completed',
+    'VERIFIED': 'verified',
+}
+
+
+def backfill_month_stats(apps, schema_editor):
+    CleaningRecord = apps.get_model('cleaning', 'CleaningRecord')
+    ActivityMonthStats = apps.get_model('cleaning', 'ActivityMonthStats')
+    grouped = (
+        CleaningRecord.objects.filter(activity__isnull=False)
+        .order_by()
+        .annotate(year=ExtractYear('scheduled_date'), month=ExtractMonth('scheduled_date'))
+        .values('activity_id', 'year', 'month')
+        .annotate(
+            total=Count('id'),
+            **{field: Count('id', filter=Q(status=status)) for status, field in STATUS_FIELDS.items()},
+        )
+    )
+    ActivityMonthStats.objects.bulk_create([ActivityMonthStats(**row) for row in grouped], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cleaning', '0010_unit_assigned_assistant'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityMonthStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('pending', models.PositiveIntegerField(default=0)),
+                ('in_progress', models.PositiveIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('verified', models.PositiveIntegerField(default=0)),
+                ('activity', models.ForeignKey(help_text='The activity these counters belong to', on_delete=django.db.models.deletion.CASCADE, related_name='month_stats', to='cleaning.cleaningactivity')),
+            ],
+            options={
+                'verbose_name': 'Activity Month Stats',
+                'verbose_name_plural': 'Activity Month Stats',
+                'ordering': ['activity', 'year', 'month'],
+                'unique_together': {('activity', 'year', 'month')},
+            },
+        ),
+        migrations.RunPython(backfill_month_stats, migrations.RunPython.noop),
+    ]
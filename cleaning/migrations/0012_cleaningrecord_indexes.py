@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cleaning', '0011_activitymonthstats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cleaningrecord',
+            index=models.Index(fields=['activity', 'scheduled_date'], name='cleaning_rec_act_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cleaningrecord',
+            index=models.Index(condition=models.Q(('status__in', ['COMPLETED', 'VERIFIED'])), fields=['activity', 'scheduled_date'], name='cleaning_rec_act_done_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cleaningrecord',
+            index=models.Index(fields=['unit', 'scheduled_date'], name='cleaning_rec_unit_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cleaningrecord',
+            index=models.Index(fields=['assigned_to', 'status'], name='cleaning_rec_assignee_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cleaning', '0012_cleaningrecord_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cleaningrecord',
+            index=models.Index(fields=['-scheduled_date', '-scheduled_time', '-id'], name='cleaning_rec_list_order_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:58
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_duplicate_slots(apps, schema_editor):
+    """Stop the migration if completed records already share a time slot.
+
+    Races could have produced such duplicates. Which record keeps the slot is
+    a decision for an operator, so the conflicting ids are listed instead of
+    changing any record; resolve them (e.g. reset the extra records to
+    pending) and migrate again.
+    """
+    CleaningRecord = apps.get_model('cleaning', 'CleaningRecord')
+    done = CleaningRecord.objects.filter(
+        status__in=['COMPLETED', 'VERIFIED'],
+        activity__isnull=False,
+        scheduled_time__isnull=False,
+    )
+    duplicates = (
+        done.order_by()
+        .values('activity_id', 'scheduled_date', 'scheduled_time')
+        .annotate(n=Count('id'))
+        .filter(n__gt=1)
+        .order_by('activity_id', 'scheduled_date', 'scheduled_time')
+    )
+    conflicts = []
+    for slot in duplicates:
+        ids = done.filter(
+            activity_id=slot['activity_id'],
+            scheduled_date=slot['scheduled_date'],
+            scheduled_time=slot['scheduled_time'],
+        ).order_by('pk').values_list('pk', flat=True)
+        conflicts.append(
+            f"activity {slot['activity_id']} on {slot['scheduled_date']} at {slot['scheduled_time']}: "
+            f"records {', '.join(map(str, ids))}"
+        )
+    if conflicts:
+        raise RuntimeError(
+            'Cannot add cleaning_rec_unique_done_slot: these time slots have more than one completed '
+            'or verified record. Leave one completed record per slot and migrate again.\n'
+            + '\n'.join(conflicts)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cleaning', '0014_reportjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_slots, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='cleaningrecord',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['COMPLETED', 'VERIFIED'])), fields=('activity', 'scheduled_date', 'scheduled_time'), name='cleaning_rec_unique_done_slot'),
+        ),
+    ]
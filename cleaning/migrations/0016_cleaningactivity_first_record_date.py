@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:10
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_first_record_date(apps, schema_editor):
+    CleaningActivity = apps.get_model('cleaning', 'CleaningActivity')
+    CleaningRecord = apps.get_model('cleaning', 'CleaningRecord')
+    earliest = (
+        CleaningRecord.objects.filter(activity=OuterRef('pk'))
+        .order_by('scheduled_date')
+        .values('scheduled_date')[:1]
+    )
+    CleaningActivity.objects.update(first_record_date=Subquery(earliest))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cleaning', '0015_cleaningrecord_unique_done_slot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cleaningactivity',
+            name='first_record_date',
+            field=models.DateField(blank=True, editable=False, help_text='Date of the earliest cleaning record; starts the 2-day and 14-day cycles', null=True),
+        ),
+        migrations.RunPython(backfill_first_record_date, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-17 09:20
+
+from django.db import migrations
+
+# (index name, table, column) for the autocomplete prefix searches
+PREFIX_INDEXES = [
+    ('cleaning_unit_name_prefix_idx', 'cleaning_unit', 'unit_name'),
+    ('cleaning_activity_name_prefix_idx', 'cleaning_cleaningactivity', 'activity_name'),
+]
+
+
+def create_prefix_indexes(apps, schema_editor):
+    """Create indexes usable by case-insensitive ``LIKE 'abc%'`` (istartswith).
+
+    Django cannot express these portably: PostgreSQL needs the UPPER()
+    expression with text_pattern_ops, SQLite a NOCASE column index. Other
+    databases get no index.
+    """
+    vendor = schema_editor.connection.vendor
+    for name, table, column in PREFIX_INDEXES:
+        if vendor == 'postgresql':
+            schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} (UPPER({column}) text_pattern_ops)')
+        elif vendor == 'sqlite':
+            schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({column} COLLATE NOCASE)')
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor in ('postgresql', 'sqlite'):
+        for name, _table, _column in PREFIX_INDEXES:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cleaning', '0016_cleaningactivity_first_record_date'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:45
+
+from django.db import migrations, models
+from django.db.models import Case, OuterRef, Subquery, Value, When
+from django.db.models.functions import Concat, Lower
+
+SEPARATOR = ' → '
+
+
+def backfill_full_location(apps, schema_editor):
+    Unit = apps.get_model('cleaning', 'Unit')
+    Zone = apps.get_model('cleaning', 'Zone')
+    Section = apps.get_model('cleaning', 'Section')
+    zone_name = Subquery(Zone.objects.filter(pk=OuterRef('zone_id')).values('zone_name')[:1])
+    section_name = Subquery(Section.objects.filter(pk=OuterRef('section_id')).values('section_name')[:1])
+    path = Case(
+        When(section__isnull=True, then=Concat(zone_name, Value(SEPARATOR), 'unit_name')),
+        default=Concat(zone_name, Value(SEPARATOR), section_name, Value(SEPARATOR), 'unit_name'),
+        output_field=models.CharField(),
+    )
+    Unit.objects.update(full_location=path, location_key=Lower(path))
+
+
+def restore_unit_prefix_index(apps, schema_editor):
+    """Recreate the unit name prefix index from 0017.
+
+    SQLite adds these columns by rebuilding the table, which drops indexes
+    Django does not know about.
+    """
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS cleaning_unit_name_prefix_idx ON cleaning_unit (unit_name COLLATE NOCASE)'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cleaning', '0017_name_prefix_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='unit',
+            name='full_location',
+            field=models.CharField(blank=True, editable=False, help_text='Zone, section and unit names joined into one path', max_length=310),
+        ),
+        migrations.AddField(
+            model_name='unit',
+            name='location_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Lowercased full location, for case-insensitive sorting and search', max_length=310),
+        ),
+        migrations.RunPython(restore_unit_prefix_index, migrations.RunPython.noop),
+        migrations.RunPython(backfill_full_location, migrations.RunPython.noop),
+    ]
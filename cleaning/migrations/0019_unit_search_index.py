@@ -0,0 +1,65 @@
+# Generated by Django 5.2.6 on 2026-10-17 10:05
+
+from django.db import migrations
+
+# PostgreSQL: word-prefix full-text index and trigram index on the name.
+# The document expression must match PG_DOCUMENT in cleaning/search.py.
+PG_FORWARD = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    "CREATE INDEX IF NOT EXISTS cleaning_unit_search_idx ON cleaning_unit USING gin "
+    "(to_tsvector('simple', coalesce(unit_name, '') || ' ' || coalesce(description, '')))",
+    'CREATE INDEX IF NOT EXISTS cleaning_unit_name_trgm_idx ON cleaning_unit USING gin (unit_name gin_trgm_ops)',
+]
+PG_BACKWARD = [
+    'DROP INDEX IF EXISTS cleaning_unit_search_idx',
+    'DROP INDEX IF EXISTS cleaning_unit_name_trgm_idx',
+]
+
+# SQLite: an FTS5 index over the unit table's own rows, kept in step by triggers
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS cleaning_unit_fts USING fts5("
+    "unit_name, description, content='cleaning_unit', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS cleaning_unit_fts_insert AFTER INSERT ON cleaning_unit BEGIN "
+    "INSERT INTO cleaning_unit_fts(rowid, unit_name, description) "
+    "VALUES (new.id, new.unit_name, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS cleaning_unit_fts_delete AFTER DELETE ON cleaning_unit BEGIN "
+    "INSERT INTO cleaning_unit_fts(cleaning_unit_fts, rowid, unit_name, description) "
+    "VALUES ('delete', old.id, old.unit_name, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS cleaning_unit_fts_update AFTER UPDATE OF unit_name, description ON cleaning_unit BEGIN "
+    "INSERT INTO cleaning_unit_fts(cleaning_unit_fts, rowid, unit_name, description) "
+    "VALUES ('delete', old.id, old.unit_name, old.description); "
+    "INSERT INTO cleaning_unit_fts(rowid, unit_name, description) "
+    "VALUES (new.id, new.unit_name, new.description); END",
+    "INSERT INTO cleaning_unit_fts(cleaning_unit_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS cleaning_unit_fts_insert',
+    'DROP TRIGGER IF EXISTS cleaning_unit_fts_delete',
+    'DROP TRIGGER IF EXISTS cleaning_unit_fts_update',
+    'DROP TABLE IF EXISTS cleaning_unit_fts',
+]
+
+
+def create_search_index(apps, schema_editor):
+    """Create the unit search index for the database in use; other databases search without one"""
+    statements = {'postgresql': PG_FORWARD, 'sqlite': SQLITE_FORWARD}.get(schema_editor.connection.vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    statements = {'postgresql': PG_BACKWARD, 'sqlite': SQLITE_BACKWARD}.get(schema_editor.connection.vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cleaning', '0018_unit_full_location'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
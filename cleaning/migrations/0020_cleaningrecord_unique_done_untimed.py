@@ -0,0 +1,57 @@
+# Generated by Django 5.2.6 on 2026-10-17 11:20
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_duplicate_untimed(apps, schema_editor):
+    """Stop the migration if an activity has several untimed completed records on one day.
+
+    As in 0015, the conflicting ids are listed for an operator to resolve
+    (e.g. by giving the extra records their time slot) instead of changing
+    any record here.
+    """
+    CleaningRecord = apps.get_model('cleaning', 'CleaningRecord')
+    done = CleaningRecord.objects.filter(
+        status__in=['COMPLETED', 'VERIFIED'],
+        activity__isnull=False,
+        scheduled_time__isnull=True,
+    )
+    duplicates = (
+        done.order_by()
+        .values('activity_id', 'scheduled_date')
+        .annotate(n=Count('id'))
+        .filter(n__gt=1)
+        .order_by('activity_id', 'scheduled_date')
+    )
+    conflicts = []
+    for day in duplicates:
+        ids = done.filter(
+            activity_id=day['activity_id'], scheduled_date=day['scheduled_date'],
+        ).order_by('pk').values_list('pk', flat=True)
+        conflicts.append(
+            f"activity {day['activity_id']} on {day['scheduled_date']}: records {', '.join(map(str, ids))}"
+        )
+    if conflicts:
+        raise RuntimeError(
+            'Cannot add cleaning_rec_unique_done_untimed: these days have more than one completed or '
+            'verified record without a time. Give the extra records a time slot or reset them to '
+            'pending, then migrate again.\n' + '\n'.join(conflicts)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cleaning', '0019_unit_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_untimed, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='cleaningrecord',
+            constraint=models.UniqueConstraint(condition=models.Q(('scheduled_time__isnull', True), ('status__in', ['COMPLETED', 'VERIFIED'])), fields=('activity', 'scheduled_date'), name='cleaning_rec_unique_done_untimed'),
+        ),
+    ]
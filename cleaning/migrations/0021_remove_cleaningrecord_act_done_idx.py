@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-17 12:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cleaning', '0020_cleaningrecord_unique_done_untimed'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='cleaningrecord',
+            name='cleaning_rec_act_done_idx',
+        ),
+    ]
@@ -1,8 +1,54 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import ExtractMonth, ExtractYear
+from django.db.models.functions import Coalesce, Concat, Greatest, Lower
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.conf import settings
 
+# Joins the zone, section and unit names in Unit.full_location
+LOCATION_SEPARATOR = ' → '
+
+
+def _count_subquery(queryset, outer_field):
+    """Return a correlated COUNT of ``queryset`` rows whose ``outer_field`` is the outer row's pk"""
+    counted = (
+        queryset.filter(**{outer_field: OuterRef('pk')})
+        .order_by()
+        .values(outer_field)
+        .annotate(n=Count('pk'))
+        .values('n')
+    )
+    return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+
+class ZoneQuerySet(models.QuerySet):
+    def with_counts(self):
+        """Annotate sections_count, units_count and faculties_count on each zone"""
+        return self.annotate(
+            sections_count=_count_subquery(Section.objects.all(), 'zone'),
+            units_count=_count_subquery(Unit.objects.all(), 'section__zone'),
+            faculties_count=_count_subquery(Faculty.objects.all(), 'zone'),
+        )
+
+
+class SectionQuerySet(models.QuerySet):
+    def with_counts(self):
+        """Annotate units_count and active_units_count on each section"""
+        return self.annotate(
+            units_count=_count_subquery(Unit.objects.all(), 'section'),
+            active_units_count=_count_subquery(Unit.objects.filter(is_active=True), 'section'),
+        )
+
+
+class FacultyQuerySet(models.QuerySet):
+    def with_counts(self):
+        """Annotate units_count and active_units_count on each faculty"""
+        return self.annotate(
+            units_count=_count_subquery(Unit.objects.all(), 'faculty'),
+            active_units_count=_count_subquery(Unit.objects.filter(is_active=True), 'faculty'),
+        )
+
 
 class Zone(models.Model):
     """
@@ -21,24 +67,39 @@ class Zone(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ZoneQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Zone'
         verbose_name_plural = 'Zones'
         ordering = ['zone_name']
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored name so a rename can refresh the units' location paths
+        instance._zone_name = instance.__dict__.get('zone_name')
+        return instance
+    
     def __str__(self):
         return self.zone_name
     
     def get_sections_count(self):
         """Return the number of sections in this zone"""
+        if hasattr(self, 'sections_count'):
+            return self.sections_count
         return self.sections.count()
     
     def get_units_count(self):
         """Return the total number of units across all sections in this zone"""
+        if hasattr(self, 'units_count'):
+            return self.units_count
         return Unit.objects.filter(section__zone=self).count()
 
     def get_faculties_count(self):
         """Return the number of faculties associated with this zone"""
+        if hasattr(self, 'faculties_count'):
+            return self.faculties_count
         return self.faculties.count()
 
 
@@ -64,21 +125,34 @@ class Section(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = SectionQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Section'
         verbose_name_plural = 'Sections'
         ordering = ['zone', 'section_name']
         unique_together = [['zone', 'section_name']]
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored name so a rename can refresh the units' location paths
+        instance._section_name = instance.__dict__.get('section_name')
+        return instance
+    
     def __str__(self):
         return f"{self.section_name} - {self.zone.zone_name}"
     
     def get_units_count(self):
         """Return the number of units in this section"""
+        if hasattr(self, 'units_count'):
+            return self.units_count
         return self.units.count()
     
     def get_active_units_count(self):
         """Return the number of active units in this section"""
+        if hasattr(self, 'active_units_count'):
+            return self.active_units_count
         return self.units.filter(is_active=True).count()
 
 
@@ -104,6 +178,8 @@ class Faculty(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = FacultyQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Faculty'
         verbose_name_plural = 'Faculties'
@@ -116,10 +192,14 @@ class Faculty(models.Model):
     
     def get_units_count(self):
         """Return the number of units under this faculty"""
+        if hasattr(self, 'units_count'):
+            return self.units_count
         return self.units.count()
     
     def get_active_units_count(self):
         """Return the number of active units under this faculty"""
+        if hasattr(self, 'active_units_count'):
+            return self.active_units_count
         return self.units.filter(is_active=True).count()
 
 
@@ -181,6 +261,23 @@ class Unit(models.Model):
         help_text="Whether this unit is currently in use or under maintenance"
     )
     
+    # Denormalized "Zone → Section → Unit" path, so showing a location needs no
+    # joins. Set on save and refreshed by refresh_full_location() when a zone
+    # or section is renamed.
+    full_location = models.CharField(
+        max_length=310,
+        blank=True,
+        editable=False,
+        help_text="Zone, section and unit names joined into one path"
+    )
+    location_key = models.CharField(
+        max_length=310,
+        blank=True,
+        editable=False,
+        db_index=True,
+        help_text="Lowercased full location, for case-insensitive sorting and search"
+    )
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -208,15 +305,51 @@ class Unit(models.Model):
         if self.faculty and self.faculty.zone_id and self.faculty.zone_id != self.zone_id:
             raise ValidationError(f'Faculty "{self.faculty.faculty_name}" is associated with zone "{self.faculty.zone.zone_name}", which does not match the unit zone "{self.zone.zone_name}".')
     
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        path_fields = {'unit_name', 'zone', 'zone_id', 'section', 'section_id'}
+        if update_fields is None or path_fields.intersection(update_fields):
+            self.full_location = self.build_full_location(
+                self.zone.zone_name,
+                self.section.section_name if self.section_id else None,
+                self.unit_name,
+            )
+            self.location_key = self.full_location.lower()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'full_location', 'location_key'}
+        super().save(*args, **kwargs)
+    
+    @staticmethod
+    def build_full_location(zone_name, section_name, unit_name):
+        """Return the location path for the given names; ``section_name`` may be None"""
+        return LOCATION_SEPARATOR.join(name for name in (zone_name, section_name, unit_name) if name)
+    
+    @classmethod
+    def refresh_full_location(cls, units=None):
+        """Recompute the stored location path of all units, or of the ``units`` queryset, in one UPDATE"""
+        zone_name = Subquery(Zone.objects.filter(pk=OuterRef('zone_id')).values('zone_name')[:1])
+        section_name = Subquery(Section.objects.filter(pk=OuterRef('section_id')).values('section_name')[:1])
+        path = Case(
+            When(section__isnull=True, then=Concat(zone_name, Value(LOCATION_SEPARATOR), 'unit_name')),
+            default=Concat(
+                zone_name, Value(LOCATION_SEPARATOR), section_name, Value(LOCATION_SEPARATOR), 'unit_name'
+            ),
+            output_field=models.CharField(),
+        )
+        units = cls.objects.all() if units is None else units
+        return units.update(full_location=path, location_key=Lower(path))
+    
     def get_zone(self):
         """Get the zone this unit belongs to"""
         return self.zone
     
     def get_full_location(self):
         """Return the complete location hierarchy"""
-        if self.section:
-            return f"{self.zone.zone_name} → {self.section.section_name} → {self.unit_name}"
-        return f"{self.zone.zone_name} → {self.unit_name}"
+        if self.full_location:
+            return self.full_location
+        return self.build_full_location(
+            self.zone.zone_name, self.section.section_name if self.section_id else None, self.unit_name
+        )
     
     def get_administrative_info(self):
         """Return administrative information"""
@@ -239,6 +372,16 @@ class CleaningActivity(models.Model):
         ('MONTHLY', 'Monthly'),
     ]
     
+    # Occurrences per week for each frequency; also used to sum workloads in SQL
+    FREQUENCY_PER_WEEK = {
+        'TWICE_DAILY': 14,  # 2 times a day * 7 days
+        'DAILY': 7,
+        'EVERY_2_DAYS': 3.5,
+        'WEEKLY': 1,
+        'BIWEEKLY': 0.5,
+        'MONTHLY': 0.25,  # Approximately 1/4 per week
+    }
+    
     unit = models.ForeignKey(
         Unit,
         on_delete=models.CASCADE,
@@ -282,6 +425,13 @@ class CleaningActivity(models.Model):
         help_text="Budget working percentage (0-100)"
     )
     
+    first_record_date = models.DateField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Date of the earliest cleaning record; starts the 2-day and 14-day cycles"
+    )
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -294,17 +444,35 @@ class CleaningActivity(models.Model):
     def __str__(self):
         return f"{self.activity_name} - {self.unit.unit_name} ({self.get_frequency_display()})"
     
+    @classmethod
+    def extend_first_record_date(cls, activity_id, day):
+        """Move the stored earliest record date back to ``day`` if ``day`` is earlier"""
+        cls.objects.filter(pk=activity_id).filter(
+            Q(first_record_date__isnull=True) | Q(first_record_date__gt=day)
+        ).update(first_record_date=day)
+    
+    @classmethod
+    def refresh_first_record_date(cls, activity_ids=None, removed_date=None):
+        """Recompute the stored earliest record date, for all activities or the given ids.
+        
+        With ``removed_date``, only activities whose earliest date it was are
+        recomputed; a record removed from any later day cannot change it.
+        """
+        activities = cls.objects.all()
+        if activity_ids is not None:
+            activities = activities.filter(pk__in=activity_ids)
+        if removed_date is not None:
+            activities = activities.filter(first_record_date=removed_date)
+        earliest = (
+            CleaningRecord.objects.filter(activity=OuterRef('pk'))
+            .order_by('scheduled_date')
+            .values('scheduled_date')[:1]
+        )
+        activities.update(first_record_date=Subquery(earliest))
+    
     def get_frequency_per_week(self):
         """Calculate how many times per week this activity occurs"""
-        frequency_map = {
-            'TWICE_DAILY': 14,  # 2 times a day * 7 days
-            'DAILY': 7,
-            'EVERY_2_DAYS': 3.5,
-            'WEEKLY': 1,
-            'BIWEEKLY': 0.5,
-            'MONTHLY': 0.25,  # Approximately 1/4 per week
-        }
-        return frequency_map.get(self.frequency, 0)
+        return self.FREQUENCY_PER_WEEK.get(self.frequency, 0)
     
     def get_expected_completions_for_month(self, year, month):
         """Calculate expected number of completions for a given month based on frequency"""
@@ -323,18 +491,10 @@ class CleaningActivity(models.Model):
     
     def get_actual_completions_for_month(self, year, month):
         """Get actual number of completed records for a given month"""
-        from datetime import date
-        import calendar as cal
-        
-        first_day = date(year, month, 1)
-        _, dim = cal.monthrange(year, month)
-        last_day = date(year, month, dim)
-        
-        return self.cleaning_records.filter(
-            scheduled_date__gte=first_day,
-            scheduled_date__lte=last_day,
-            status__in=['COMPLETED', 'VERIFIED']
-        ).count()
+        stats = self.month_stats.filter(year=year, month=month).values('completed', 'verified').first()
+        if stats is None:
+            return 0
+        return stats['completed'] + stats['verified']
     
     def get_completion_percentage_for_month(self, year, month):
         """Calculate actual completion percentage for a given month"""
@@ -441,6 +601,31 @@ class CleaningRecord(models.Model):
         verbose_name = 'Cleaning Record'
         verbose_name_plural = 'Cleaning Records'
         ordering = ['-scheduled_date', '-scheduled_time']
+        indexes = [
+            # Calendar, day/week limit checks and anchor lookups: one activity over a date range
+            models.Index(fields=['activity', 'scheduled_date'], name='cleaning_rec_act_date_idx'),
+            # Faculty/dean views join through unit and filter by month
+            models.Index(fields=['unit', 'scheduled_date'], name='cleaning_rec_unit_date_idx'),
+            # Assistant dashboards: one assistant's records by status
+            models.Index(fields=['assigned_to', 'status'], name='cleaning_rec_assignee_idx'),
+            # Keyset-paginated record list: newest first, seek past the previous page's last row
+            models.Index(fields=['-scheduled_date', '-scheduled_time', '-id'], name='cleaning_rec_list_order_idx'),
+        ]
+        constraints = [
+            # One completion per activity time slot: backs the frequency checks when two
+            # requests race to mark the same day. NULLs are distinct in a unique index,
+            # so untimed records get their own constraint: one untimed completion a day.
+            models.UniqueConstraint(
+                fields=['activity', 'scheduled_date', 'scheduled_time'],
+                condition=Q(status__in=['COMPLETED', 'VERIFIED']),
+                name='cleaning_rec_unique_done_slot',
+            ),
+            models.UniqueConstraint(
+                fields=['activity', 'scheduled_date'],
+                condition=Q(status__in=['COMPLETED', 'VERIFIED'], scheduled_time__isnull=True),
+                name='cleaning_rec_unique_done_untimed',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.unit.unit_name} - {self.scheduled_date} ({self.get_status_display()})"
@@ -462,4 +647,189 @@ class CleaningRecord(models.Model):
     def can_be_edited(self):
         """Check if the record can be edited"""
         return self.status in ['PENDING', 'IN_PROGRESS']
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored counter bucket, anchor date and assignee so signal handlers can move them on save
+        instance._stats_key = instance.get_stats_key()
+        instance._anchor_key = instance.get_anchor_key()
+        instance._assignee_id = None if 'assigned_to_id' in instance.get_deferred_fields() else instance.assigned_to_id
+        return instance
+    
+    def get_anchor_key(self):
+        """Return the (activity_id, scheduled_date) this record contributes to its activity's anchor"""
+        deferred = self.get_deferred_fields()
+        if 'activity_id' in deferred or 'scheduled_date' in deferred or not self.activity_id:
+            return None
+        return (self.activity_id, self._meta.get_field('scheduled_date').to_python(self.scheduled_date))
+    
+    def get_stats_key(self):
+        """Return the (activity_id, year, month, status) bucket this record is counted in"""
+        if 'activity_id' in self.get_deferred_fields() or not self.activity_id:
+            return None
+        if 'scheduled_date' in self.get_deferred_fields() or 'status' in self.get_deferred_fields():
+            return None
+        scheduled_date = self._meta.get_field('scheduled_date').to_python(self.scheduled_date)
+        return (self.activity_id, scheduled_date.year, scheduled_date.month, self.status)
+
 
+class ActivityMonthStats(models.Model):
+    """
+    Pre-aggregated record counters per activity and calendar month.
+    Maintained by the CleaningRecord signal handlers in ``cleaning.signals``;
+    bulk writes that bypass signals must call ``ActivityMonthStats.rebuild()``.
+    """
+    STATUS_FIELDS = {
+        'PENDING': 'pending',
+        'IN_PROGRESS': 'in_progress',
+        'COMPLETED': 'completed',
+        'VERIFIED': 'verified',
+    }
+    
+    activity = models.ForeignKey(
+        CleaningActivity,
+        on_delete=models.CASCADE,
+        related_name='month_stats',
+        help_text="The activity these counters belong to"
+    )
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    
+    total = models.PositiveIntegerField(default=0)
+    pending = models.PositiveIntegerField(default=0)
+    in_progress = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    verified = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = 'Activity Month Stats'
+        verbose_name_plural = 'Activity Month Stats'
+        ordering = ['activity', 'year', 'month']
+        unique_together = [['activity', 'year', 'month']]
+    
+    def __str__(self):
+        return f"{self.activity_id} - {self.year}-{self.month:02d} ({self.total} records)"
+    
+    @property
+    def completed_total(self):
+        """Completed plus verified records (what the reports count as done)"""
+        return self.completed + self.verified
+    
+    @classmethod
+    def apply_delta(cls, key, delta):
+        """Add ``delta`` to the counters of the (activity_id, year, month, status) bucket"""
+        if key is None:
+            return
+        activity_id, year, month, status = key
+        # Clamped at zero: a counter that drifted low (e.g. after a queryset
+        # update that skipped the signals) must not fail the record's save
+        # on the non-negative CHECK; rebuild() puts the exact counts back
+        fields = ['total']
+        status_field = cls.STATUS_FIELDS.get(status)
+        if status_field:
+            fields.append(status_field)
+        counters = {field: Greatest(F(field) + delta, Value(0)) for field in fields}
+        rows = cls.objects.filter(activity_id=activity_id, year=year, month=month)
+        if delta > 0:
+            cls.objects.get_or_create(activity_id=activity_id, year=year, month=month)
+        rows.update(**counters)
+    
+    @classmethod
+    def rebuild(cls, activity_ids=None):
+        """Recompute counters from CleaningRecord, for all activities or the given ids"""
+        stale = cls.objects.all()
+        records = CleaningRecord.objects.filter(activity__isnull=False)
+        if activity_ids is not None:
+            stale = stale.filter(activity_id__in=activity_ids)
+            records = records.filter(activity_id__in=activity_ids)
+        
+        grouped = (
+            records.order_by()
+            .annotate(year=ExtractYear('scheduled_date'), month=ExtractMonth('scheduled_date'))
+            .values('activity_id', 'year', 'month')
+            .annotate(
+                total=Count('id'),
+                **{
+                    field: Count('id', filter=Q(status=status))
+                    for status, field in cls.STATUS_FIELDS.items()
+                },
+            )
+        )
+        with transaction.atomic():
+            stale.delete()
+            cls.objects.bulk_create([cls(**row) for row in grouped], batch_size=1000)
+
+
+
+class ReportJob(models.Model):
+    """
+    A report rendered in the background by a Celery worker.
+    The job row carries status and progress for polling; the finished
+    artifact (CSV, XLSX or PDF) is stored in ``file``.
+    """
+    TYPE_CHOICES = [
+        ('RECORDS', 'Cleaning Records'),
+        ('ACTIVITY_PERFORMANCE', 'Activity Performance'),
+        ('FACULTY', 'Faculty Cleaning Report'),
+    ]
+    
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('xlsx', 'Excel (XLSX)'),
+        ('pdf', 'PDF'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('SUCCEEDED', 'Succeeded'),
+        ('FAILED', 'Failed'),
+    ]
+    
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='report_jobs',
+        help_text="The user who requested the report"
+    )
+    report_type = models.CharField(max_length=30, choices=TYPE_CHOICES)
+    export_format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='csv')
+    parameters = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Report filters (faculty, unit, year, month, months, record filters)"
+    )
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    progress = models.PositiveSmallIntegerField(
+        default=0,
+        validators=[MaxValueValidator(100)],
+        help_text="Percentage of rows written"
+    )
+    rows_written = models.PositiveIntegerField(default=0)
+    file = models.FileField(upload_to='reports/%Y/%m/', blank=True)
+    error = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = 'Report Job'
+        verbose_name_plural = 'Report Jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['requested_by', '-created_at'], name='cleaning_reportjob_user_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_report_type_display()} ({self.get_export_format_display()}) - {self.get_status_display()}"
+    
+    @property
+    def is_finished(self):
+        return self.status in ('SUCCEEDED', 'FAILED')
+    
+    def can_view(self, user):
+        """Jobs are visible to the user who requested them and to staff"""
+        return user.pk == self.requested_by_id or user.is_staff or user.is_superuser
@@ -0,0 +1,110 @@
+"""
+Keyset (seek) pagination for cleaning records.
+
+Records are ordered newest first by ``(scheduled_date, scheduled_time, id)``,
+exactly as the ``cleaning_rec_list_order_idx`` index stores them, so the
+database reads a page straight off the index instead of sorting. Records
+with no scheduled time sit where the database puts NULLs in a descending
+index: before timed records on the same day on PostgreSQL, after them on
+SQLite and MySQL. Instead of an OFFSET, each page carries an opaque cursor naming the
+last row shown; the next page starts strictly after it, so fetching page N
+costs the same as fetching page 1 however much history exists.
+
+Page-numbered lists with sortable columns use ``sort_query()`` to build the
+links in their table headers.
+"""
+from datetime import date, time
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import F, Q
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+RECORD_ORDERING = [
+    F('scheduled_date').desc(),
+    F('scheduled_time').desc(),
+    F('id').desc(),
+]
+
+
+def get_page_size(value):
+    """Return a page size from a request parameter, clamped to 1..MAX_PAGE_SIZE"""
+    default = getattr(settings, 'CLEANING_RECORDS_PAGE_SIZE', DEFAULT_PAGE_SIZE)
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(MAX_PAGE_SIZE, size))
+
+
+def encode_cursor(record):
+    """Return the cursor string pointing just past ``record``"""
+    scheduled_time = record.scheduled_time.strftime('%H:%M:%S') if record.scheduled_time else ''
+    return f"{record.scheduled_date.isoformat()}_{scheduled_time}_{record.pk}"
+
+
+def decode_cursor(value):
+    """Parse a cursor string into (scheduled_date, scheduled_time, id); None if invalid"""
+    if not value:
+        return None
+    try:
+        date_str, time_str, pk = value.split('_')
+        return (
+            date.fromisoformat(date_str),
+            time.fromisoformat(time_str) if time_str else None,
+            int(pk),
+        )
+    except ValueError:
+        return None
+
+
+def _after_cursor(cursor, nulls_first):
+    """Return the filter selecting rows that sort strictly after ``cursor``.
+
+    ``nulls_first`` says whether untimed records come before timed ones on
+    the same day, i.e. whether the database sorts NULL as the largest value.
+    """
+    scheduled_date, scheduled_time, pk = cursor
+    if scheduled_time is None:
+        same_day = Q(scheduled_time__isnull=True, id__lt=pk)
+        if nulls_first:
+            same_day |= Q(scheduled_time__isnull=False)
+    else:
+        same_day = Q(scheduled_time__lt=scheduled_time) | Q(scheduled_time=scheduled_time, id__lt=pk)
+        if not nulls_first:
+            same_day |= Q(scheduled_time__isnull=True)
+    return Q(scheduled_date__lt=scheduled_date) | Q(scheduled_date=scheduled_date) & same_day
+
+
+def keyset_page(queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """Return (records, next_cursor) for one page of ``queryset``.
+
+    ``cursor`` is the raw request value; an invalid or missing cursor starts
+    from the first page. ``next_cursor`` is None on the last page.
+    """
+    queryset = queryset.order_by(*RECORD_ORDERING)
+    position = decode_cursor(cursor)
+    if position is not None:
+        nulls_first = connections[queryset.db].features.nulls_order_largest
+        queryset = queryset.filter(_after_cursor(position, nulls_first))
+
+    # Fetch one extra row to learn whether another page exists
+    records = list(queryset[:page_size + 1])
+    has_more = len(records) > page_size
+    records = records[:page_size]
+    next_cursor = encode_cursor(records[-1]) if has_more else None
+    return records, next_cursor
+
+
+def sort_query(params, key, current):
+    """Return ``params`` (a QueryDict) encoded to sort by ``key``, reversing it if it is already ``current``.
+
+    The page number is dropped so a new sort starts from the first page.
+    """
+    params = params.copy()
+    params.pop('page', None)
+    params['sort'] = f'-{key}' if current == key else key
+    return params.urlencode()
@@ -0,0 +1,156 @@
+"""
+Set-based report helpers for cleaning activities.
+
+The model helpers on ``CleaningActivity`` (``get_actual_completions_for_month``
+and friends) issue one query per call, which is fine for a single activity but
+turns every report into an N+1 loop. The functions here compute the same
+figures for any number of activities using a fixed number of queries, and
+return plain dicts that the report templates consume directly.
+"""
+import calendar
+from datetime import date
+
+from django.db.models import Prefetch
+
+from .models import ActivityMonthStats, CleaningActivity
+
+
+COMPLETED_STATUSES = ('COMPLETED', 'VERIFIED')
+
+
+def month_bounds(year, month):
+    """Return (first_day, last_day) for the given month"""
+    _, days_in_month = calendar.monthrange(year, month)
+    return date(year, month, 1), date(year, month, days_in_month)
+
+
+def completion_percentage(actual, expected):
+    """Return actual/expected as a percentage rounded to 2 places (0 if nothing expected)"""
+    if not expected:
+        return 0
+    return round((actual / expected) * 100, 2)
+
+
+def completion_counts_for_month(year, month, activity_ids=None):
+    """Return {activity_id: completed_count} for the month in a single query.
+
+    Reads the pre-aggregated ``ActivityMonthStats`` rows rather than scanning
+    ``CleaningRecord``. Activities without any completed/verified records are
+    absent from the result. Pass ``activity_ids`` (a list or a values_list
+    queryset) to limit the lookup to a subset of activities.
+    """
+    stats = ActivityMonthStats.objects.filter(year=year, month=month)
+    if activity_ids is not None:
+        stats = stats.filter(activity_id__in=activity_ids)
+
+    rows = stats.order_by().values_list('activity_id', 'completed', 'verified')
+    return {
+        activity_id: completed + verified
+        for activity_id, completed, verified in rows
+        if completed + verified
+    }
+
+
+def build_activity_stat(activity, year, month, actual):
+    """Return the per-activity report row used by the performance templates"""
+    expected = activity.get_expected_completions_for_month(year, month)
+    actual_pct = completion_percentage(actual, expected)
+    budgeted_pct = float(activity.budget_percentage)
+    variance = round(actual_pct - budgeted_pct, 2)
+    return {
+        'activity': activity,
+        'unit': activity.unit,
+        'frequency': activity.get_frequency_display(),
+        'expected_completions': expected,
+        'actual_completions': actual,
+        'actual_percentage': actual_pct,
+        'budgeted_percentage': budgeted_pct,
+        'variance': variance,
+        'variance_class': 'text-success' if variance >= 0 else 'text-danger',
+    }
+
+
+def activity_performance_rows(activities, year, month):
+    """Return report rows for every activity in ``activities`` for the month.
+
+    Costs two queries in total: one read of the month's ``ActivityMonthStats``
+    rows (filtered by a subquery on ``activities``) and one for the activities
+    themselves. The queryset should ``select_related`` whatever the template
+    renders for each row.
+    """
+    counts = completion_counts_for_month(year, month, activities.values('pk'))
+    return [
+        build_activity_stat(activity, year, month, counts.get(activity.pk, 0))
+        for activity in activities
+    ]
+
+
+def activity_performance_stats(year, month, unit_id=None):
+    """Return performance rows for all active activities, sorted by location and name"""
+    activities = (
+        CleaningActivity.objects.filter(is_active=True)
+        .select_related('unit')
+        .order_by('unit__location_key', 'activity_name')
+    )
+    if unit_id:
+        activities = activities.filter(unit_id=unit_id)
+
+    return activity_performance_rows(activities, year, month)
+
+
+def months_back(year, month, count):
+    """Return ``count`` (year, month) pairs ending at the given month, oldest first"""
+    index = year * 12 + (month - 1)
+    return [(i // 12, i % 12 + 1) for i in range(index - count + 1, index + 1)]
+
+
+def faculty_rollup(faculty, year, month):
+    """Return unit-level and faculty-level completion figures for a faculty.
+
+    Costs three queries however many units the faculty has: the active units,
+    their active activities (prefetched), and one read of the month counters.
+    Returns a dict with ``units_data`` (one entry per unit, in the shape
+    ``faculty_cleaning_report.html`` expects) and faculty totals.
+    """
+    activities = CleaningActivity.objects.filter(is_active=True).order_by('activity_name')
+    units = list(
+        faculty.units.filter(is_active=True)
+        .prefetch_related(Prefetch('cleaning_activities', queryset=activities, to_attr='active_activities'))
+    )
+    counts = completion_counts_for_month(
+        year, month,
+        activities.filter(unit__faculty=faculty, unit__is_active=True).values('pk'),
+    )
+
+    units_data = []
+    total_activities = 0
+    total_expected = 0
+    total_actual = 0
+    for unit in units:
+        activity_stats = [
+            build_activity_stat(activity, year, month, counts.get(activity.pk, 0))
+            for activity in unit.active_activities
+        ]
+        unit_expected = sum(stat['expected_completions'] for stat in activity_stats)
+        unit_actual = sum(stat['actual_completions'] for stat in activity_stats)
+
+        units_data.append({
+            'unit': unit,
+            'activities': activity_stats,
+            'activity_count': len(activity_stats),
+            'total_expected': unit_expected,
+            'total_actual': unit_actual,
+            'completion_percentage': completion_percentage(unit_actual, unit_expected),
+        })
+        total_activities += len(activity_stats)
+        total_expected += unit_expected
+        total_actual += unit_actual
+
+    return {
+        'units_data': units_data,
+        'total_units': len(units),
+        'total_activities': total_activities,
+        'total_expected': total_expected,
+        'total_actual': total_actual,
+        'faculty_completion_pct': completion_percentage(total_actual, total_expected),
+    }
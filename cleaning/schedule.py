@@ -0,0 +1,254 @@
+"""
+Frequency rule engine for cleaning activities.
+
+One place decides, for an activity, which days and time slots are expected
+and whether another record may be added on a given day. The calendar pages,
+the mark-completed API and calendar-driven record creation all use it.
+
+``ActivitySchedule.load()`` costs one query: a ``RecordSnapshot`` of the
+activity's records over the month, widened to whole Monday-Sunday weeks.
+The anchor (the date of the earliest record, which starts the 2-day and
+14-day cycles) is read from ``CleaningActivity.first_record_date``, which is
+maintained as records are written. Everything else is evaluated in memory; accepted days
+are added to the snapshot so later days in the same batch see them, exactly
+as if each record had been saved and the counts re-queried.
+"""
+import calendar
+from collections import defaultdict
+from datetime import date, time, timedelta
+
+from django.utils import timezone
+
+from .models import CleaningRecord
+
+
+COMPLETED_STATUSES = ('COMPLETED', 'VERIFIED')
+
+# Default time slots used when creating records
+AM_SLOT = time(9, 0)
+PM_SLOT = time(15, 0)
+TWICE_DAILY_SLOTS = (AM_SLOT, PM_SLOT)
+
+
+def week_bounds(day):
+    """Return the Monday and Sunday of the week containing ``day``"""
+    week_start = day - timedelta(days=day.weekday())
+    return week_start, week_start + timedelta(days=6)
+
+
+def month_snapshot_range(year, month):
+    """Return the date range a snapshot needs to check any day in the month.
+
+    Weekly limits look at whole Monday-Sunday weeks, so the range is widened
+    to the weeks containing the first and last day of the month.
+    """
+    _, days_in_month = calendar.monthrange(year, month)
+    start, _ = week_bounds(date(year, month, 1))
+    _, end = week_bounds(date(year, month, days_in_month))
+    return start, end
+
+
+def days_snapshot_range(days):
+    """Return the date range a snapshot needs to check each of ``days``"""
+    first, last = min(days), max(days)
+    start, _ = month_snapshot_range(first.year, first.month)
+    _, end = month_snapshot_range(last.year, last.month)
+    return start, end
+
+
+class RecordSnapshot:
+    """Per-day records, counts and times for one activity over a date range"""
+
+    RECORD_FIELDS = ('id', 'scheduled_date', 'scheduled_time', 'status', 'assigned_to_id')
+
+    def __init__(self, start, end, records=()):
+        self.start = start
+        self.end = end
+        self._day_records = defaultdict(list)
+        self._day_count = defaultdict(int)
+        self._day_times = defaultdict(set)
+        self._completed_days = defaultdict(int)
+        for record in records:
+            self._day_records[record['scheduled_date']].append(record)
+            self.add(record['scheduled_date'], record['scheduled_time'], record['status'])
+
+    @classmethod
+    def load(cls, activity, start, end):
+        """Read the activity's records between ``start`` and ``end`` in one query"""
+        records = CleaningRecord.objects.filter(
+            activity=activity,
+            scheduled_date__gte=start,
+            scheduled_date__lte=end,
+        ).order_by('scheduled_date', 'scheduled_time', 'id').values(*cls.RECORD_FIELDS)
+        return cls(start, end, records)
+
+    def add(self, scheduled_date, scheduled_time, status):
+        """Count a record (existing or about to be created) in the snapshot"""
+        self._day_count[scheduled_date] += 1
+        if scheduled_time:
+            self._day_times[scheduled_date].add(scheduled_time)
+        if status in COMPLETED_STATUSES:
+            self._completed_days[scheduled_date] += 1
+
+    def complete(self, record):
+        """Count a loaded record row as completed once it is about to be marked so"""
+        if record['status'] not in COMPLETED_STATUSES:
+            self._completed_days[record['scheduled_date']] += 1
+        record['status'] = 'COMPLETED'
+
+    def records_on(self, day):
+        """Loaded record rows (dicts of RECORD_FIELDS) scheduled on ``day``"""
+        return self._day_records.get(day, [])
+
+    def day_count(self, day):
+        """Records of any status on ``day``"""
+        return self._day_count[day]
+
+    def day_times(self, day):
+        """Scheduled times already used on ``day``"""
+        return self._day_times[day]
+
+    def completed_between(self, start, end):
+        """Completed or verified records from ``start`` to ``end`` inclusive"""
+        return sum(n for d, n in self._completed_days.items() if start <= d <= end)
+
+    def week_completed(self, day):
+        """Completed or verified records in the Monday-Sunday week of ``day``"""
+        return self.completed_between(*week_bounds(day))
+
+    def month_completed(self, day):
+        """Completed or verified records in the calendar month of ``day``"""
+        _, days_in_month = calendar.monthrange(day.year, day.month)
+        return self.completed_between(day.replace(day=1), day.replace(day=days_in_month))
+
+    def free_slots(self, day, slots):
+        """Return the slot times from ``slots`` not yet used on ``day``"""
+        used = self.day_times(day)
+        return [slot for slot in slots if slot not in used]
+
+
+def check_day(frequency, anchor, snapshot, day):
+    """Return an error message if the frequency rules forbid another record on ``day``, else None.
+
+    ``anchor`` is the start of the 2-day and 14-day cycles; pass None when the
+    activity has no records yet, so that any day may start the cycle.
+    """
+    day_count = snapshot.day_count(day)
+
+    if frequency == 'TWICE_DAILY':
+        if day_count >= 2:
+            return 'Already marked twice for this day.'
+        return None
+
+    if frequency == 'EVERY_2_DAYS':
+        if anchor and (day - anchor).days % 2 != 0:
+            return f'This day is not part of the 2-day cycle starting on {anchor}.'
+    elif frequency == 'WEEKLY':
+        if snapshot.week_completed(day) >= 1:
+            return 'Weekly limit reached for this week.'
+    elif frequency == 'BIWEEKLY':
+        if anchor and (day - anchor).days % 14 != 0:
+            return f'This day is not part of the 14-day cycle starting on {anchor}.'
+    elif frequency == 'MONTHLY':
+        if snapshot.month_completed(day) >= 1:
+            return 'Monthly limit reached for this month.'
+    elif frequency != 'DAILY':
+        return 'Unknown frequency.'
+
+    if day_count >= 1:
+        return 'Already marked for this day.'
+    return None
+
+
+def expected_slots(frequency, anchor, start, end):
+    """Return {date: [slot times]} for the days between ``start`` and ``end`` the activity is due.
+
+    Cyclic frequencies step from the first due day instead of testing every
+    day: every 2 days, weekly and biweekly count from ``anchor``; monthly
+    falls on the anchor's day of the month (clamped to short months).
+    """
+    if start > end:
+        return {}
+    if frequency in ('TWICE_DAILY', 'DAILY'):
+        slots = list(TWICE_DAILY_SLOTS) if frequency == 'TWICE_DAILY' else [AM_SLOT]
+        return {start + timedelta(days=i): slots for i in range((end - start).days + 1)}
+
+    periods = {'EVERY_2_DAYS': 2, 'WEEKLY': 7, 'BIWEEKLY': 14}
+    if frequency in periods:
+        period = periods[frequency]
+        day = start + timedelta(days=(anchor - start).days % period)
+        expected = {}
+        while day <= end:
+            expected[day] = [AM_SLOT]
+            day += timedelta(days=period)
+        return expected
+
+    if frequency == 'MONTHLY':
+        expected = {}
+        year, month = start.year, start.month
+        while date(year, month, 1) <= end:
+            _, days_in_month = calendar.monthrange(year, month)
+            day = date(year, month, min(anchor.day, days_in_month))
+            if start <= day <= end:
+                expected[day] = [AM_SLOT]
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return expected
+
+    return {}
+
+
+class ActivitySchedule:
+    """An activity's frequency rules bound to its anchor and a record snapshot"""
+
+    def __init__(self, activity, anchor, snapshot):
+        self.activity = activity
+        self.frequency = activity.frequency
+        self.anchor = anchor
+        self.snapshot = snapshot
+
+    @classmethod
+    def load(cls, activity, year, month):
+        """Load the record snapshot needed for any day of the month"""
+        snapshot = RecordSnapshot.load(activity, *month_snapshot_range(year, month))
+        return cls(activity, activity.first_record_date, snapshot)
+
+    @property
+    def display_anchor(self):
+        """Anchor for showing expected days: the first record, else the activity's creation date"""
+        if self.anchor:
+            return self.anchor
+        created_at = getattr(self.activity, 'created_at', None)
+        return timezone.localtime(created_at).date() if created_at else self.snapshot.start
+
+    def expected_slots(self, start, end):
+        """Return {date: [slot times]} of due days between ``start`` and ``end``"""
+        return expected_slots(self.frequency, self.display_anchor, start, end)
+
+    def check(self, day, anchor=None):
+        """Return the error message forbidding another record on ``day``, or None"""
+        return check_day(self.frequency, self.anchor or anchor, self.snapshot, day)
+
+    def plan(self, days, status='COMPLETED', start_anchor=None):
+        """Return [(day, [slot times])] for each of ``days`` that may take new records.
+
+        Days are evaluated in order against the snapshot, and every accepted
+        record is added to it. ``start_anchor`` starts the cycles when the
+        activity has no records yet. TWICE_DAILY days are filled up to two
+        records, taking the free default slots first.
+        """
+        planned = []
+        for day in days:
+            if self.check(day, start_anchor):
+                continue
+            if self.frequency == 'TWICE_DAILY':
+                free = self.snapshot.free_slots(day, TWICE_DAILY_SLOTS)
+                slot_times = [
+                    free[i] if i < len(free) else None
+                    for i in range(2 - self.snapshot.day_count(day))
+                ]
+            else:
+                slot_times = [AM_SLOT]
+            for slot_time in slot_times:
+                self.snapshot.add(day, slot_time, status)
+            planned.append((day, slot_times))
+        return planned
@@ -0,0 +1,136 @@
+"""
+Ranked full-text search over unit names and descriptions.
+
+``search_units()`` narrows a ``Unit`` queryset to the units matching a
+search box query and annotates each with ``search_rank`` (higher is
+better). Every word of the query must match the start of a word in the name
+or description, so "chem lab" finds "Chemistry Lab A".
+
+- PostgreSQL: a ``to_tsvector('simple', ...)`` GIN expression index answers
+  the word-prefix match, and a pg_trgm GIN index on the name also matches
+  misspellings ("labratory"). Rank is ``ts_rank`` plus name similarity.
+- SQLite: the external-content FTS5 table ``cleaning_unit_fts``, kept in
+  step with ``cleaning_unit`` by triggers, ranked with ``bm25()``.
+- Other databases: unranked ``icontains``.
+
+Migration 0019 creates the indexes, the FTS5 table and its triggers. The
+SQL below must keep using the same expressions for the indexes to be used.
+A later migration that makes SQLite rebuild ``cleaning_unit`` drops the
+triggers, so ``ensure_search_index()`` runs after every ``migrate`` (and in
+``rebuild_unit_locations``) to recreate missing triggers and re-sync the
+FTS table.
+"""
+import logging
+import re
+
+from django.db import connection, connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+# Same expression as the cleaning_unit_search_idx index; the columns are
+# qualified because zone and section (often joined) have a description too
+PG_DOCUMENT = (
+    "to_tsvector('simple', coalesce(cleaning_unit.unit_name, '') || ' ' || coalesce(cleaning_unit.description, ''))"
+)
+
+# The FTS sync triggers, as created by migration 0019
+SQLITE_FTS_TRIGGERS = {
+    'cleaning_unit_fts_insert': (
+        "CREATE TRIGGER IF NOT EXISTS cleaning_unit_fts_insert AFTER INSERT ON cleaning_unit BEGIN "
+        "INSERT INTO cleaning_unit_fts(rowid, unit_name, description) "
+        "VALUES (new.id, new.unit_name, new.description); END"
+    ),
+    'cleaning_unit_fts_delete': (
+        "CREATE TRIGGER IF NOT EXISTS cleaning_unit_fts_delete AFTER DELETE ON cleaning_unit BEGIN "
+        "INSERT INTO cleaning_unit_fts(cleaning_unit_fts, rowid, unit_name, description) "
+        "VALUES ('delete', old.id, old.unit_name, old.description); END"
+    ),
+    'cleaning_unit_fts_update': (
+        "CREATE TRIGGER IF NOT EXISTS cleaning_unit_fts_update AFTER UPDATE OF unit_name, description "
+        "ON cleaning_unit BEGIN "
+        "INSERT INTO cleaning_unit_fts(cleaning_unit_fts, rowid, unit_name, description) "
+        "VALUES ('delete', old.id, old.unit_name, old.description); "
+        "INSERT INTO cleaning_unit_fts(rowid, unit_name, description) "
+        "VALUES (new.id, new.unit_name, new.description); END"
+    ),
+}
+
+logger = logging.getLogger(__name__)
+
+# Name matches outweigh description matches in the SQLite ranking
+FTS_NAME_WEIGHT = 10.0
+FTS_DESCRIPTION_WEIGHT = 1.0
+
+
+def ensure_search_index(using='default'):
+    """Recreate missing SQLite FTS sync triggers and re-sync the index; return the recreated names.
+
+    Does nothing on other databases, or before migration 0019 created the
+    FTS table.
+    """
+    db = connections[using]
+    if db.vendor != 'sqlite':
+        return []
+    with db.cursor() as cursor:
+        cursor.execute(
+            "SELECT type, name FROM sqlite_master WHERE name = 'cleaning_unit_fts' "
+            "OR (type = 'trigger' AND tbl_name = 'cleaning_unit')"
+        )
+        present = {name for _type, name in cursor.fetchall()}
+        if 'cleaning_unit_fts' not in present:
+            return []
+        missing = [name for name in SQLITE_FTS_TRIGGERS if name not in present]
+        if missing:
+            logger.warning('Recreating unit search triggers %s and rebuilding the index', ', '.join(missing))
+            for name in missing:
+                cursor.execute(SQLITE_FTS_TRIGGERS[name])
+            # Writes made while a trigger was missing never reached the index
+            cursor.execute("INSERT INTO cleaning_unit_fts(cleaning_unit_fts) VALUES ('rebuild')")
+    return missing
+
+
+def search_terms(query):
+    """Return the lowercased words of ``query``; punctuation and operators are dropped"""
+    return re.findall(r'\w+', (query or '').lower())
+
+
+def search_units(queryset, query):
+    """Return ``queryset`` narrowed to units matching ``query``, annotated with ``search_rank``.
+
+    A query without any words returns ``queryset`` unchanged (and unannotated).
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+
+    if connection.vendor == 'postgresql':
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        text = ' '.join(terms)
+        matches = RawSQL(
+            f"({PG_DOCUMENT} @@ to_tsquery('simple', %s) OR cleaning_unit.unit_name %% %s)",
+            (tsquery, text),
+            output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            f"ts_rank({PG_DOCUMENT}, to_tsquery('simple', %s)) + similarity(cleaning_unit.unit_name, %s)",
+            (tsquery, text),
+            output_field=FloatField(),
+        )
+        return queryset.filter(matches).annotate(search_rank=rank)
+
+    if connection.vendor == 'sqlite':
+        # Join the FTS5 table so the match runs once and bm25() (lower is
+        # better) ranks each hit; a correlated subquery per unit would
+        # re-run the match for every row
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return queryset.extra(
+            select={'search_rank': f'-bm25(cleaning_unit_fts, {FTS_NAME_WEIGHT}, {FTS_DESCRIPTION_WEIGHT})'},
+            tables=['cleaning_unit_fts'],
+            where=['cleaning_unit_fts.rowid = cleaning_unit.id', 'cleaning_unit_fts MATCH %s'],
+            params=[match],
+        )
+
+    condition = Q()
+    for term in terms:
+        condition &= Q(unit_name__icontains=term) | Q(description__icontains=term)
+    return queryset.filter(condition).annotate(search_rank=Value(0.0, output_field=FloatField()))
@@ -0,0 +1,127 @@
+"""
+Signal handlers that keep denormalized and cached data in step with
+CleaningRecord and CleaningActivity writes, and unit location paths in step
+with zone and section renames.
+
+Only model-level saves and deletes fire these handlers. Code paths that use
+``QuerySet.update()`` or ``bulk_create()`` on records must refresh the
+counters themselves with ``ActivityMonthStats.rebuild(activity_ids)``, keep
+``CleaningActivity.first_record_date`` current with
+``extend_first_record_date``/``refresh_first_record_date`` and invalidate
+caches with ``bump_activity_versions(*activity_ids)`` and
+``bump_user_versions(*assignee_ids)``. Renaming zones or sections with
+``update()`` needs ``Unit.refresh_full_location(units)`` afterwards.
+
+After ``migrate``, missing SQLite unit search triggers are recreated (a
+table rebuild drops them; see ``cleaning.search``).
+"""
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from .caching import bump_activity_versions, bump_user_versions
+from .models import ActivityMonthStats, CleaningActivity, CleaningRecord, Section, Unit, Zone
+from .search import ensure_search_index
+
+
+# The cache handlers are connected before the counter handlers, which replace
+# ``_stats_key`` (and with it the record's previous activity) on save.
+@receiver(post_save, sender=CleaningRecord)
+@receiver(post_delete, sender=CleaningRecord)
+def invalidate_record_caches(sender, instance, raw=False, **kwargs):
+    """Invalidate cached data of the record's activity and assignee, and of the previous ones"""
+    if raw:
+        return
+    old_key = getattr(instance, '_stats_key', None)
+    bump_activity_versions(instance.activity_id, old_key[0] if old_key else None)
+    bump_user_versions(instance.assigned_to_id, getattr(instance, '_assignee_id', None))
+    instance._assignee_id = instance.assigned_to_id
+
+
+@receiver(post_save, sender=CleaningActivity)
+@receiver(post_delete, sender=CleaningActivity)
+def invalidate_activity_cache(sender, instance, raw=False, **kwargs):
+    """Invalidate cached data of a changed or deleted activity"""
+    if raw:
+        return
+    bump_activity_versions(instance.pk)
+
+
+@receiver(post_save, sender=CleaningRecord)
+def update_month_stats_on_save(sender, instance, raw=False, **kwargs):
+    """Move the record between month counters when its activity, month or status changes"""
+    if raw:
+        return
+    old_key = getattr(instance, '_stats_key', None)
+    new_key = instance.get_stats_key()
+    if old_key != new_key:
+        ActivityMonthStats.apply_delta(old_key, -1)
+        ActivityMonthStats.apply_delta(new_key, 1)
+    instance._stats_key = new_key
+
+
+@receiver(post_delete, sender=CleaningRecord)
+def update_month_stats_on_delete(sender, instance, **kwargs):
+    """Remove a deleted record from its month counters"""
+    ActivityMonthStats.apply_delta(getattr(instance, '_stats_key', None), -1)
+    instance._stats_key = None
+
+
+@receiver(post_save, sender=CleaningRecord)
+def update_first_record_date_on_save(sender, instance, raw=False, **kwargs):
+    """Keep the activity's stored earliest record date in step with the record's date"""
+    if raw:
+        return
+    old_key = getattr(instance, '_anchor_key', None)
+    new_key = instance.get_anchor_key()
+    if old_key != new_key:
+        if new_key:
+            CleaningActivity.extend_first_record_date(*new_key)
+        if old_key and (not new_key or old_key[0] != new_key[0] or new_key[1] > old_key[1]):
+            # The record left its old date, which may have been the earliest one
+            CleaningActivity.refresh_first_record_date([old_key[0]], removed_date=old_key[1])
+    instance._anchor_key = new_key
+
+
+@receiver(post_delete, sender=CleaningRecord)
+def update_first_record_date_on_delete(sender, instance, **kwargs):
+    """Recompute the activity's earliest record date if the deleted record held it"""
+    key = getattr(instance, '_anchor_key', None)
+    if key:
+        CleaningActivity.refresh_first_record_date([key[0]], removed_date=key[1])
+    instance._anchor_key = None
+
+
+@receiver(post_save, sender=CleaningActivity)
+def restore_first_record_date_on_activity_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Recompute the earliest record date after a save that may have written a stale copy of it"""
+    if raw or created:
+        return
+    if update_fields is None or 'first_record_date' in update_fields:
+        CleaningActivity.refresh_first_record_date([instance.pk])
+
+
+@receiver(post_save, sender=Zone)
+def refresh_unit_locations_on_zone_rename(sender, instance, created, raw=False, **kwargs):
+    """Rewrite the location path of every unit in a renamed zone"""
+    if raw or created:
+        return
+    if getattr(instance, '_zone_name', None) != instance.zone_name:
+        Unit.refresh_full_location(Unit.objects.filter(zone=instance))
+    instance._zone_name = instance.zone_name
+
+
+@receiver(post_save, sender=Section)
+def refresh_unit_locations_on_section_rename(sender, instance, created, raw=False, **kwargs):
+    """Rewrite the location path of every unit in a renamed section"""
+    if raw or created:
+        return
+    if getattr(instance, '_section_name', None) != instance.section_name:
+        Unit.refresh_full_location(Unit.objects.filter(section=instance))
+    instance._section_name = instance.section_name
+
+
+@receiver(post_migrate)
+def ensure_unit_search_index(sender, using, **kwargs):
+    """Recreate the unit search triggers if a migration's table rebuild dropped them"""
+    if sender.name == 'cleaning':
+        ensure_search_index(using)
@@ -0,0 +1,99 @@
+// Typeahead for <select data-autocomplete-url> (see cleaning/widgets.py).
+// Adds a search box in front of each select and replaces its options with
+// the matching page from the JSON endpoint. The select itself stays the form
+// control, so existing 'change' listeners and form posts work unchanged.
+(function() {
+    const DEBOUNCE_MS = 250;
+
+    function forwardedElements(select) {
+        // data-autocomplete-forward="unit=id_unit,other=id_other"
+        const elements = {};
+        (select.dataset.autocompleteForward || '').split(',').forEach(function(pair) {
+            const [param, elementId] = pair.split('=');
+            const element = elementId && document.getElementById(elementId.trim());
+            if (element) elements[param.trim()] = element;
+        });
+        return elements;
+    }
+
+    function forwardedParams(select) {
+        const params = {};
+        Object.entries(forwardedElements(select)).forEach(function([param, element]) {
+            if (element.value) params[param] = element.value;
+        });
+        return params;
+    }
+
+    function replaceOptions(select, data) {
+        const keep = Array.from(select.options).filter(function(option) {
+            return option.value === '' || option.selected;
+        });
+        select.innerHTML = '';
+        keep.forEach(function(option) { select.appendChild(option); });
+        const kept = new Set(keep.map(function(option) { return option.value; }));
+        data.results.forEach(function(item) {
+            if (kept.has(String(item.id))) return;
+            select.appendChild(new Option(item.text, item.id));
+        });
+        if (data.more) {
+            const hint = new Option('Keep typing to narrow down the list...', '');
+            hint.disabled = true;
+            select.appendChild(hint);
+        }
+    }
+
+    function attach(select) {
+        const search = document.createElement('input');
+        search.type = 'search';
+        search.className = 'form-control form-control-sm mb-1';
+        search.placeholder = select.dataset.autocompletePlaceholder || 'Type to search...';
+        search.setAttribute('aria-label', search.placeholder);
+        select.parentNode.insertBefore(search, select);
+
+        let timer = null;
+        let latest = 0;
+        function load() {
+            const params = new URLSearchParams(forwardedParams(select));
+            params.set('q', search.value.trim());
+            const requestId = ++latest;
+            fetch(select.dataset.autocompleteUrl + '?' + params.toString(), {credentials: 'same-origin'})
+                .then(function(response) { return response.json(); })
+                .then(function(data) {
+                    // Ignore responses that arrive after a newer request was sent
+                    if (requestId === latest && data.results) replaceOptions(select, data);
+                })
+                .catch(function(error) { console.error('Autocomplete request failed:', error); });
+        }
+
+        search.addEventListener('input', function() {
+            clearTimeout(timer);
+            timer = setTimeout(load, DEBOUNCE_MS);
+        });
+        // The first page is fetched when the user first reaches the field
+        let loaded = false;
+        function loadOnce() {
+            if (loaded) return;
+            loaded = true;
+            load();
+        }
+        search.addEventListener('focus', loadOnce);
+        select.addEventListener('focus', loadOnce);
+
+        // A dependent field (e.g. section under zone) is cleared when its parent
+        // changes, and reloads its options for the new parent on next focus
+        Object.values(forwardedElements(select)).forEach(function(element) {
+            element.addEventListener('change', function() {
+                Array.from(select.options).forEach(function(option) {
+                    if (option.value !== '') option.remove();
+                });
+                select.value = '';
+                search.value = '';
+                loaded = false;
+            });
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', function() {
+        document.querySelectorAll('select[data-autocomplete-url]').forEach(attach);
+    });
+})();
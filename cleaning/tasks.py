@@ -0,0 +1,68 @@
+"""
+Celery tasks for the cleaning app.
+
+``generate_report`` renders a ``ReportJob`` to a CSV, XLSX or PDF file in
+default storage, updating the job's status and progress as it goes so the
+polling endpoint can report on it.
+"""
+import logging
+import tempfile
+
+from celery import shared_task
+from django.core.files import File
+from django.utils import timezone
+
+from .exports import WRITERS, job_report_source
+from .models import ReportJob
+
+logger = logging.getLogger(__name__)
+
+# Write progress to the database at most once per this many rows
+PROGRESS_EVERY = 1000
+
+
+def _track_progress(job_id, rows, total, counter):
+    """Yield ``rows`` unchanged while periodically saving the job's progress"""
+    for row in rows:
+        yield row
+        counter['rows'] += 1
+        if counter['rows'] % PROGRESS_EVERY == 0 and total:
+            progress = min(99, counter['rows'] * 100 // total)
+            ReportJob.objects.filter(pk=job_id).update(progress=progress, rows_written=counter['rows'])
+
+
+@shared_task
+def generate_report(job_id):
+    """Render the report described by ReportJob ``job_id`` and attach the file"""
+    try:
+        job = ReportJob.objects.select_related('requested_by').get(pk=job_id)
+    except ReportJob.DoesNotExist:
+        logger.warning('Report job %s no longer exists', job_id)
+        return
+    if job.is_finished:
+        # Redelivered message for a job that already ran
+        return
+
+    ReportJob.objects.filter(pk=job_id).update(status='RUNNING', started_at=timezone.now())
+    counter = {'rows': 0}
+    try:
+        source = job_report_source(job)
+        rows = _track_progress(job_id, source.rows, source.total, counter)
+        with tempfile.TemporaryFile() as output:
+            WRITERS[job.export_format](output, source.header, rows, source.title)
+            output.seek(0)
+            job.file.save(f'{source.filename}.{job.export_format}', File(output), save=False)
+    except Exception as exc:
+        logger.exception('Report job %s failed', job_id)
+        ReportJob.objects.filter(pk=job_id).update(
+            status='FAILED', error=str(exc), rows_written=counter['rows'], finished_at=timezone.now()
+        )
+        return
+
+    ReportJob.objects.filter(pk=job_id).update(
+        status='SUCCEEDED',
+        progress=100,
+        rows_written=counter['rows'],
+        file=job.file.name,
+        finished_at=timezone.now(),
+    )
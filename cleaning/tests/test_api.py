@@ -4,11 +4,17 @@ API Tests for Cleaning App
 This module tests the AJAX/API endpoints:
 - get_activities_by_unit
 - mark_activity_completed_day
+- mark_activity_days_completed
+- autocomplete_units / autocomplete_activities / autocomplete_assistants
+- autocomplete_zones / autocomplete_sections / autocomplete_faculties
 """
+from django.db import connection
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from cleaning.models import Unit, Zone, Faculty, CleaningActivity, CleaningRecord
+from cleaning.forms import CleaningRecordForm
+from cleaning.models import Unit, Zone, Section, Faculty, CleaningActivity, CleaningRecord, ActivityMonthStats
+from cleaning.views import AUTOCOMPLETE_PAGE_SIZE
 import json
 from datetime import date
 
@@ -251,6 +257,213 @@ class MarkActivityCompletedDayAPITest(APITestCase):
         self.assertFalse(response.json()['ok'])
 
 
+class MarkActivityDaysCompletedAPITest(APITestCase):
+    """Test the batch mark_activity_days_completed API endpoint"""
+    
+    def setUp(self):
+        super().setUp()
+        self.activity = CleaningActivity.objects.create(
+            unit=self.unit,
+            activity_name='Daily Cleaning',
+            frequency='DAILY',
+            is_active=True
+        )
+        self.url = reverse('cleaning:mark_activity_days_completed')
+    
+    def _post(self, items):
+        return self.client.post(self.url, json.dumps({'items': items}), content_type='application/json')
+    
+    def test_marks_a_month_in_one_request(self):
+        """Test that a full month of days is marked in a single round trip"""
+        self.client.login(username='manager1', password='testpass123')
+        items = [
+            {'activity_id': self.activity.id, 'date': f'2025-10-{day:02d}', 'assigned_to': self.assistant.id}
+            for day in range(1, 32)
+        ]
+        
+        with self.assertNumQueries(15):
+            response = self._post(items)
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data['ok'])
+        self.assertEqual(len(data['results']), 31)
+        self.assertEqual(data['results'][0]['date'], '2025-10-01')
+        records = CleaningRecord.objects.filter(activity=self.activity, status='COMPLETED')
+        self.assertEqual(records.count(), 31)
+        self.assertFalse(records.exclude(assigned_to=self.assistant).exists())
+        self.assertEqual(ActivityMonthStats.objects.get(activity=self.activity, year=2025, month=10).completed, 31)
+    
+    def test_per_item_results(self):
+        """Test that rule violations and bad items are reported without failing the others"""
+        monthly = CleaningActivity.objects.create(
+            unit=self.unit,
+            activity_name='Monthly Clean',
+            frequency='MONTHLY',
+            is_active=True
+        )
+        self.client.login(username='manager1', password='testpass123')
+        response = self._post([
+            {'activity_id': monthly.id, 'date': '2025-10-15'},
+            {'activity_id': monthly.id, 'date': '2025-10-20'},
+            {'activity_id': self.activity.id, 'date': 'not-a-date'},
+            {'activity_id': 999999, 'date': '2025-10-01'},
+            {'activity_id': self.activity.id, 'date': '2025-10-01'},
+        ])
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertFalse(data['ok'])
+        self.assertEqual([r['ok'] for r in data['results']], [True, False, False, False, True])
+        self.assertIn('Monthly limit', data['results'][1]['error'])
+        self.assertEqual(data['results'][2]['error'], 'Invalid item')
+        self.assertEqual(data['results'][3]['error'], 'Activity not found')
+        self.assertEqual(CleaningRecord.objects.count(), 2)
+    
+    def test_twice_daily_completes_pending_record_first(self):
+        """Test that a pending record is completed before new slots are created"""
+        activity = CleaningActivity.objects.create(
+            unit=self.unit,
+            activity_name='Twice Daily Clean',
+            frequency='TWICE_DAILY',
+            is_active=True
+        )
+        pending = CleaningRecord.objects.create(
+            unit=self.unit, activity=activity, scheduled_date=date(2025, 10, 30), status='PENDING'
+        )
+        self.client.login(username='manager1', password='testpass123')
+        items = [{'activity_id': activity.id, 'date': '2025-10-30'}] * 3
+        data = self._post(items).json()
+        
+        self.assertEqual([r['ok'] for r in data['results']], [True, True, False])
+        self.assertEqual(data['results'][0]['record_id'], pending.id)
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, 'COMPLETED')
+        self.assertEqual(CleaningRecord.objects.filter(activity=activity, status='COMPLETED').count(), 2)
+        stats = ActivityMonthStats.objects.get(activity=activity, year=2025, month=10)
+        self.assertEqual((stats.total, stats.pending, stats.completed), (2, 0, 2))
+    
+    def test_requires_manager(self):
+        """Test that only managers can batch mark days"""
+        self.client.login(username='assistant1', password='testpass123')
+        response = self._post([{'activity_id': self.activity.id, 'date': '2025-10-01'}])
+        self.assertEqual(response.status_code, 403)
+    
+    def test_rejects_malformed_body(self):
+        """Test that a body without a list of items is rejected"""
+        self.client.login(username='manager1', password='testpass123')
+        response = self.client.post(self.url, 'nope', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['ok'])
+
+
+class AutocompleteAPITest(APITestCase):
+    """Test the autocomplete endpoints and the form widgets that use them"""
+    
+    def setUp(self):
+        super().setUp()
+        self.client.login(username='manager1', password='testpass123')
+        Unit.objects.bulk_create([
+            Unit(unit_name=f'Lab {i:02d}', zone=self.zone, faculty=self.faculty) for i in range(30)
+        ])
+        Unit.objects.create(unit_name='Lab Closed', zone=self.zone, faculty=self.faculty, is_active=False)
+        self.activity = CleaningActivity.objects.create(unit=self.unit, activity_name='Mop floor')
+        CleaningActivity.objects.create(unit=self.unit, activity_name='Sweep floor')
+        other_unit = Unit.objects.get(unit_name='Lab 00')
+        CleaningActivity.objects.create(unit=other_unit, activity_name='Mop stairs')
+    
+    def _get(self, name, **params):
+        response = self.client.get(reverse(f'cleaning:{name}'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+    
+    def test_units_prefix_search_is_case_insensitive(self):
+        """Test that units match on a name prefix in any case, active units only"""
+        data = self._get('autocomplete_units', q='lab 0')
+        self.assertEqual([r['text'] for r in data['results']][:2], ['Test Zone → Lab 00', 'Test Zone → Lab 01'])
+        self.assertEqual(len(data['results']), 10)
+        self.assertFalse(data['more'])
+        self.assertEqual(self._get('autocomplete_units', q='test')['results'][0]['id'], self.unit.id)
+        self.assertEqual(self._get('autocomplete_units', q='lab closed')['results'], [])
+    
+    def test_units_are_paged(self):
+        """Test that results come in capped pages with a more flag"""
+        first = self._get('autocomplete_units', q='lab')
+        self.assertEqual(len(first['results']), AUTOCOMPLETE_PAGE_SIZE)
+        self.assertTrue(first['more'])
+        second = self._get('autocomplete_units', q='lab', page=2)
+        self.assertEqual(len(second['results']), 30 - AUTOCOMPLETE_PAGE_SIZE)
+        self.assertFalse(second['more'])
+    
+    def test_activities_filtered_by_unit(self):
+        """Test that activities can be searched within one unit"""
+        data = self._get('autocomplete_activities', q='mop')
+        self.assertEqual(len(data['results']), 2)
+        data = self._get('autocomplete_activities', q='mop', unit=self.unit.id)
+        self.assertEqual([r['id'] for r in data['results']], [self.activity.id])
+        response = self.client.get(reverse('cleaning:autocomplete_activities'), {'unit': 'x'})
+        self.assertEqual(response.status_code, 400)
+    
+    def test_assistants_match_username_or_name(self):
+        """Test that assistants match on username, first or last name prefixes"""
+        User.objects.create_user(username='kamal', first_name='Kamal', last_name='Perera', role='ASSISTANT')
+        User.objects.create_user(username='nimal', last_name='Silva', role='ASSISTANT')
+        self.assertEqual([r['text'] for r in self._get('autocomplete_assistants', q='per')['results']],
+                         ['Kamal Perera (kamal)'])
+        self.assertEqual(len(self._get('autocomplete_assistants', q='silva')['results']), 1)
+        # Managers are never offered
+        self.assertEqual(self._get('autocomplete_assistants', q='manager')['results'], [])
+    
+    def test_sections_depend_on_zone(self):
+        """Test that sections can be narrowed to the zone chosen in the parent dropdown"""
+        other_zone = Zone.objects.create(zone_name='North Campus')
+        Section.objects.create(zone=self.zone, section_name='Block A')
+        Section.objects.create(zone=other_zone, section_name='Block B')
+        self.assertEqual(len(self._get('autocomplete_sections', q='block')['results']), 2)
+        data = self._get('autocomplete_sections', q='block', zone=other_zone.id)
+        self.assertEqual([r['text'] for r in data['results']], ['Block B'])
+        response = self.client.get(reverse('cleaning:autocomplete_sections'), {'zone': 'x'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([r['text'] for r in self._get('autocomplete_zones', q='nor')['results']], ['North Campus'])
+        self.assertEqual(len(self._get('autocomplete_faculties', q=self.faculty.faculty_name[:3])['results']), 1)
+    
+    def test_requires_login(self):
+        """Test that the endpoints need an authenticated user"""
+        self.client.logout()
+        response = self.client.get(reverse('cleaning:autocomplete_units'))
+        self.assertEqual(response.status_code, 302)
+    
+    def test_form_renders_only_selected_options(self):
+        """Test that the record form renders without loading every unit and activity"""
+        form = CleaningRecordForm(initial={'unit': self.unit.id, 'activity': self.activity.id})
+        # One query per selected value: unit and activity; assigned_to is empty
+        with self.assertNumQueries(2):
+            html = form.as_p()
+        self.assertIn('Test Zone → Test Unit', html)
+        self.assertNotIn('Lab 05', html)
+        self.assertIn('data-autocomplete-url="/cleaning/api/autocomplete/units/"', html)
+        self.assertIn('cleaning/js/autocomplete.js', str(form.media))
+    
+    def test_form_still_validates_against_queryset(self):
+        """Test that submitted values are checked even though they were not rendered"""
+        data = {'unit': Unit.objects.get(unit_name='Lab 05').id, 'assigned_to': self.assistant.id,
+                'scheduled_date': '2025-10'}
+        self.assertTrue(CleaningRecordForm(data).is_valid())
+        closed = Unit.objects.get(unit_name='Lab Closed')
+        self.assertIn('unit', CleaningRecordForm({**data, 'unit': closed.id}).errors)
+    
+    def test_prefix_search_uses_an_index(self):
+        """Test that the unit name search can use its prefix index on SQLite"""
+        if connection.vendor != 'sqlite':
+            self.skipTest('index plan checked on SQLite only')
+        queryset = Unit.objects.filter(unit_name__istartswith='lab')
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        self.assertIn('cleaning_unit_name_prefix_idx', plan)
+
+
 class CleaningRecordAPIIntegrationTest(APITestCase):
     """Integration tests for the full workflow"""
     
@@ -0,0 +1,117 @@
+"""
+Tests for the versioned calendar partial cache
+"""
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from .fixtures import TestDataFactory, BaseTestCase
+from cleaning.caching import activity_version, bump_activity_versions
+from cleaning.checks import check_shared_cache
+from cleaning.models import CleaningRecord
+from datetime import date
+
+
+class CalendarPartialCacheTest(BaseTestCase, TestCase):
+    """Test caching and invalidation of cleaning_activity_calendar_partial"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.create_test_users()
+        self.create_test_hierarchy()
+        self.login_as_manager()
+        self.activity = TestDataFactory.create_activity(unit=self.unit, frequency='DAILY')
+        self.url = reverse('cleaning:cleaning_activity_calendar_partial', kwargs={'pk': self.activity.pk})
+
+    def _get(self, **params):
+        params = {'year': 2025, 'month': 10, **params}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        cleaning_queries = [q['sql'] for q in queries if 'cleaning_' in q['sql']]
+        return response.content.decode(), cleaning_queries
+
+    def test_repeat_navigation_skips_the_database(self):
+        """Test that a second fetch of the same month runs no cleaning queries"""
+        first, first_queries = self._get()
+        second, second_queries = self._get()
+
+        self.assertTrue(first_queries)
+        self.assertEqual(second_queries, [])
+        self.assertEqual(first, second)
+
+    def test_lock_flag_and_month_are_cached_separately(self):
+        """Test that each month and lock setting gets its own entry"""
+        self._get()
+        _, queries = self._get(lock=1)
+        self.assertTrue(queries)
+        _, queries = self._get(month=11)
+        self.assertTrue(queries)
+
+    def test_record_save_and_delete_invalidate(self):
+        """Test that record writes are visible on the next fetch"""
+        before, _ = self._get()
+        record = TestDataFactory.create_cleaning_record(
+            activity=self.activity, scheduled_date=date(2025, 10, 8), status='COMPLETED'
+        )
+        after_create, queries = self._get()
+        self.assertTrue(queries)
+        self.assertNotEqual(before, after_create)
+        self.assertIn('Completed ✔', after_create)
+
+        record.delete()
+        after_delete, _ = self._get()
+        self.assertNotIn('Completed ✔', after_delete)
+
+    def test_activity_save_invalidates(self):
+        """Test that editing the activity is visible on the next fetch"""
+        self._get()
+        self.activity.frequency = 'WEEKLY'
+        self.activity.save()
+        content, _ = self._get()
+        self.assertIn('WEEKLY', content)
+
+    def test_bulk_marking_invalidates(self):
+        """Test that the batch marking endpoint, which skips signals, invalidates too"""
+        self._get()
+        response = self.client.post(
+            reverse('cleaning:mark_activity_days_completed'),
+            {'items': [{'activity_id': self.activity.pk, 'date': '2025-10-08'}]},
+            content_type='application/json',
+        )
+        self.assertTrue(response.json()['ok'])
+        content, _ = self._get()
+        self.assertIn('Completed ✔', content)
+
+    def test_queryset_update_needs_explicit_bump(self):
+        """Test that bump_activity_versions covers writes that bypass signals"""
+        record = TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 10, 8))
+        version = activity_version(self.activity.pk)
+        CleaningRecord.objects.filter(pk=record.pk).update(status='COMPLETED')
+        self.assertEqual(activity_version(self.activity.pk), version)
+
+        bump_activity_versions(self.activity.pk)
+        self.assertNotEqual(activity_version(self.activity.pk), version)
+        content, _ = self._get()
+        self.assertIn('Completed ✔', content)
+
+
+class SharedCacheCheckTest(SimpleTestCase):
+    """Test the system check for a process-local cache in production"""
+
+    LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    REDIS = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://cache'}}
+
+    def test_warns_about_locmem_without_debug(self):
+        """Test that a process-local cache is reported when DEBUG is off"""
+        with self.settings(DEBUG=False, CACHES=self.LOCMEM):
+            self.assertEqual([message.id for message in check_shared_cache(None)], ['cleaning.W001'])
+
+    def test_shared_cache_or_debug_passes(self):
+        """Test that a shared cache, or local development, raises nothing"""
+        with self.settings(DEBUG=False, CACHES=self.REDIS):
+            self.assertEqual(check_shared_cache(None), [])
+        with self.settings(DEBUG=True, CACHES=self.LOCMEM):
+            self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,120 @@
+"""
+Tests for the CSV/XLSX export views
+"""
+import csv
+import io
+from django.test import TestCase, Client
+from django.urls import reverse
+from openpyxl import load_workbook
+from .fixtures import TestDataFactory, BaseTestCase
+from datetime import date
+
+
+def _csv_rows(response):
+    content = b''.join(response.streaming_content).decode('utf-8')
+    return list(csv.reader(io.StringIO(content)))
+
+
+def _xlsx_rows(response):
+    workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+    return [list(row) for row in workbook.active.iter_rows(values_only=True)]
+
+
+class CleaningRecordExportTest(BaseTestCase, TestCase):
+    """Test the cleaning_record_export view"""
+
+    def setUp(self):
+        self.client = Client()
+        self.create_test_users()
+        self.create_test_hierarchy()
+        self.activity = TestDataFactory.create_activity(unit=self.unit)
+        for day in range(1, 6):
+            TestDataFactory.create_cleaning_record(
+                activity=self.activity,
+                scheduled_date=date(2025, 10, day),
+                status='COMPLETED' if day % 2 else 'PENDING',
+                assigned_to=self.assistant,
+            )
+        TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 10, 6))
+        self.url = reverse('cleaning:cleaning_record_export')
+
+    def test_csv_is_streamed_with_all_records(self):
+        """Test that the CSV export streams a header plus one line per record"""
+        self.login_as_manager()
+        response = self.client.get(self.url)
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = _csv_rows(response)
+        self.assertEqual(rows[0][:3], ['ID', 'Scheduled Date', 'Scheduled Time'])
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(rows[1][1], '2025-10-06')
+
+    def test_csv_applies_list_filters(self):
+        """Test that the export honours the record list filters"""
+        self.login_as_manager()
+        rows = _csv_rows(self.client.get(self.url, {'status': 'COMPLETED'}))
+        self.assertEqual(len(rows), 4)
+        self.assertTrue(all(row[7] == 'Completed' for row in rows[1:]))
+
+    def test_assistant_exports_only_own_records(self):
+        """Test that assistants get the same scoping as the record list"""
+        other = TestDataFactory.create_assistant(username='other', email='other@test.com')
+        TestDataFactory.create_cleaning_record(activity=self.activity, assigned_to=other)
+        self.login_as_assistant()
+        rows = _csv_rows(self.client.get(self.url))
+        self.assertEqual(len(rows), 6)
+
+    def test_xlsx_export(self):
+        """Test that the XLSX export opens as a workbook with every record"""
+        self.login_as_manager()
+        response = self.client.get(self.url, {'format': 'xlsx'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('attachment', response['Content-Disposition'])
+        rows = _xlsx_rows(response)
+        self.assertEqual(rows[0][0], 'ID')
+        self.assertEqual(len(rows), 7)
+
+    def test_unknown_format_is_rejected(self):
+        """Test that unsupported formats return 400"""
+        self.login_as_manager()
+        response = self.client.get(self.url, {'format': 'pdf'})
+        self.assertEqual(response.status_code, 400)
+
+
+class ReportExportTest(BaseTestCase, TestCase):
+    """Test the performance and faculty report exports"""
+
+    def setUp(self):
+        self.client = Client()
+        self.create_test_users()
+        self.create_test_hierarchy()
+        self.activity = TestDataFactory.create_activity('Sweep floor', unit=self.unit)
+        TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 10, 1), status='COMPLETED')
+
+    def test_activity_performance_export(self):
+        """Test that the performance export has one row per active activity"""
+        self.login_as_manager()
+        url = reverse('cleaning:activity_performance_report_export')
+        rows = _csv_rows(self.client.get(url, {'year': 2025, 'month': 10}))
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][2], 'Sweep floor')
+        self.assertEqual(rows[1][4:6], ['31', '1'])
+
+    def test_faculty_report_export(self):
+        """Test that dean office users can export the faculty report as XLSX"""
+        self.login_as_dean()
+        url = reverse('cleaning:faculty_cleaning_report_export', kwargs={'faculty_id': self.faculty.id})
+        rows = _xlsx_rows(self.client.get(url, {'year': 2025, 'month': 10, 'format': 'xlsx'}))
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][2], 'Sweep floor')
+        self.assertEqual(rows[1][5], 1)
+
+    def test_assistant_cannot_export_performance(self):
+        """Test that the export keeps the report's permission check"""
+        self.login_as_assistant()
+        response = self.client.get(reverse('cleaning:activity_performance_report_export'))
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,147 @@
+"""
+Tests for the synthetic campus generator and generate_load_data command
+"""
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from cleaning.load_data import generate_campus
+from cleaning.management.commands.generate_load_data import months_before
+from cleaning.models import ActivityMonthStats, CleaningActivity, CleaningRecord, Unit, Zone
+from cleaning.schedule import expected_slots
+from datetime import date, timedelta
+
+
+def expected_record_count(start, end):
+    """Slots due between ``start`` and ``end`` for every generated activity, from its first record"""
+    return sum(
+        len(slots)
+        for activity in CleaningActivity.objects.all()
+        for slots in expected_slots(activity.frequency, activity.first_record_date, start, end).values()
+    )
+
+
+class GenerateCampusTest(TestCase):
+    """Test generate_campus()"""
+
+    def test_writes_the_requested_volume(self):
+        """Test that every activity gets a record for each slot it is due"""
+        counts = generate_campus(
+            zones=2, sections_per_zone=3, faculties=2, assistants=3, units=6,
+            activities_per_unit=4, history_days=60, end_date=date(2025, 10, 15),
+        )
+
+        self.assertEqual(counts.sections, 6)
+        self.assertEqual(counts.activities, 24)
+        self.assertEqual(CleaningRecord.objects.count(), counts.records)
+        self.assertEqual(counts.records, expected_record_count(date(2025, 8, 17), date(2025, 10, 15)))
+        unit = Unit.objects.select_related('zone', 'section').order_by('pk').first()
+        self.assertEqual(unit.full_location, f'{unit.zone.zone_name} → {unit.section.section_name} → {unit.unit_name}')
+        self.assertEqual(unit.location_key, unit.full_location.lower())
+        self.assertFalse(
+            CleaningRecord.objects.filter(scheduled_date__gte=date(2025, 10, 15)).exclude(status='PENDING').exists()
+        )
+
+    def test_records_follow_each_activity_frequency(self):
+        """Test that records fall on the days and slots the schedule engine expects"""
+        generate_campus(zones=1, units=10, activities_per_unit=10, history_days=60, end_date=date(2025, 10, 15))
+        start = date(2025, 8, 17)
+
+        self.assertEqual(
+            set(CleaningActivity.objects.values_list('frequency', flat=True)),
+            {'DAILY', 'TWICE_DAILY', 'EVERY_2_DAYS', 'WEEKLY', 'BIWEEKLY', 'MONTHLY'},
+        )
+        for activity in CleaningActivity.objects.all():
+            expected = {
+                (day, slot)
+                for day, slots in expected_slots(activity.frequency, activity.first_record_date, start,
+                                                 date(2025, 10, 15)).items()
+                for slot in slots
+            }
+            actual = set(activity.cleaning_records.values_list('scheduled_date', 'scheduled_time'))
+            self.assertEqual(actual, expected, activity.frequency)
+            # Cycles start within their first period
+            self.assertLess(activity.first_record_date, start + timedelta(days=28))
+
+    def test_rebuilds_derived_data(self):
+        """Test that month counters and anchors match the bulk-inserted records"""
+        generate_campus(zones=1, units=2, activities_per_unit=2, history_days=5, end_date=date(2025, 10, 3))
+
+        activity = CleaningActivity.objects.filter(frequency='DAILY').order_by('pk').first()
+        self.assertEqual(activity.first_record_date, date(2025, 9, 29))
+        totals = {(row.year, row.month): row.total for row in ActivityMonthStats.objects.filter(activity=activity)}
+        self.assertEqual(totals, {(2025, 9): 2, (2025, 10): 3})
+
+    def test_rebuilds_derived_data_in_batches(self):
+        """Test that counters and anchors cover every activity when rebuilt a few activities at a time"""
+        with mock.patch('cleaning.load_data.ACTIVITY_BATCH_SIZE', 3):
+            counts = generate_campus(zones=1, units=4, activities_per_unit=2, history_days=20,
+                                     end_date=date(2025, 10, 3))
+
+        self.assertEqual(sum(row.total for row in ActivityMonthStats.objects.all()), counts.records)
+        self.assertFalse(CleaningActivity.objects.filter(first_record_date=None).exists())
+
+    def test_same_seed_gives_same_data(self):
+        """Test that generation is reproducible"""
+        def snapshot(prefix):
+            generate_campus(zones=1, units=3, assistants=2, history_days=3, seed=7, prefix=prefix,
+                            end_date=date(2025, 10, 3))
+            return [
+                (r.activity.activity_name, r.scheduled_date, r.status)
+                for r in CleaningRecord.objects.filter(unit__unit_name__startswith=prefix)
+                .select_related('activity').order_by('unit__unit_name', 'activity__activity_name', 'scheduled_date')
+            ]
+
+        self.assertEqual(snapshot('A'), snapshot('B'))
+
+
+class GenerateLoadDataCommandTest(TestCase):
+    """Test the generate_load_data management command"""
+
+    def _call(self, *args):
+        out = StringIO()
+        call_command('generate_load_data', *args, stdout=out)
+        return out.getvalue()
+
+    def test_generates_months_of_history(self):
+        """Test that --months sets the length of the record history"""
+        output = self._call('--zones', '1', '--units', '2', '--activities-per-unit', '1',
+                            '--months', '1', '--end-date', '2025-10-15')
+
+        self.assertIn('Generated 1 zones', output)
+        self.assertEqual(Unit.objects.count(), 2)
+        # 30 days: 2025-09-16 to 2025-10-15
+        self.assertEqual(CleaningRecord.objects.count(), expected_record_count(date(2025, 9, 16), date(2025, 10, 15)))
+        self.assertIn(f'{CleaningRecord.objects.count()} records in', output)
+
+    def test_refuses_an_existing_prefix(self):
+        """Test that running twice with one prefix fails before writing anything"""
+        self._call('--zones', '1', '--units', '1', '--months', '1', '--prefix', 'Bench')
+        with self.assertRaises(CommandError):
+            self._call('--zones', '1', '--units', '1', '--months', '1', '--prefix', 'Bench')
+        self.assertEqual(Zone.objects.count(), 1)
+
+    def test_months_before_clamps_to_month_end(self):
+        """Test month arithmetic at month ends and year boundaries"""
+        self.assertEqual(months_before(date(2025, 3, 31), 1), date(2025, 2, 28))
+        self.assertEqual(months_before(date(2025, 1, 15), 3), date(2024, 10, 15))
+
+
+class LoadSampleDataCommandTest(TestCase):
+    """Test the load_sample_data management command"""
+
+    def test_loads_and_reloads(self):
+        """Test that the sample campus loads and a second run creates nothing new"""
+        for _ in range(2):
+            call_command('load_sample_data', stdout=StringIO())
+
+        self.assertEqual(Zone.objects.count(), 3)
+        self.assertEqual(Unit.objects.count(), 13)
+        self.assertEqual(Unit.objects.filter(is_active=False).count(), 1)
+
+    def test_clear_replaces_existing_data(self):
+        """Test that --clear removes units, faculties and zones in a valid order"""
+        call_command('load_sample_data', stdout=StringIO())
+        call_command('load_sample_data', '--clear', stdout=StringIO())
+        self.assertEqual(Unit.objects.count(), 13)
@@ -0,0 +1,295 @@
+"""
+Tests for model helpers and custom querysets
+"""
+from io import StringIO
+from unittest import skipUnless
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from .fixtures import TestDataFactory, BaseTestCase
+from cleaning.models import Zone, Section, Faculty, Unit, CleaningRecord, ActivityMonthStats
+from datetime import date, timedelta
+
+
+class HierarchyCountsTest(BaseTestCase, TestCase):
+    """Test the with_counts() annotations on Zone, Section and Faculty"""
+
+    def setUp(self):
+        self.create_test_hierarchy()
+        self.section = Section.objects.create(section_name='Science Building', zone=self.zone)
+        Section.objects.create(section_name='Library Block', zone=self.zone)
+        Unit.objects.create(unit_name='Lab A', zone=self.zone, section=self.section, faculty=self.faculty)
+        Unit.objects.create(unit_name='Lab B', zone=self.zone, section=self.section, faculty=self.faculty, is_active=False)
+
+    def test_annotated_counts_match_fallback_queries(self):
+        """Test that annotated values equal the per-object COUNT fallbacks"""
+        zone = Zone.objects.with_counts().get(pk=self.zone.pk)
+        self.assertEqual(zone.get_sections_count(), self.zone.get_sections_count())
+        self.assertEqual(zone.get_units_count(), self.zone.get_units_count())
+        self.assertEqual(zone.get_faculties_count(), self.zone.get_faculties_count())
+        self.assertEqual((zone.sections_count, zone.units_count, zone.faculties_count), (2, 2, 1))
+
+        section = Section.objects.with_counts().get(pk=self.section.pk)
+        self.assertEqual((section.get_units_count(), section.get_active_units_count()), (2, 1))
+
+        faculty = Faculty.objects.with_counts().get(pk=self.faculty.pk)
+        self.assertEqual(faculty.get_units_count(), self.faculty.get_units_count())
+        self.assertEqual(faculty.get_active_units_count(), self.faculty.get_active_units_count())
+
+    def test_empty_rows_count_zero(self):
+        """Test that rows without children are annotated with 0, not None"""
+        empty = Section.objects.with_counts().get(section_name='Library Block')
+        self.assertEqual(empty.get_units_count(), 0)
+        self.assertEqual(empty.get_active_units_count(), 0)
+
+    def test_annotated_counts_need_no_queries(self):
+        """Test that reading annotated counters does not hit the database"""
+        sections = list(Section.objects.with_counts())
+        with self.assertNumQueries(0):
+            for section in sections:
+                section.get_units_count()
+                section.get_active_units_count()
+
+
+class HierarchyListQueryCountTest(BaseTestCase, TestCase):
+    """Test that the manager hierarchy lists render in a fixed number of queries"""
+
+    def setUp(self):
+        self.client = Client()
+        self.create_test_users()
+        self.create_test_hierarchy()
+        self.login_as_manager()
+
+    def _count_queries(self, url_name):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse(url_name))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_lists_do_not_grow_with_rows(self):
+        """Test that adding zones, sections and faculties adds no queries"""
+        url_names = ['manager:zones_list', 'manager:sections_list', 'manager:faculties_list']
+        baseline = {name: self._count_queries(name) for name in url_names}
+
+        for i in range(5):
+            zone = TestDataFactory.create_zone(f'Zone {i}')
+            section = Section.objects.create(section_name=f'Section {i}', zone=zone)
+            faculty = TestDataFactory.create_faculty(f'Faculty {i}', zone=zone)
+            Unit.objects.create(unit_name=f'Unit {i}', zone=zone, section=section, faculty=faculty)
+
+        for name in url_names:
+            self.assertEqual(self._count_queries(name), baseline[name], name)
+
+
+class UnitFullLocationTest(BaseTestCase, TestCase):
+    """Test the stored Zone → Section → Unit path"""
+
+    def setUp(self):
+        self.create_test_hierarchy()
+        self.section = Section.objects.create(zone=self.zone, section_name='North Wing')
+        self.unit.section = self.section
+        self.unit.save()
+
+    def _location(self, unit=None):
+        return Unit.objects.values_list('full_location', 'location_key').get(pk=(unit or self.unit).pk)
+
+    def test_save_sets_path(self):
+        """Test that saving a unit stores its path and lowercased sort key"""
+        self.assertEqual(self._location(), ('Test Zone → North Wing → Test Unit', 'test zone → north wing → test unit'))
+        other = TestDataFactory.create_unit(unit_name='Yard', zone=self.zone, faculty=self.faculty)
+        self.assertEqual(self._location(other)[0], 'Test Zone → Yard')
+
+    def test_update_fields_save_keeps_path_current(self):
+        """Test that a partial save of the name also rewrites the path"""
+        self.unit.unit_name = 'Renamed Unit'
+        self.unit.save(update_fields=['unit_name'])
+        self.assertEqual(self._location()[0], 'Test Zone → North Wing → Renamed Unit')
+
+    def test_zone_rename_refreshes_units_in_one_update(self):
+        """Test that renaming a zone rewrites its units' paths with a single UPDATE"""
+        TestDataFactory.create_unit(unit_name='Yard', zone=self.zone, faculty=self.faculty)
+        zone = Zone.objects.get(pk=self.zone.pk)
+        zone.zone_name = 'East Campus'
+        with CaptureQueriesContext(connection) as ctx:
+            zone.save()
+        unit_updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE "cleaning_unit"')]
+        self.assertEqual(len(unit_updates), 1)
+        self.assertEqual(
+            sorted(Unit.objects.values_list('full_location', flat=True)),
+            ['East Campus → North Wing → Test Unit', 'East Campus → Yard'],
+        )
+
+    def test_save_without_rename_skips_refresh(self):
+        """Test that saving a zone or section with the same name leaves units alone"""
+        zone = Zone.objects.get(pk=self.zone.pk)
+        zone.description = 'Changed'
+        with CaptureQueriesContext(connection) as ctx:
+            zone.save()
+        self.assertFalse(any('cleaning_unit' in q['sql'] for q in ctx.captured_queries))
+
+    def test_section_rename_refreshes_units(self):
+        """Test that renaming a section rewrites its units' paths"""
+        section = Section.objects.get(pk=self.section.pk)
+        section.section_name = 'South Wing'
+        section.save()
+        self.assertEqual(self._location()[0], 'Test Zone → South Wing → Test Unit')
+
+    def test_refresh_repairs_bulk_updates(self):
+        """Test that refresh_full_location() fixes paths after writes that bypass save()"""
+        Zone.objects.filter(pk=self.zone.pk).update(zone_name='Bulk Zone')
+        Section.objects.filter(pk=self.section.pk).update(section_name='Bulk Wing')
+        self.assertEqual(self._location()[0], 'Test Zone → North Wing → Test Unit')
+
+        self.assertEqual(Unit.refresh_full_location(), 1)
+        self.assertEqual(self._location(), ('Bulk Zone → Bulk Wing → Test Unit', 'bulk zone → bulk wing → test unit'))
+
+    def test_rebuild_command(self):
+        """Test the rebuild_unit_locations management command"""
+        Unit.objects.filter(pk=self.unit.pk).update(full_location='', location_key='')
+        out = StringIO()
+        call_command('rebuild_unit_locations', '--zone', str(self.zone.pk), stdout=out)
+        self.assertIn('1 unit(s)', out.getvalue())
+        self.assertEqual(self._location()[0], 'Test Zone → North Wing → Test Unit')
+
+
+class ActivityMonthStatsTest(BaseTestCase, TestCase):
+    """Test that the per-activity month counters follow record writes"""
+
+    def setUp(self):
+        self.create_test_hierarchy()
+        self.activity = TestDataFactory.create_activity(unit=self.unit)
+
+    def _stats(self, year=2025, month=10):
+        return ActivityMonthStats.objects.get(activity=self.activity, year=year, month=month)
+
+    def test_create_increments_counters(self):
+        """Test that new records are counted in their month and status"""
+        TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 10, 1), status='PENDING')
+        TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 10, 2), status='COMPLETED')
+
+        stats = self._stats()
+        self.assertEqual((stats.total, stats.pending, stats.completed), (2, 1, 1))
+        self.assertEqual(self.activity.get_actual_completions_for_month(2025, 10), 1)
+
+    def test_status_and_date_changes_move_counters(self):
+        """Test that changing status or month moves the record between buckets"""
+        record = TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 10, 1), status='PENDING')
+
+        record = CleaningRecord.objects.get(pk=record.pk)
+        record.status = 'VERIFIED'
+        record.save()
+        stats = self._stats()
+        self.assertEqual((stats.total, stats.pending, stats.verified), (1, 0, 1))
+
+        record.scheduled_date = date(2025, 11, 3)
+        record.save()
+        self.assertEqual(self._stats().total, 0)
+        self.assertEqual(self._stats(month=11).verified, 1)
+
+    def test_delete_decrements_counters(self):
+        """Test that deleted records leave the counters"""
+        record = TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 10, 1), status='COMPLETED')
+        CleaningRecord.objects.get(pk=record.pk).delete()
+
+        stats = self._stats()
+        self.assertEqual((stats.total, stats.completed), (0, 0))
+
+    def test_drifted_counters_stop_at_zero(self):
+        """Test that saving a record still works when a bulk write left its counters too low"""
+        record = TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 10, 1), status='PENDING')
+        # A status change that skips the signals: the PENDING counter is now too high, COMPLETED too low
+        CleaningRecord.objects.filter(pk=record.pk).update(status='COMPLETED')
+
+        record = CleaningRecord.objects.get(pk=record.pk)
+        record.status = 'VERIFIED'
+        record.save()
+
+        stats = self._stats()
+        self.assertEqual((stats.total, stats.completed, stats.verified), (1, 0, 1))
+
+    def test_rebuild_recovers_from_bulk_writes(self):
+        """Test that rebuild() recomputes counters after writes that bypass signals"""
+        TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 10, 1), status='PENDING')
+        CleaningRecord.objects.filter(activity=self.activity).update(status='COMPLETED')
+        self.assertEqual(self._stats().completed, 0)
+
+        ActivityMonthStats.rebuild()
+        stats = self._stats()
+        self.assertEqual((stats.total, stats.pending, stats.completed), (1, 0, 1))
+
+
+@skipUnless(connection.vendor == 'postgresql', 'EXPLAIN plans are only checked on PostgreSQL')
+class CleaningRecordIndexUsageTest(BaseTestCase, TestCase):
+    """Test that the views' own CleaningRecord queries are served by the composite indexes.
+
+    Each test requests a real page, captures the SQL it ran and EXPLAINs
+    every SELECT on the record table in the same transaction.
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.create_test_users()
+        self.create_test_hierarchy()
+        self.activity = TestDataFactory.create_activity(unit=self.unit)
+        start = date(2025, 10, 1)
+        CleaningRecord.objects.bulk_create([
+            CleaningRecord(
+                unit=self.unit,
+                activity=self.activity,
+                assigned_to=self.assistant,
+                scheduled_date=start + timedelta(days=i % 60),
+                status=('PENDING', 'COMPLETED')[i % 2],
+            )
+            for i in range(500)
+        ])
+        ActivityMonthStats.rebuild([self.activity.pk])
+        # Tiny test tables always favour a sequential scan; make the planner show its index choice
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('ANALYZE cleaning_cleaningrecord')
+
+    def record_plans(self, user, url, data=None):
+        """Request ``url`` as ``user`` and return the EXPLAIN output of each record SELECT it ran"""
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url, data or {})
+        self.assertEqual(response.status_code, 200)
+        plans = []
+        with connection.cursor() as cursor:
+            for query in captured.captured_queries:
+                sql = query['sql']
+                if sql.lstrip().upper().startswith('SELECT') and 'cleaning_cleaningrecord' in sql:
+                    cursor.execute('EXPLAIN ' + sql)
+                    plans.append('\n'.join(row[0] for row in cursor.fetchall()))
+        return plans
+
+    def test_calendar_uses_activity_date_index(self):
+        """Test the activity calendar's month snapshot"""
+        url = reverse('cleaning:cleaning_activity_calendar_month', kwargs={'pk': self.activity.pk, 'year': 2025, 'month': 10})
+        plans = self.record_plans(self.manager, url)
+        self.assertTrue(plans)
+        self.assertIn('cleaning_rec_act_date_idx', '\n'.join(plans))
+
+    def test_performance_report_reads_month_counters_only(self):
+        """Test that the performance report never scans the record table"""
+        plans = self.record_plans(self.manager, reverse('cleaning:activity_performance_report'),
+                                  {'year': 2025, 'month': 10})
+        self.assertEqual(plans, [])
+
+    def test_record_list_uses_list_order_index(self):
+        """Test the keyset-paginated record list"""
+        plans = self.record_plans(self.manager, reverse('cleaning:cleaning_record_list'))
+        self.assertIn('cleaning_rec_list_order_idx', '\n'.join(plans))
+
+    def test_dean_dashboard_uses_unit_date_index(self):
+        """Test the dean dashboard's faculty month lookup"""
+        dean = TestDataFactory.create_dean_office(username='faculty_dean', email='fd@test.com', faculty=self.faculty)
+        plans = self.record_plans(dean, reverse('dean_office:dashboard'), {'month': '2025-10'})
+        self.assertIn('cleaning_rec_unit_date_idx', '\n'.join(plans))
+
+    def test_assistant_dashboard_uses_assignee_index(self):
+        """Test the assistant dashboard's per-status lookups"""
+        plans = self.record_plans(self.assistant, reverse('assistant:dashboard'))
+        self.assertIn('cleaning_rec_assignee_idx', '\n'.join(plans))
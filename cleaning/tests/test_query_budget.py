@@ -0,0 +1,67 @@
+"""
+Tests for the query profiling and budget middleware
+"""
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from .fixtures import TestDataFactory, BaseTestCase
+from cleaning_project.middleware import QueryBudgetExceeded, query_shape
+from datetime import date
+
+
+@override_settings(QUERY_PROFILING=True)
+class QueryBudgetMiddlewareTest(BaseTestCase, TestCase):
+    """Test QueryBudgetMiddleware headers, logs and budgets"""
+
+    def setUp(self):
+        self.client = Client()
+        self.create_test_users()
+        self.create_test_hierarchy()
+        activity = TestDataFactory.create_activity(unit=self.unit)
+        for day in (1, 2, 3):
+            TestDataFactory.create_cleaning_record(activity=activity, scheduled_date=date(2025, 10, day))
+        self.login_as_manager()
+        self.url = reverse('cleaning:cleaning_record_list')
+
+    def test_server_timing_header(self):
+        """Test that responses report their SQL time and query count"""
+        response = self.client.get(self.url)
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'sql;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn('total;dur=', timing)
+
+    def test_profile_is_logged(self):
+        """Test that each request logs a structured profile"""
+        with self.assertLogs('cleaning_project.queries', 'INFO') as logs:
+            self.client.get(self.url)
+
+        profile = logs.records[0].query_profile
+        self.assertEqual(profile['view'], 'cleaning:cleaning_record_list')
+        self.assertGreater(profile['queries'], 0)
+        self.assertIn('sql_ms', profile)
+
+    @override_settings(QUERY_BUDGETS={'cleaning:cleaning_record_list': 1})
+    def test_over_budget_is_logged(self):
+        """Test that exceeding a budget logs a warning by default"""
+        with self.assertLogs('cleaning_project.queries', 'WARNING') as logs:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('over its budget of 1', logs.output[-1])
+
+    @override_settings(QUERY_BUDGETS={'cleaning:cleaning_record_list': 1}, QUERY_BUDGET_ACTION='raise')
+    def test_over_budget_raises_when_configured(self):
+        """Test that tests can make budget overruns fail"""
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(self.url)
+
+    @override_settings(QUERY_PROFILING=False)
+    def test_disabled_by_default(self):
+        """Test that the middleware removes itself unless enabled"""
+        response = Client().get(reverse('login'))
+        self.assertNotIn('Server-Timing', response)
+
+    def test_query_shape_collapses_in_lists(self):
+        """Test that IN lists of any length share one shape"""
+        self.assertEqual(
+            query_shape('SELECT 1 WHERE id IN (%s, %s, %s)'),
+            query_shape('SELECT 1 WHERE id IN (%s, %s)'),
+        )
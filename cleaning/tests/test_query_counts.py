@@ -0,0 +1,229 @@
+"""
+Query-count regression suite for every view.
+
+Seeds a synthetic campus with ``generate_campus()`` and requests every URL
+in the cleaning, manager, dean_office and assistant apps, failing when a
+view runs more queries than its budget. Budgets do not depend on the data
+volume, so a view that starts querying per row fails here long before it
+shows up in production. Wall-clock timings are written to stderr at the end.
+
+The full target volume is 3 zones, 30 sections, 10 faculties, 2,000 units,
+10,000 activities and about 1M records: records follow each activity's
+frequency (0.8 a day on average over the generator's mix), so the history
+is HISTORY_DAYS = 125 days long. Units and assistants are scaled down by
+PERF_SCALE (default 0.01) so the suite runs with the normal tests. Set PERF_SCALE=1 for a full
+volume run against a real database.
+"""
+import json
+import os
+import sys
+import time
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client, tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, reverse
+from assistant.models import Assistant, Schedule
+from cleaning.load_data import generate_campus
+from cleaning.models import CleaningActivity, CleaningRecord, Faculty, ReportJob, Section, Unit, Zone
+from .fixtures import TestDataFactory
+
+PERF_SCALE = float(os.environ.get('PERF_SCALE', '0.01'))
+
+# Days of record history: with 10,000 activities this gives about 1,002,000 records
+HISTORY_DAYS = 125
+
+# Apps whose every URL must have a budget below
+COVERED_NAMESPACES = ('cleaning', 'manager', 'dean_office', 'assistant')
+
+
+def _spec(name, budget, role='manager', method='get', data=None, kwargs=()):
+    return {'name': name, 'budget': budget, 'role': role, 'method': method, 'data': data, 'kwargs': dict(kwargs)}
+
+
+# Budgets include the session and user lookups every logged-in request makes
+VIEW_BUDGETS = [
+    _spec('cleaning:cleaning_record_list', 3),
+    _spec('cleaning:cleaning_record_list_more', 3),
+    _spec('cleaning:cleaning_record_export', 3),
+    _spec('cleaning:cleaning_record_create', 2),
+    _spec('cleaning:cleaning_record_detail', 6, kwargs={'pk': 'record'}),
+    _spec('cleaning:cleaning_record_update', 6, kwargs={'pk': 'record'}),
+    _spec('cleaning:cleaning_record_delete', 7, kwargs={'pk': 'record'}),
+    _spec('cleaning:cleaning_record_complete', 4, kwargs={'pk': 'record'}),
+    _spec('cleaning:cleaning_record_verify', 3, kwargs={'pk': 'record'}),
+    _spec('cleaning:activity_performance_report', 5),
+    _spec('cleaning:activity_performance_report_export', 4),
+    _spec('cleaning:faculty_list_report', 3),
+    _spec('cleaning:faculty_cleaning_report', 6, kwargs={'faculty_id': 'faculty'}),
+    _spec('cleaning:faculty_cleaning_report_export', 6, kwargs={'faculty_id': 'faculty'}),
+    _spec('cleaning:report_job_list', 4),
+    _spec('cleaning:report_job_status', 3, kwargs={'pk': 'job'}),
+    _spec('cleaning:report_job_download', 3, kwargs={'pk': 'job'}),
+    _spec('cleaning:cleaning_activity_list', 5),
+    _spec('cleaning:cleaning_activity_create', 2),
+    _spec('cleaning:cleaning_activity_create_multiple', 3),
+    _spec('cleaning:cleaning_activity_detail', 6, kwargs={'pk': 'activity'}),
+    _spec('cleaning:cleaning_activity_update', 4, kwargs={'pk': 'activity'}),
+    _spec('cleaning:cleaning_activity_delete', 6, kwargs={'pk': 'activity'}),
+    _spec('cleaning:cleaning_activity_calendar', 6, kwargs={'pk': 'activity'}),
+    _spec('cleaning:cleaning_activity_calendar_month', 6, kwargs={'pk': 'activity', 'year': 2025, 'month': 10}),
+    _spec('cleaning:unit_activities_bulk', 6, kwargs={'unit_id': 'unit'}),
+    _spec('cleaning:cleaning_activity_calendar_partial', 4, kwargs={'pk': 'activity'}),
+    _spec('cleaning:mark_activity_completed_day', 14, method='post', data={'date': '2030-01-01'},
+          kwargs={'pk': 'activity'}),
+    _spec('cleaning:mark_activity_days_completed', 11, method='post', data='batch'),
+    _spec('cleaning:get_activities_by_unit', 3, kwargs={'unit_id': 'unit'}),
+    _spec('cleaning:autocomplete_units', 3),
+    _spec('cleaning:autocomplete_activities', 3),
+    _spec('cleaning:autocomplete_assistants', 3),
+    _spec('cleaning:autocomplete_zones', 3),
+    _spec('cleaning:autocomplete_sections', 3),
+    _spec('cleaning:autocomplete_faculties', 3),
+
+    _spec('manager:dashboard', 3),
+    _spec('manager:zones_list', 3),
+    _spec('manager:zone_create', 2),
+    _spec('manager:zone_detail', 6, kwargs={'zone_id': 'zone'}),
+    _spec('manager:zone_update', 3, kwargs={'zone_id': 'zone'}),
+    _spec('manager:zone_delete', 3, kwargs={'zone_id': 'zone'}),
+    _spec('manager:sections_list', 3),
+    _spec('manager:section_create', 3),
+    _spec('manager:section_detail', 5, kwargs={'section_id': 'section'}),
+    _spec('manager:section_update', 4, kwargs={'section_id': 'section'}),
+    _spec('manager:section_delete', 4, kwargs={'section_id': 'section'}),
+    _spec('manager:faculties_list', 3),
+    _spec('manager:faculty_create', 4),
+    _spec('manager:faculty_detail', 5, kwargs={'faculty_id': 'faculty'}),
+    _spec('manager:faculty_update', 4, kwargs={'faculty_id': 'faculty'}),
+    _spec('manager:faculty_delete', 3, kwargs={'faculty_id': 'faculty'}),
+    _spec('manager:units_list', 5),
+    _spec('manager:units_list', 5, data={'search': 'unit 1', 'status': 'active'}),
+    _spec('manager:unit_create', 6),
+    _spec('manager:unit_detail', 7, kwargs={'unit_id': 'unit'}),
+    _spec('manager:unit_update', 7, kwargs={'unit_id': 'unit'}),
+    _spec('manager:unit_delete', 6, kwargs={'unit_id': 'unit'}),
+    _spec('manager:unit_schedule_monthly', 6, kwargs={'unit_id': 'unit'}),
+    _spec('manager:assistants_list', 4),
+    _spec('manager:reports', 4),
+
+    _spec('dean_office:dashboard', 7, role='dean'),
+    _spec('dean_office:reports', 5, role='dean'),
+    _spec('dean_office:kpis', 7, role='dean'),
+    _spec('dean_office:monitoring', 5, role='dean'),
+    _spec('dean_office:templates_list', 5, role='dean'),
+
+    _spec('assistant:dashboard', 6, role='assistant'),
+    _spec('assistant:profile', 2, role='assistant'),
+    _spec('assistant:schedule_list', 5, role='assistant'),
+    _spec('assistant:schedule_detail', 7, role='assistant', kwargs={'pk': 'schedule'}),
+    _spec('assistant:submit_schedule', 5, role='assistant', kwargs={'pk': 'schedule'}),
+]
+
+
+@tag('performance')
+class ViewQueryCountTest(TestCase):
+    """Assert a fixed query budget for every view against a seeded campus"""
+
+    timings = []
+
+    @classmethod
+    def setUpTestData(cls):
+        start = time.perf_counter()
+        cls.campus = generate_campus(
+            zones=3,
+            sections_per_zone=10,
+            faculties=10,
+            assistants=max(2, round(200 * PERF_SCALE)),
+            units=max(5, round(2000 * PERF_SCALE)),
+            activities_per_unit=5,
+            history_days=HISTORY_DAYS,
+            seed=1,
+        )
+        cls.seed_seconds = time.perf_counter() - start
+
+        cls.manager = TestDataFactory.create_manager()
+        cls.dean = TestDataFactory.create_dean_office(faculty=Faculty.objects.order_by('pk').first())
+        # A real assistant whose units and records come from the generated campus
+        cls.assistant = Unit.objects.exclude(assigned_assistant=None).order_by('pk').first().assigned_assistant
+        cls.assistant.set_password('testpass123')
+        cls.assistant.save()
+
+        unit = Unit.objects.filter(assigned_assistant=cls.assistant).order_by('pk').first()
+        cls.objects = {
+            'zone': Zone.objects.order_by('pk').first().pk,
+            'section': Section.objects.order_by('pk').first().pk,
+            'faculty': cls.dean.faculty_id,
+            'unit': unit.pk,
+            'activity': CleaningActivity.objects.filter(unit=unit).order_by('pk').first().pk,
+            'record': CleaningRecord.objects.filter(unit=unit).order_by('-pk').first().pk,
+            'job': ReportJob.objects.create(requested_by=cls.manager, report_type='RECORDS', export_format='csv').pk,
+            'schedule': Schedule.objects.create(
+                unit=unit,
+                month=unit.created_at.date().replace(day=1),
+                assigned_assistant=Assistant.objects.create(user=cls.assistant),
+            ).pk,
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if cls.timings:
+            lines = [f'\nView timings ({cls.campus.records} records, seeded in {cls.seed_seconds:.1f}s):']
+            for name, queries, seconds in sorted(cls.timings, key=lambda t: -t[2]):
+                lines.append(f'  {seconds * 1000:8.1f} ms  {queries:3d} queries  {name}')
+            sys.stderr.write('\n'.join(lines) + '\n')
+
+    def setUp(self):
+        cache.clear()
+
+    def _client(self, role):
+        client = Client()
+        client.force_login({'manager': self.manager, 'dean': self.dean, 'assistant': self.assistant}[role])
+        return client
+
+    def _request(self, spec):
+        client = self._client(spec['role'])
+        kwargs = {key: self.objects.get(value, value) for key, value in spec['kwargs'].items()}
+        url = reverse(spec['name'], kwargs=kwargs)
+        if spec['data'] == 'batch':
+            body = json.dumps({'items': [
+                {'activity_id': self.objects['activity'], 'date': f'2030-01-{day:02d}'} for day in range(1, 29)
+            ]})
+            call = lambda: client.post(url, body, content_type='application/json')
+        elif spec['method'] == 'post':
+            call = lambda: client.post(url, spec['data'] or {})
+        else:
+            call = lambda: client.get(url, spec['data'] or {})
+
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = call()
+            if response.streaming:
+                b''.join(response.streaming_content)
+            elapsed = time.perf_counter() - start
+        return response, len(queries), elapsed
+
+    def test_every_url_has_a_budget(self):
+        """Test that new URLs in the covered apps cannot skip this suite"""
+        budgeted = {spec['name'] for spec in VIEW_BUDGETS}
+        resolver = get_resolver()
+        missing = []
+        for namespace in COVERED_NAMESPACES:
+            _, sub_resolver = resolver.namespace_dict[namespace]
+            for pattern in sub_resolver.url_patterns:
+                name = f'{namespace}:{pattern.name}'
+                if pattern.name and name not in budgeted:
+                    missing.append(name)
+        self.assertEqual(missing, [])
+
+    def test_views_stay_within_query_budgets(self):
+        """Test every view against its query budget"""
+        for spec in VIEW_BUDGETS:
+            with self.subTest(view=spec['name'], data=spec['data']):
+                response, queries, elapsed = self._request(spec)
+                self.timings.append((spec['name'], queries, elapsed))
+                self.assertLess(response.status_code, 500)
+                self.assertLessEqual(
+                    queries, spec['budget'], f"{spec['name']} ran {queries} queries (budget {spec['budget']})"
+                )
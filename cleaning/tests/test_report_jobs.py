@@ -0,0 +1,148 @@
+"""
+Tests for background report jobs (Celery tasks run eagerly with an in-memory broker)
+"""
+import csv
+import io
+import shutil
+import tempfile
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from openpyxl import load_workbook
+from cleaning_project.celery import app as celery_app
+from .fixtures import TestDataFactory, BaseTestCase
+from cleaning.models import ReportJob
+from cleaning.tasks import generate_report
+from datetime import date
+
+
+class EagerCeleryMixin:
+    """Run Celery tasks inline against an in-memory broker and store files in a temp dir"""
+
+    def setUp(self):
+        super().setUp()
+        # The app reads Django settings with the CELERY_ namespace, so override the namespaced keys
+        self._celery_conf = {
+            f'CELERY_{key.upper()}': getattr(celery_app.conf, key)
+            for key in ('task_always_eager', 'task_eager_propagates', 'broker_url')
+        }
+        celery_app.conf.update(
+            CELERY_TASK_ALWAYS_EAGER=True, CELERY_TASK_EAGER_PROPAGATES=True, CELERY_BROKER_URL='memory://'
+        )
+        self.media_root = tempfile.mkdtemp()
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def tearDown(self):
+        celery_app.conf.update(**self._celery_conf)
+        shutil.rmtree(self.media_root, ignore_errors=True)
+        super().tearDown()
+
+
+class ReportJobViewTest(EagerCeleryMixin, BaseTestCase, TestCase):
+    """Test queueing, polling and downloading report jobs"""
+
+    def setUp(self):
+        super().setUp()
+        self.client = Client()
+        self.create_test_users()
+        self.create_test_hierarchy()
+        self.activity = TestDataFactory.create_activity('Sweep floor', unit=self.unit)
+        for day in (1, 2, 3):
+            TestDataFactory.create_cleaning_record(
+                activity=self.activity, scheduled_date=date(2025, 10, day), status='COMPLETED'
+            )
+        self.url = reverse('cleaning:report_job_list')
+
+    def _queue(self, **data):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.status_code, 202)
+        return ReportJob.objects.get(pk=response.json()['id'])
+
+    def test_records_job_produces_csv(self):
+        """Test that a queued records job runs and its CSV can be downloaded"""
+        self.login_as_manager()
+        job = self._queue(report_type='RECORDS', export_format='csv')
+
+        status = self.client.get(reverse('cleaning:report_job_status', args=[job.pk])).json()
+        self.assertEqual(status['status'], 'SUCCEEDED')
+        self.assertEqual(status['progress'], 100)
+        self.assertEqual(status['rows_written'], 3)
+
+        response = self.client.get(status['download_url'])
+        content = b''.join(response.streaming_content).decode('utf-8')
+        rows = list(csv.reader(io.StringIO(content)))
+        self.assertEqual(len(rows), 4)
+
+    def test_faculty_job_covers_several_months(self):
+        """Test that a faculty XLSX job writes one block of rows per month"""
+        self.login_as_manager()
+        job = self._queue(
+            report_type='FACULTY', export_format='xlsx', faculty=self.faculty.pk,
+            year=2025, month=10, months=3,
+        )
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'SUCCEEDED')
+
+        with job.file.open('rb') as f:
+            rows = list(load_workbook(f, read_only=True).active.iter_rows(values_only=True))
+        self.assertEqual([row[0] for row in rows[1:]], ['2025-08', '2025-09', '2025-10'])
+        self.assertEqual(rows[3][6], 3)
+
+    def test_performance_job_produces_pdf(self):
+        """Test that PDF artifacts are written"""
+        self.login_as_manager()
+        job = self._queue(report_type='ACTIVITY_PERFORMANCE', export_format='pdf', year=2025, month=10)
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, 'SUCCEEDED')
+        with job.file.open('rb') as f:
+            self.assertTrue(f.read().startswith(b'%PDF'))
+
+    def test_assistant_cannot_queue_performance_report(self):
+        """Test that report permissions apply to background jobs"""
+        self.login_as_assistant()
+        response = self.client.post(self.url, {'report_type': 'ACTIVITY_PERFORMANCE', 'export_format': 'csv'})
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(ReportJob.objects.exists())
+
+    def test_other_users_cannot_see_job(self):
+        """Test that status and download are limited to the requester"""
+        self.login_as_manager()
+        job = self._queue(report_type='RECORDS', export_format='csv')
+
+        self.login_as_assistant()
+        self.assertEqual(self.client.get(reverse('cleaning:report_job_status', args=[job.pk])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('cleaning:report_job_download', args=[job.pk])).status_code, 404)
+
+
+class GenerateReportTaskTest(EagerCeleryMixin, BaseTestCase, TestCase):
+    """Test the generate_report task directly"""
+
+    def setUp(self):
+        super().setUp()
+        self.create_test_users()
+        self.create_test_hierarchy()
+
+    def test_failure_is_recorded(self):
+        """Test that errors mark the job failed instead of leaving it running"""
+        job = ReportJob.objects.create(
+            requested_by=self.manager, report_type='FACULTY', export_format='csv', parameters={'faculty': 0}
+        )
+        generate_report.delay(job.pk)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'FAILED')
+        self.assertTrue(job.error)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_finished_job_is_not_rerun(self):
+        """Test that a redelivered task leaves a finished job alone"""
+        job = ReportJob.objects.create(
+            requested_by=self.manager, report_type='RECORDS', export_format='csv', status='SUCCEEDED'
+        )
+        generate_report.delay(job.pk)
+
+        job.refresh_from_db()
+        self.assertFalse(job.file)
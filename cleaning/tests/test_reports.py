@@ -0,0 +1,214 @@
+"""
+Tests for the set-based report helpers and the report views built on them
+"""
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from .fixtures import TestDataFactory, BaseTestCase
+from cleaning.models import CleaningActivity
+from cleaning.reports import (
+    activity_performance_rows, activity_performance_stats, completion_counts_for_month, faculty_rollup
+)
+from datetime import date
+
+
+class ActivityPerformanceRowsTest(BaseTestCase, TestCase):
+    """Test the activity performance report engine"""
+
+    def setUp(self):
+        self.create_test_hierarchy()
+        self.daily = TestDataFactory.create_activity('Sweep floor', unit=self.unit, frequency='DAILY')
+        self.monthly = TestDataFactory.create_activity('Clean windows', unit=self.unit, frequency='MONTHLY')
+        self.daily.budget_percentage = 50
+        self.daily.save()
+
+    def test_counts_only_completed_records_in_month(self):
+        """Test that pending records and other months are excluded"""
+        TestDataFactory.create_cleaning_record(activity=self.daily, scheduled_date=date(2025, 10, 1), status='COMPLETED')
+        TestDataFactory.create_cleaning_record(activity=self.daily, scheduled_date=date(2025, 10, 2), status='VERIFIED')
+        TestDataFactory.create_cleaning_record(activity=self.daily, scheduled_date=date(2025, 10, 3), status='PENDING')
+        TestDataFactory.create_cleaning_record(activity=self.daily, scheduled_date=date(2025, 11, 1), status='COMPLETED')
+
+        counts = completion_counts_for_month(2025, 10)
+        self.assertEqual(counts, {self.daily.pk: 2})
+
+    def test_rows_match_model_helpers(self):
+        """Test that rows agree with the per-activity model helpers"""
+        for day in (1, 2, 3):
+            TestDataFactory.create_cleaning_record(activity=self.daily, scheduled_date=date(2025, 10, day), status='COMPLETED')
+
+        rows = activity_performance_rows(CleaningActivity.objects.select_related('unit'), 2025, 10)
+        by_activity = {row['activity'].pk: row for row in rows}
+
+        for activity in (self.daily, self.monthly):
+            row = by_activity[activity.pk]
+            self.assertEqual(row['expected_completions'], activity.get_expected_completions_for_month(2025, 10))
+            self.assertEqual(row['actual_completions'], activity.get_actual_completions_for_month(2025, 10))
+            self.assertEqual(row['actual_percentage'], activity.get_completion_percentage_for_month(2025, 10))
+            self.assertEqual(row['variance'], activity.get_variance_percentage_for_month(2025, 10))
+        self.assertEqual(by_activity[self.daily.pk]['variance_class'], 'text-danger')
+
+    def test_rows_use_constant_queries(self):
+        """Test that the engine costs two queries however many activities exist"""
+        for i in range(10):
+            activity = TestDataFactory.create_activity(f'Extra {i}', unit=self.unit)
+            TestDataFactory.create_cleaning_record(activity=activity, scheduled_date=date(2025, 10, 5), status='COMPLETED')
+
+        with self.assertNumQueries(2):
+            rows = activity_performance_rows(CleaningActivity.objects.select_related('unit'), 2025, 10)
+        self.assertEqual(len(rows), 12)
+
+    def test_stats_sorted_by_location_in_sql(self):
+        """Test that report rows follow the stored location path, case-insensitively, then activity name"""
+        other = TestDataFactory.create_unit('annex', zone=self.zone, faculty=self.faculty)
+        TestDataFactory.create_activity('Mop', unit=other)
+
+        with self.assertNumQueries(2):
+            rows = activity_performance_stats(2025, 10)
+        self.assertEqual(
+            [(row['unit'].unit_name, row['activity'].activity_name) for row in rows],
+            [('annex', 'Mop'), ('Test Unit', 'Clean windows'), ('Test Unit', 'Sweep floor')],
+        )
+
+
+class ActivityPerformanceReportViewTest(BaseTestCase, TestCase):
+    """Test the activity_performance_report view"""
+
+    def setUp(self):
+        self.client = Client()
+        self.create_test_users()
+        self.create_test_hierarchy()
+        self.login_as_manager()
+        self.url = reverse('cleaning:activity_performance_report') + '?year=2025&month=10'
+
+    def _count_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_independent_of_activity_count(self):
+        """Test that adding activities does not add queries to the report"""
+        TestDataFactory.create_activity('First', unit=self.unit)
+        baseline = self._count_queries()
+
+        for i in range(10):
+            activity = TestDataFactory.create_activity(f'Activity {i}', unit=self.unit)
+            TestDataFactory.create_cleaning_record(activity=activity, scheduled_date=date(2025, 10, 5), status='COMPLETED')
+
+        self.assertEqual(self._count_queries(), baseline)
+
+
+class FacultyRollupTest(BaseTestCase, TestCase):
+    """Test the faculty rollup used by faculty_cleaning_report"""
+
+    def setUp(self):
+        self.create_test_hierarchy()
+        self.other_unit = TestDataFactory.create_unit('Second Unit', zone=self.zone, faculty=self.faculty)
+        TestDataFactory.create_unit('Closed Unit', zone=self.zone, faculty=self.faculty, is_active=False)
+        self.daily = TestDataFactory.create_activity('Sweep floor', unit=self.unit, frequency='DAILY')
+        self.weekly = TestDataFactory.create_activity('Clean windows', unit=self.unit, frequency='WEEKLY')
+        TestDataFactory.create_activity('Retired', unit=self.unit, is_active=False)
+
+    def test_unit_and_faculty_totals(self):
+        """Test that unit and faculty figures sum the active activities"""
+        for day in (1, 2):
+            TestDataFactory.create_cleaning_record(activity=self.daily, scheduled_date=date(2025, 10, day), status='COMPLETED')
+        TestDataFactory.create_cleaning_record(activity=self.weekly, scheduled_date=date(2025, 10, 6), status='VERIFIED')
+
+        rollup = faculty_rollup(self.faculty, 2025, 10)
+
+        self.assertEqual(rollup['total_units'], 2)
+        self.assertEqual(rollup['total_activities'], 2)
+        self.assertEqual(rollup['total_expected'], 31 + 4)
+        self.assertEqual(rollup['total_actual'], 3)
+        self.assertEqual(rollup['faculty_completion_pct'], round(3 / 35 * 100, 2))
+
+        by_unit = {row['unit'].pk: row for row in rollup['units_data']}
+        self.assertEqual(by_unit[self.unit.pk]['activity_count'], 2)
+        self.assertEqual(by_unit[self.unit.pk]['total_actual'], 3)
+        self.assertEqual(by_unit[self.other_unit.pk]['activity_count'], 0)
+        self.assertEqual(by_unit[self.other_unit.pk]['completion_percentage'], 0)
+
+    def test_rollup_uses_constant_queries(self):
+        """Test that the rollup costs three queries however many units exist"""
+        for i in range(5):
+            unit = TestDataFactory.create_unit(f'Extra Unit {i}', zone=self.zone, faculty=self.faculty)
+            activity = TestDataFactory.create_activity(f'Extra {i}', unit=unit)
+            TestDataFactory.create_cleaning_record(activity=activity, scheduled_date=date(2025, 10, 5), status='COMPLETED')
+
+        with self.assertNumQueries(3):
+            rollup = faculty_rollup(self.faculty, 2025, 10)
+            for row in rollup['units_data']:
+                row['unit'].get_full_location()
+        self.assertEqual(rollup['total_actual'], 5)
+
+
+class FacultyCleaningReportViewTest(BaseTestCase, TestCase):
+    """Test the faculty_cleaning_report view"""
+
+    def setUp(self):
+        self.client = Client()
+        self.create_test_users()
+        self.create_test_hierarchy()
+        self.login_as_dean()
+        self.url = reverse('cleaning:faculty_cleaning_report', kwargs={'faculty_id': self.faculty.id}) + '?year=2025&month=10'
+
+    def _count_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_independent_of_unit_count(self):
+        """Test that adding units and activities does not add queries to the report"""
+        TestDataFactory.create_activity('First', unit=self.unit)
+        baseline = self._count_queries()
+
+        for i in range(5):
+            unit = TestDataFactory.create_unit(f'Extra Unit {i}', zone=self.zone, faculty=self.faculty)
+            activity = TestDataFactory.create_activity(f'Extra {i}', unit=unit)
+            TestDataFactory.create_cleaning_record(activity=activity, scheduled_date=date(2025, 10, 5), status='COMPLETED')
+
+        self.assertEqual(self._count_queries(), baseline)
+
+
+class DeanDashboardStatsTest(BaseTestCase, TestCase):
+    """Test the dean dashboard KPI and month counters"""
+
+    def setUp(self):
+        self.client = Client()
+        self.create_test_users()
+        self.create_test_hierarchy()
+        self.dean.faculty = self.faculty
+        self.dean.save()
+        self.login_as_dean()
+        self.activity = TestDataFactory.create_activity(unit=self.unit)
+        self.url = reverse('dean_office:dashboard') + '?month=2025-10'
+
+    def test_kpis_and_month_stats(self):
+        """Test that the conditional aggregates count each status"""
+        for day, status in ((1, 'PENDING'), (2, 'IN_PROGRESS'), (3, 'COMPLETED'), (4, 'VERIFIED'), (5, 'VERIFIED')):
+            TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 10, day), status=status)
+        TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 11, 1), status='PENDING')
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['month_stats'], {
+            'total': 5, 'pending': 1, 'in_progress': 1, 'completed': 1, 'verified': 2,
+        })
+        kpis = response.context['kpis']
+        self.assertEqual(kpis['Total Records'], 6)
+        self.assertEqual(kpis['Completed Tasks'], 3)
+        self.assertEqual(kpis['Pending Tasks'], 2)
+
+    def test_query_count_is_fixed(self):
+        """Test that the dashboard needs the same queries with or without records"""
+        with CaptureQueriesContext(connection) as empty:
+            self.client.get(self.url)
+        for day in range(1, 11):
+            TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 10, day))
+        with CaptureQueriesContext(connection) as full:
+            self.client.get(self.url)
+        self.assertEqual(len(full.captured_queries), len(empty.captured_queries))
@@ -0,0 +1,276 @@
+"""
+Tests for the shared frequency rule engine
+"""
+import threading
+from unittest import mock, skipUnless
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, TransactionTestCase, Client
+from django.urls import reverse
+from .fixtures import TestDataFactory, BaseTestCase
+from cleaning.schedule import (
+    AM_SLOT, PM_SLOT, ActivitySchedule, RecordSnapshot, check_day, expected_slots,
+)
+from cleaning.models import CleaningActivity, CleaningRecord
+from datetime import date
+
+
+class ExpectedSlotsTest(TestCase):
+    """Test expected_slots() for each frequency"""
+
+    start = date(2025, 10, 1)
+    end = date(2025, 10, 31)
+
+    def test_daily_frequencies_cover_every_day(self):
+        """Test that DAILY and TWICE_DAILY expect every day with their slots"""
+        daily = expected_slots('DAILY', self.start, self.start, self.end)
+        twice = expected_slots('TWICE_DAILY', self.start, self.start, self.end)
+        self.assertEqual(len(daily), 31)
+        self.assertEqual(twice[date(2025, 10, 15)], [AM_SLOT, PM_SLOT])
+
+    def test_cycles_step_from_anchor(self):
+        """Test that cyclic frequencies count from an anchor outside the range"""
+        anchor = date(2025, 9, 29)
+        weekly = expected_slots('WEEKLY', anchor, self.start, self.end)
+        biweekly = expected_slots('BIWEEKLY', anchor, self.start, self.end)
+        every_2 = expected_slots('EVERY_2_DAYS', anchor, self.start, self.end)
+
+        self.assertEqual(sorted(weekly), [date(2025, 10, d) for d in (6, 13, 20, 27)])
+        self.assertEqual(sorted(biweekly), [date(2025, 10, 13), date(2025, 10, 27)])
+        self.assertEqual(min(every_2), date(2025, 10, 1))
+        self.assertEqual(len(every_2), 16)
+
+    def test_monthly_clamps_to_short_months(self):
+        """Test that a 31st anchor falls on the last day of shorter months"""
+        expected = expected_slots('MONTHLY', date(2025, 1, 31), date(2025, 2, 1), date(2025, 4, 30))
+        self.assertEqual(sorted(expected), [date(2025, 2, 28), date(2025, 3, 31), date(2025, 4, 30)])
+
+
+class CheckDayTest(TestCase):
+    """Test check_day() against in-memory snapshots"""
+
+    def _snapshot(self, *records):
+        return RecordSnapshot(date(2025, 9, 29), date(2025, 11, 2), [
+            {'id': i, 'scheduled_date': d, 'scheduled_time': None, 'status': status, 'assigned_to_id': None}
+            for i, (d, status) in enumerate(records)
+        ])
+
+    def test_weekly_limit_only_counts_completed(self):
+        """Test that pending records do not use up the weekly completion"""
+        snapshot = self._snapshot((date(2025, 10, 6), 'PENDING'))
+        self.assertIsNone(check_day('WEEKLY', None, snapshot, date(2025, 10, 7)))
+
+        snapshot.add(date(2025, 10, 8), None, 'COMPLETED')
+        self.assertEqual(check_day('WEEKLY', None, snapshot, date(2025, 10, 9)), 'Weekly limit reached for this week.')
+        self.assertIsNone(check_day('WEEKLY', None, snapshot, date(2025, 10, 13)))
+
+    def test_cycle_requires_anchor_to_be_enforced(self):
+        """Test that cycles only restrict days once an anchor exists"""
+        snapshot = self._snapshot()
+        self.assertIsNone(check_day('BIWEEKLY', None, snapshot, date(2025, 10, 3)))
+        self.assertIsNotNone(check_day('BIWEEKLY', date(2025, 10, 1), snapshot, date(2025, 10, 3)))
+        self.assertIsNone(check_day('BIWEEKLY', date(2025, 10, 1), snapshot, date(2025, 10, 15)))
+
+    def test_twice_daily_allows_two_records(self):
+        """Test the TWICE_DAILY per-day limit"""
+        snapshot = self._snapshot((date(2025, 10, 1), 'COMPLETED'))
+        self.assertIsNone(check_day('TWICE_DAILY', None, snapshot, date(2025, 10, 1)))
+        snapshot.add(date(2025, 10, 1), None, 'PENDING')
+        self.assertIsNotNone(check_day('TWICE_DAILY', None, snapshot, date(2025, 10, 1)))
+
+
+class ActivityScheduleTest(BaseTestCase, TestCase):
+    """Test ActivitySchedule and the views that use it"""
+
+    def setUp(self):
+        self.client = Client()
+        self.create_test_users()
+        self.create_test_hierarchy()
+        self.login_as_manager()
+        self.activity = TestDataFactory.create_activity(unit=self.unit, frequency='BIWEEKLY')
+        TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 9, 1), status='COMPLETED')
+        self.activity.refresh_from_db()
+
+    def test_load_costs_one_query(self):
+        """Test that loading a month's schedule needs only the snapshot query"""
+        with self.assertNumQueries(1):
+            schedule = ActivitySchedule.load(self.activity, 2025, 10)
+        with self.assertNumQueries(0):
+            for day in range(1, 32):
+                schedule.check(date(2025, 10, day))
+        self.assertEqual(schedule.anchor, date(2025, 9, 1))
+
+    def test_plan_sees_earlier_days(self):
+        """Test that plan() accepts each cycle day once"""
+        schedule = ActivitySchedule.load(self.activity, 2025, 10)
+        planned = schedule.plan([date(2025, 10, 13), date(2025, 10, 13), date(2025, 10, 14), date(2025, 10, 27)])
+        self.assertEqual([day for day, _ in planned], [date(2025, 10, 13), date(2025, 10, 27)])
+
+    def test_calendar_and_partial_agree_with_marking_api(self):
+        """Test that both calendars show the days the marking API accepts"""
+        calendar_url = reverse('cleaning:cleaning_activity_calendar_month', kwargs={'pk': self.activity.pk, 'year': 2025, 'month': 10})
+        partial_url = reverse('cleaning:cleaning_activity_calendar_partial', kwargs={'pk': self.activity.pk}) + '?year=2025&month=10'
+
+        calendar_days = {
+            d['date'] for week in self.client.get(calendar_url).context['month_weeks']
+            for d in week if d['expected_slots']
+        }
+        partial_days = {
+            d['date'] for week in self.client.get(partial_url).context['month_weeks']
+            for d in week if d.get('is_expected')
+        }
+        self.assertEqual(calendar_days, {date(2025, 10, 13), date(2025, 10, 27)})
+        self.assertEqual(partial_days, calendar_days)
+
+        mark_url = reverse('cleaning:mark_activity_completed_day', kwargs={'pk': self.activity.pk})
+        self.assertEqual(self.client.post(mark_url, {'date': '2025-10-14'}).status_code, 400)
+        self.assertEqual(self.client.post(mark_url, {'date': '2025-10-13'}).status_code, 200)
+
+
+class MarkDayConflictTest(BaseTestCase, TestCase):
+    """Test that the database rejects a second completion of the same slot"""
+
+    def setUp(self):
+        self.client = Client()
+        self.create_test_users()
+        self.create_test_hierarchy()
+        self.login_as_manager()
+        self.activity = TestDataFactory.create_activity(unit=self.unit, frequency='DAILY')
+        self.url = reverse('cleaning:mark_activity_completed_day', kwargs={'pk': self.activity.pk})
+
+    def test_new_records_take_the_morning_slot(self):
+        """Test that marking a day creates the record at the default slot"""
+        response = self.client.post(self.url, {'date': '2025-10-01'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(CleaningRecord.objects.get(pk=response.json()['record_id']).scheduled_time, AM_SLOT)
+
+    def test_completed_slot_is_unique(self):
+        """Test that the constraint allows only one completed record per slot"""
+        TestDataFactory.create_cleaning_record(
+            activity=self.activity, scheduled_date=date(2025, 10, 1), status='COMPLETED'
+        )
+        TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 10, 1))
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            TestDataFactory.create_cleaning_record(
+                activity=self.activity, scheduled_date=date(2025, 10, 1), status='VERIFIED'
+            )
+
+    def test_completed_untimed_day_is_unique(self):
+        """Test that the constraint also allows only one untimed completed record per day"""
+        TestDataFactory.create_cleaning_record(
+            activity=self.activity, scheduled_date=date(2025, 10, 1), scheduled_time=None, status='COMPLETED'
+        )
+        TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 10, 1), scheduled_time=None)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            TestDataFactory.create_cleaning_record(
+                activity=self.activity, scheduled_date=date(2025, 10, 1), scheduled_time=None, status='COMPLETED'
+            )
+
+    def test_slot_conflict_returns_409(self):
+        """Test that a write slipping past the rule check is reported as a conflict"""
+        with mock.patch('cleaning.views._mark_days_completed', side_effect=IntegrityError):
+            response = self.client.post(self.url, {'date': '2025-10-01'})
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(response.json()['ok'])
+
+
+@skipUnless(connection.features.has_select_for_update, 'Requires row locking')
+class MarkDayConcurrencyTest(BaseTestCase, TransactionTestCase):
+    """Test simultaneous marks of the same day against a real database"""
+
+    def setUp(self):
+        self.create_test_users()
+        self.create_test_hierarchy()
+        self.activity = TestDataFactory.create_activity(unit=self.unit, frequency='WEEKLY')
+        self.url = reverse('cleaning:mark_activity_completed_day', kwargs={'pk': self.activity.pk})
+
+    def test_only_one_concurrent_mark_wins(self):
+        """Test that parallel requests for one day create exactly one record"""
+        statuses = []
+        barrier = threading.Barrier(4)
+
+        def mark():
+            client = Client()
+            client.force_login(self.manager)
+            barrier.wait()
+            try:
+                statuses.append(client.post(self.url, {'date': '2025-10-01'}).status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=mark) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(statuses)[0], 200)
+        self.assertEqual(statuses.count(200), 1)
+        self.assertTrue(all(code in (200, 400, 409) for code in statuses))
+        self.assertEqual(CleaningRecord.objects.filter(activity=self.activity).count(), 1)
+
+
+class FirstRecordDateTest(BaseTestCase, TestCase):
+    """Test that CleaningActivity.first_record_date follows record writes"""
+
+    def setUp(self):
+        self.create_test_users()
+        self.create_test_hierarchy()
+        self.activity = TestDataFactory.create_activity(unit=self.unit, frequency='EVERY_2_DAYS')
+
+    def _anchor(self):
+        self.activity.refresh_from_db()
+        return self.activity.first_record_date
+
+    def test_follows_creates_moves_and_deletes(self):
+        """Test that the stored anchor is always the earliest record's date"""
+        self.assertIsNone(self._anchor())
+        later = TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 10, 10))
+        self.assertEqual(self._anchor(), date(2025, 10, 10))
+        first = TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 10, 4))
+        self.assertEqual(self._anchor(), date(2025, 10, 4))
+
+        first = CleaningRecord.objects.get(pk=first.pk)
+        first.scheduled_date = date(2025, 10, 20)
+        first.save()
+        self.assertEqual(self._anchor(), date(2025, 10, 10))
+
+        CleaningRecord.objects.get(pk=later.pk).delete()
+        self.assertEqual(self._anchor(), date(2025, 10, 20))
+        CleaningRecord.objects.get(pk=first.pk).delete()
+        self.assertIsNone(self._anchor())
+
+    def test_stale_activity_save_keeps_anchor(self):
+        """Test that saving an activity loaded before a record was added keeps the anchor"""
+        stale = CleaningActivity.objects.get(pk=self.activity.pk)
+        TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 10, 4))
+        stale.description = 'Edited'
+        stale.save()
+        self.assertEqual(self._anchor(), date(2025, 10, 4))
+
+    def test_activity_save_keeps_default_semantics(self):
+        """Test that saving an activity whose row is gone inserts it again, as Model.save() does"""
+        stale = CleaningActivity.objects.get(pk=self.activity.pk)
+        CleaningActivity.objects.filter(pk=stale.pk).delete()
+        stale.save()
+        self.assertTrue(CleaningActivity.objects.filter(pk=stale.pk).exists())
+        self.assertIsNone(self._anchor())
+
+    def test_bulk_marking_sets_anchor(self):
+        """Test that the batch marking endpoint, which skips signals, maintains the anchor"""
+        client = Client()
+        client.force_login(self.manager)
+        response = client.post(
+            reverse('cleaning:mark_activity_days_completed'),
+            {'items': [{'activity_id': self.activity.pk, 'date': d} for d in ('2025-10-08', '2025-10-06')]},
+            content_type='application/json',
+        )
+        self.assertEqual([r['ok'] for r in response.json()['results']], [True, True])
+        self.assertEqual(self._anchor(), date(2025, 10, 6))
+
+    def test_refresh_recomputes_from_records(self):
+        """Test the full recompute used after imports"""
+        TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 10, 4))
+        CleaningActivity.objects.filter(pk=self.activity.pk).update(first_record_date=None)
+        CleaningActivity.refresh_first_record_date()
+        self.assertEqual(self._anchor(), date(2025, 10, 4))
@@ -1,11 +1,15 @@
 """
 Tests for Cleaning views (non-API endpoints)
 """
+import re
+from django.contrib.auth import get_user_model
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.urls import reverse
 from .fixtures import TestDataFactory, BaseTestCase
 from cleaning.models import CleaningRecord
-from datetime import date, timedelta
+from datetime import date, time, timedelta
 
 
 class CleaningRecordListViewTest(BaseTestCase, TestCase):
@@ -64,8 +68,145 @@ class CleaningRecordListViewTest(BaseTestCase, TestCase):
         
         self.assertEqual(response.status_code, 200)
         # Should only show completed records
-        self.assertEqual(response.context['object_list'].count(), 1)
-        self.assertEqual(response.context['object_list'].first().status, 'COMPLETED')
+        self.assertEqual(len(response.context['records']), 1)
+        self.assertEqual(response.context['records'][0].status, 'COMPLETED')
+
+
+class CleaningRecordListPaginationTest(BaseTestCase, TestCase):
+    """Test keyset pagination of the cleaning record list"""
+    
+    def setUp(self):
+        self.client = Client()
+        self.create_test_users()
+        self.create_test_hierarchy()
+        self.activity = TestDataFactory.create_activity(unit=self.unit)
+        # Two records per day, one with and one without a scheduled time
+        for day in range(1, 8):
+            TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 10, day))
+            TestDataFactory.create_cleaning_record(activity=self.activity, scheduled_date=date(2025, 10, day), scheduled_time=None)
+        self.login_as_manager()
+        self.url = reverse('cleaning:cleaning_record_list')
+        self.more_url = reverse('cleaning:cleaning_record_list_more')
+    
+    def test_pages_cover_all_records_once(self):
+        """Test that following cursors visits every record exactly once, newest first"""
+        response = self.client.get(self.url, {'page_size': 4})
+        seen = [record.pk for record in response.context['records']]
+        cursor = response.context['next_cursor']
+        
+        while cursor:
+            data = self.client.get(self.more_url, {'page_size': 4, 'cursor': cursor}).json()
+            self.assertLessEqual(data['count'], 4)
+            cursor = data['next_cursor']
+            seen.extend(int(pk) for pk in re.findall(r'data-record-id="(\d+)"', data['html']))
+        
+        expected = list(
+            CleaningRecord.objects.order_by('-scheduled_date', '-scheduled_time', '-id')
+            .values_list('pk', flat=True)
+        )
+        self.assertEqual(seen, expected)
+    
+    def test_load_more_keeps_filters(self):
+        """Test that the load more endpoint applies the list filters"""
+        CleaningRecord.objects.filter(scheduled_date=date(2025, 10, 1)).update(status='COMPLETED')
+        data = self.client.get(self.more_url, {'status': 'COMPLETED'}).json()
+        self.assertEqual(data['count'], 2)
+        self.assertIsNone(data['next_cursor'])
+    
+    def test_invalid_cursor_starts_from_first_page(self):
+        """Test that a malformed cursor is ignored"""
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor', 'page_size': 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['records'][0].scheduled_date, date(2025, 10, 7))
+    
+    def test_deep_page_costs_same_queries(self):
+        """Test that a page far into the history costs no more queries than the first"""
+        with CaptureQueriesContext(connection) as first:
+            response = self.client.get(self.more_url, {'page_size': 2})
+        cursor = response.json()['next_cursor']
+        for _ in range(4):
+            cursor = self.client.get(self.more_url, {'page_size': 2, 'cursor': cursor}).json()['next_cursor']
+        with CaptureQueriesContext(connection) as deep:
+            self.client.get(self.more_url, {'page_size': 2, 'cursor': cursor})
+        self.assertEqual(len(deep.captured_queries), len(first.captured_queries))
+
+
+class CleaningActivityListViewTest(BaseTestCase, TestCase):
+    """Test the paginated, faceted activity browser"""
+
+    def setUp(self):
+        self.client = Client()
+        self.create_test_users()
+        self.create_test_hierarchy()
+        self.other_zone = TestDataFactory.create_zone('Annex Zone')
+        self.other_unit = TestDataFactory.create_unit('Annex Hall', zone=self.other_zone, faculty=self.faculty)
+        TestDataFactory.create_activity('Sweep floor', unit=self.unit, frequency='DAILY')
+        TestDataFactory.create_activity('Mop floor', unit=self.unit, frequency='WEEKLY')
+        TestDataFactory.create_activity('Dust shelves', unit=self.other_unit, frequency='DAILY')
+        inactive = TestDataFactory.create_activity('Wax floor', unit=self.other_unit, frequency='MONTHLY')
+        inactive.is_active = False
+        inactive.save()
+        self.login_as_manager()
+        self.url = reverse('cleaning:cleaning_activity_list')
+
+    def _names(self, response):
+        return [activity.activity_name for activity in response.context['activities']]
+
+    def _facet(self, response, title):
+        return {link['label']: (link['count'], link['selected']) for t, links in response.context['facets'] if t == title
+                for link in links}
+
+    def test_facet_counts_ignore_their_own_selection(self):
+        """Test that each facet counts the other facets' selections but not its own"""
+        response = self.client.get(self.url, {'frequency': 'DAILY'})
+
+        self.assertEqual(sorted(self._names(response)), ['Dust shelves', 'Sweep floor'])
+        self.assertEqual(
+            self._facet(response, 'Frequency'),
+            {'Daily': (2, True), 'Weekly': (1, False), 'Monthly': (1, False)},
+        )
+        self.assertEqual(self._facet(response, 'Zone'), {'Annex Zone': (1, False), 'Test Zone': (1, False)})
+        self.assertEqual(self._facet(response, 'Status'), {'Active': (2, False)})
+
+    def test_filters_combine(self):
+        """Test zone, status and name prefix filters from the query string"""
+        response = self.client.get(self.url, {'zone': self.other_zone.pk, 'is_active': 'false'})
+        self.assertEqual(self._names(response), ['Wax floor'])
+
+        response = self.client.get(self.url, {'q': 'mop'})
+        self.assertEqual(self._names(response), ['Mop floor'])
+
+    def test_sorting(self):
+        """Test server-side sort keys and their reversed forms"""
+        self.assertEqual(
+            self._names(self.client.get(self.url)),
+            ['Dust shelves', 'Wax floor', 'Mop floor', 'Sweep floor'],
+        )
+        self.assertEqual(
+            self._names(self.client.get(self.url, {'sort': '-name'})),
+            ['Wax floor', 'Sweep floor', 'Mop floor', 'Dust shelves'],
+        )
+        self.assertEqual(self._names(self.client.get(self.url, {'sort': '-frequency'}))[0], 'Wax floor')
+        self.assertEqual(self._names(self.client.get(self.url, {'sort': '-status'}))[0], 'Wax floor')
+
+    def test_pagination_keeps_filters_in_links(self):
+        """Test that page links carry the filter state and an invalid sort falls back"""
+        response = self.client.get(self.url, {'page_size': 1, 'is_active': 'true', 'sort': 'bogus', 'page': 2})
+
+        self.assertEqual(response.context['page_obj'].paginator.count, 3)
+        self.assertEqual(self._names(response), ['Mop floor'])
+        self.assertContains(response, 'page_size=1&amp;is_active=true&amp;sort=bogus&amp;page=3')
+
+    def test_query_count_independent_of_activity_count(self):
+        """Test that the page costs the same queries however many activities exist"""
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url, {'page_size': 2})
+        for i in range(20):
+            unit = TestDataFactory.create_unit(f'Extra {i}', zone=self.zone, faculty=self.faculty)
+            TestDataFactory.create_activity(f'Extra activity {i}', unit=unit)
+        with CaptureQueriesContext(connection) as large:
+            self.client.get(self.url, {'page_size': 2})
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
 
 
 class CleaningRecordCreateViewTest(BaseTestCase, TestCase):
@@ -132,6 +273,78 @@ class CleaningRecordCreateViewTest(BaseTestCase, TestCase):
         self.assertIsNotNone(record.completed_date)
 
 
+class CalendarBulkCreateTest(BaseTestCase, TestCase):
+    """Test creating records from calendar-selected days"""
+    
+    def setUp(self):
+        self.client = Client()
+        self.create_test_users()
+        self.create_test_hierarchy()
+        self.login_as_manager()
+        self.url = reverse('cleaning:cleaning_record_create')
+    
+    def _submit(self, activity, days):
+        return self.client.post(self.url, {
+            'unit': self.unit.id,
+            'activity': activity.id,
+            'scheduled_date': '2025-10-01',
+            'assigned_to': self.assistant.id,
+            'selected_days': ','.join(d.isoformat() for d in days),
+        })
+    
+    def _dates(self, activity):
+        return list(
+            CleaningRecord.objects.filter(activity=activity)
+            .order_by('scheduled_date', 'scheduled_time')
+            .values_list('scheduled_date', 'scheduled_time')
+        )
+    
+    def test_twice_daily_fills_missing_slots(self):
+        """Test that TWICE_DAILY days get up to two records in free slots"""
+        activity = TestDataFactory.create_activity(unit=self.unit, frequency='TWICE_DAILY')
+        TestDataFactory.create_cleaning_record(activity=activity, scheduled_date=date(2025, 10, 1), scheduled_time='09:00:00')
+        
+        self._submit(activity, [date(2025, 10, 1), date(2025, 10, 2), date(2025, 10, 2)])
+        
+        am, pm = time(9, 0), time(15, 0)
+        self.assertEqual(self._dates(activity), [
+            (date(2025, 10, 1), am), (date(2025, 10, 1), pm),
+            (date(2025, 10, 2), am), (date(2025, 10, 2), pm),
+        ])
+        self.assertEqual(activity.get_actual_completions_for_month(2025, 10), 3)
+    
+    def test_weekly_limit_counts_days_from_same_submission(self):
+        """Test that a second day in the same week is skipped, including across the month edge"""
+        activity = TestDataFactory.create_activity(unit=self.unit, frequency='WEEKLY')
+        # Monday 29 September completes the week that contains 1-5 October
+        TestDataFactory.create_cleaning_record(activity=activity, scheduled_date=date(2025, 9, 29), status='COMPLETED')
+        
+        self._submit(activity, [date(2025, 10, 2), date(2025, 10, 7), date(2025, 10, 9), date(2025, 10, 14)])
+        
+        created = [d for d, _ in self._dates(activity) if d.month == 10]
+        self.assertEqual(created, [date(2025, 10, 7), date(2025, 10, 14)])
+    
+    def test_cycle_anchored_on_first_selected_day(self):
+        """Test that EVERY_2_DAYS without history anchors on the earliest selected day"""
+        activity = TestDataFactory.create_activity(unit=self.unit, frequency='EVERY_2_DAYS')
+        
+        self._submit(activity, [date(2025, 10, 6), date(2025, 10, 3), date(2025, 10, 5), date(2025, 11, 1)])
+        
+        self.assertEqual([d for d, _ in self._dates(activity)], [date(2025, 10, 3), date(2025, 10, 5)])
+    
+    def test_month_submission_uses_fixed_queries(self):
+        """Test that a full-month TWICE_DAILY submission does not query per day"""
+        activity = TestDataFactory.create_activity(unit=self.unit, frequency='TWICE_DAILY')
+        days = [date(2025, 10, d) for d in range(1, 32)]
+        
+        with CaptureQueriesContext(connection) as ctx:
+            response = self._submit(activity, days)
+        
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(CleaningRecord.objects.filter(activity=activity).count(), 62)
+        self.assertLess(len(ctx.captured_queries), 20)
+
+
 class CleaningRecordCompleteViewTest(BaseTestCase, TestCase):
     """Test completing cleaning records"""
     
@@ -161,6 +374,46 @@ class CleaningRecordCompleteViewTest(BaseTestCase, TestCase):
         self.assertEqual(record.status, 'COMPLETED')
         self.assertIsNotNone(record.completed_date)
     
+    def test_complete_slot_already_completed(self):
+        """Test that completing a record whose time slot is already completed fails cleanly"""
+        TestDataFactory.create_cleaning_record(
+            activity=self.activity, scheduled_date=date(2025, 10, 1), status='COMPLETED', assigned_to=self.assistant
+        )
+        record = TestDataFactory.create_cleaning_record(
+            activity=self.activity, scheduled_date=date(2025, 10, 1), status='PENDING', assigned_to=self.assistant
+        )
+
+        self.login_as_assistant()
+        url = reverse('cleaning:cleaning_record_complete', kwargs={'pk': record.id})
+        response = self.client.get(url, follow=True)
+
+        self.assertRedirects(response, reverse('cleaning:cleaning_record_detail', kwargs={'pk': record.id}))
+        self.assertIn('already been completed', ' '.join(str(m) for m in response.context['messages']))
+        record.refresh_from_db()
+        self.assertEqual(record.status, 'PENDING')
+
+    def test_admin_complete_slot_already_completed(self):
+        """Test that the admin action reports a completed slot instead of failing"""
+        TestDataFactory.create_cleaning_record(
+            activity=self.activity, scheduled_date=date(2025, 10, 1), status='COMPLETED'
+        )
+        record = TestDataFactory.create_cleaning_record(
+            activity=self.activity, scheduled_date=date(2025, 10, 1), status='PENDING'
+        )
+        admin_user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'testpass123')
+        self.client.force_login(admin_user)
+
+        response = self.client.post(
+            reverse('admin:cleaning_cleaningrecord_changelist'),
+            {'action': 'mark_as_completed', '_selected_action': [record.pk]},
+            follow=True,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'No records were marked as completed')
+        record.refresh_from_db()
+        self.assertEqual(record.status, 'PENDING')
+
     def test_cannot_complete_already_completed(self):
         """Test that you cannot re-complete a completed record"""
         record = TestDataFactory.create_cleaning_record(
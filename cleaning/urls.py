@@ -6,6 +6,8 @@ app_name = 'cleaning'
 urlpatterns = [
     # Cleaning Record URLs
     path('records/', views.cleaning_record_list, name='cleaning_record_list'),
+    path('records/more/', views.cleaning_record_list_more, name='cleaning_record_list_more'),
+    path('records/export/', views.cleaning_record_export, name='cleaning_record_export'),
     path('records/create/', views.cleaning_record_create, name='cleaning_record_create'),
     path('records/<int:pk>/', views.cleaning_record_detail, name='cleaning_record_detail'),
     path('records/<int:pk>/update/', views.cleaning_record_update, name='cleaning_record_update'),
@@ -15,8 +17,15 @@ urlpatterns = [
     
     # Performance Reports
     path('reports/performance/', views.activity_performance_report, name='activity_performance_report'),
+    path('reports/performance/export/', views.activity_performance_report_export, name='activity_performance_report_export'),
     path('reports/faculties/', views.faculty_list_report, name='faculty_list_report'),
     path('reports/faculty/<int:faculty_id>/', views.faculty_cleaning_report, name='faculty_cleaning_report'),
+    path('reports/faculty/<int:faculty_id>/export/', views.faculty_cleaning_report_export, name='faculty_cleaning_report_export'),
+    
+    # Background report jobs
+    path('reports/jobs/', views.report_job_list, name='report_job_list'),
+    path('reports/jobs/<int:pk>/status/', views.report_job_status, name='report_job_status'),
+    path('reports/jobs/<int:pk>/download/', views.report_job_download, name='report_job_download'),
     
     # Cleaning Activity URLs
     path('activities/', views.cleaning_activity_list, name='cleaning_activity_list'),
@@ -33,7 +42,14 @@ urlpatterns = [
     path('activities/<int:pk>/calendar/partial/', views.cleaning_activity_calendar_partial, name='cleaning_activity_calendar_partial'),
     # API to mark a day completed for an activity
     path('api/activities/<int:pk>/complete-day/', views.mark_activity_completed_day, name='mark_activity_completed_day'),
+    path('api/activities/complete-days/', views.mark_activity_days_completed, name='mark_activity_days_completed'),
     
     # AJAX endpoints
     path('api/activities/unit/<int:unit_id>/', views.get_activities_by_unit, name='get_activities_by_unit'),
+    path('api/autocomplete/units/', views.autocomplete_units, name='autocomplete_units'),
+    path('api/autocomplete/activities/', views.autocomplete_activities, name='autocomplete_activities'),
+    path('api/autocomplete/assistants/', views.autocomplete_assistants, name='autocomplete_assistants'),
+    path('api/autocomplete/zones/', views.autocomplete_zones, name='autocomplete_zones'),
+    path('api/autocomplete/sections/', views.autocomplete_sections, name='autocomplete_sections'),
+    path('api/autocomplete/faculties/', views.autocomplete_faculties, name='autocomplete_faculties'),
 ]
@@ -1,21 +1,79 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
+from django.template.loader import render_to_string
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
 from datetime import date, datetime, time as dtime, timedelta
 import calendar
-from django.db.models import Q
-from django.http import JsonResponse
+import json
+from collections import Counter, defaultdict
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, Q, Value, When
+from django.core.paginator import Paginator
+from django.core.cache import cache
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, HttpResponseBadRequest
 from django.forms import inlineformset_factory, modelformset_factory
-from .models import CleaningRecord, CleaningActivity, Unit, Faculty
+from .models import CleaningRecord, CleaningActivity, Unit, Faculty, ReportJob, ActivityMonthStats, Section, Zone
+from .schedule import (
+    ActivitySchedule, RecordSnapshot, AM_SLOT, TWICE_DAILY_SLOTS, days_snapshot_range,
+)
+from .tasks import generate_report
+from .caching import CALENDAR_PARTIAL_TIMEOUT, bump_activity_versions, bump_user_versions, calendar_partial_key
+from .reports import activity_performance_stats, faculty_rollup
+from .pagination import get_page_size, keyset_page, sort_query
+from .facets import facet_counts, matching_total
+from .exports import (
+    EXPORT_FORMATS,
+    RECORD_EXPORT_HEADER,
+    ACTIVITY_EXPORT_HEADER,
+    export_response,
+    export_records,
+    filter_records,
+    record_export_rows,
+    activity_export_rows,
+    faculty_export_rows,
+)
 from .forms import (
     CleaningRecordForm, 
     CleaningVerificationForm, 
     CleaningCompletionForm,
-    CleaningRecordFilterForm,
-    CleaningActivityForm
+    CleaningActivityForm,
+    CleaningActivityFilterForm,
+    ReportJobForm,
+    assistant_label,
+    section_label,
+    unit_label,
+)
+
+# Largest number of days the batch mark-completed endpoint accepts per request
+MAX_BATCH_MARK_ITEMS = 500
+
+# Autocomplete endpoints return at most this many options per page, and
+# only the first few pages: past that the user should type more
+AUTOCOMPLETE_PAGE_SIZE = 20
+AUTOCOMPLETE_MAX_PAGES = 5
+
+# Activity browser facets: name -> the field each one groups and filters by
+ACTIVITY_FACETS = {
+    'frequency': 'frequency',
+    'is_active': 'is_active',
+    'zone': 'unit__zone_id',
+}
+
+# Activity browser sort keys: the first ordering is reversed for "-key";
+# the rest break ties so pages never overlap
+_FREQUENCY_RANK = Case(
+    *[When(frequency=code, then=Value(rank)) for rank, (code, _label) in enumerate(CleaningActivity.FREQUENCY_CHOICES)],
+    default=Value(len(CleaningActivity.FREQUENCY_CHOICES)),
 )
+ACTIVITY_SORTS = {
+    'location': [F('unit__location_key').asc(), 'activity_name', 'pk'],
+    'name': [F('activity_name').asc(), 'unit__location_key', 'pk'],
+    'frequency': [_FREQUENCY_RANK.asc(), 'unit__location_key', 'activity_name', 'pk'],
+    'status': [F('is_active').desc(), 'unit__location_key', 'activity_name', 'pk'],
+}
 
 # Helper: build a timezone-aware datetime from a date and optional time
 def _combine_aware(dt_date, dt_time=None):
@@ -30,39 +88,81 @@ def _combine_aware(dt_date, dt_time=None):
         return timezone.make_aware(naive, timezone.get_current_timezone())
     return naive
 
+def _lock_activity(activity):
+    """Lock the activity row until the end of the current transaction.
+
+    Every write that is checked against the frequency rules takes this lock
+    first, so concurrent requests for one activity run their checks one at a
+    time and each sees the records the previous one created. The stored
+    anchor is re-read under the lock, as an earlier request may have moved it.
+    """
+    activity.first_record_date = (
+        CleaningActivity.objects.select_for_update()
+        .filter(pk=activity.pk).values_list('first_record_date', flat=True).get()
+    )
+
+
+def _filtered_records(request):
+    """Return (records, filter_form) for the record list filters and the user's role"""
+    return filter_records(request.user, request.GET)
+
+
 @login_required
 def cleaning_record_list(request):
-    """List all cleaning records with filtering"""
-    records = CleaningRecord.objects.select_related(
-        'unit', 'activity', 'assigned_to', 'verified_by'
-    ).all()
-    
-    # Apply filters
-    filter_form = CleaningRecordFilterForm(request.GET)
-    if filter_form.is_valid():
-        if filter_form.cleaned_data.get('status'):
-            records = records.filter(status=filter_form.cleaned_data['status'])
-        if filter_form.cleaned_data.get('unit'):
-            records = records.filter(unit=filter_form.cleaned_data['unit'])
-        if filter_form.cleaned_data.get('assigned_to'):
-            records = records.filter(assigned_to=filter_form.cleaned_data['assigned_to'])
-        if filter_form.cleaned_data.get('date_from'):
-            records = records.filter(scheduled_date__gte=filter_form.cleaned_data['date_from'])
-        if filter_form.cleaned_data.get('date_to'):
-            records = records.filter(scheduled_date__lte=filter_form.cleaned_data['date_to'])
+    """List cleaning records with filtering, one keyset page at a time"""
+    records, filter_form = _filtered_records(request)
+    page_size = get_page_size(request.GET.get('page_size'))
+    page, next_cursor = keyset_page(records, request.GET.get('cursor'), page_size)
     
-    # Filter by user role
-    if request.user.is_assistant():
-        # Assistants see only their assigned tasks
-        records = records.filter(assigned_to=request.user)
+    # Carry the current filters into the "load more" request
+    more_params = request.GET.copy()
+    more_params.pop('cursor', None)
+    more_params['page_size'] = page_size
+    export_params = request.GET.copy()
+    for key in ('cursor', 'page_size'):
+        export_params.pop(key, None)
     
     context = {
-        'records': records,
+        'records': page,
         'filter_form': filter_form,
+        'next_cursor': next_cursor,
+        'more_query': more_params.urlencode(),
+        'export_query': export_params.urlencode(),
     }
     return render(request, 'cleaning/cleaning_record_list.html', context)
 
 
+@login_required
+def cleaning_record_list_more(request):
+    """AJAX: Return the next keyset page of the record list as JSON"""
+    records, _ = _filtered_records(request)
+    page, next_cursor = keyset_page(
+        records, request.GET.get('cursor'), get_page_size(request.GET.get('page_size'))
+    )
+    html = render_to_string(
+        'cleaning/partials/cleaning_record_rows.html', {'records': page}, request=request
+    )
+    return JsonResponse({
+        'html': html,
+        'count': len(page),
+        'next_cursor': next_cursor,
+    })
+
+
+@login_required
+def cleaning_record_export(request):
+    """Stream the filtered record list as CSV or XLSX (``?format=csv|xlsx``)"""
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponseBadRequest('Unsupported export format.')
+    
+    records = export_records(request.user, request.GET)
+    filename = f"cleaning-records-{date.today().isoformat()}"
+    return export_response(
+        export_format, filename, RECORD_EXPORT_HEADER, record_export_rows(records), 'Cleaning Records'
+    )
+
+
 @login_required
 def cleaning_record_create(request):
     """Create a new cleaning record (Managers and Assistants)"""
@@ -112,113 +212,45 @@ def cleaning_record_create(request):
                         messages.error(request, 'Please select an activity to use the calendar selections.')
                         raise ValueError('Activity required for calendar selections')
 
-                    # Establish biweekly anchor: earliest existing record date for the activity, or first selected date in this submission
-                    existing_anchor = CleaningRecord.objects.filter(activity=activity).order_by('scheduled_date').values_list('scheduled_date', flat=True).first()
-                    # Pre-parse selected dates to determine first selected anchor
+                    # Parse the selected dates; the earliest starts the cycles if the activity has no records yet
                     parsed_selected = []
                     for s in selected_days:
                         try:
                             parsed_selected.append(datetime.strptime(s, '%Y-%m-%d').date())
                         except Exception:
                             continue
-                    parsed_selected.sort()
-                    session_anchor = existing_anchor or (parsed_selected[0] if parsed_selected else None)
-
-                    # Helper to enforce frequency rules similar to AJAX endpoint
-                    def can_create_for_day(act, scheduled_date):
-                        first_day = date(scheduled_date.year, scheduled_date.month, 1)
-                        _, dim = calendar.monthrange(scheduled_date.year, scheduled_date.month)
-                        last_day = date(scheduled_date.year, scheduled_date.month, dim)
-
-                        day_qs = CleaningRecord.objects.filter(activity=act, scheduled_date=scheduled_date)
-                        day_count = day_qs.count()
-
-                        month_completed = CleaningRecord.objects.filter(
-                            activity=act,
-                            scheduled_date__gte=first_day,
-                            scheduled_date__lte=last_day,
-                            status__in=['COMPLETED', 'VERIFIED']
-                        ).count()
-
-                        week_start = scheduled_date - timedelta(days=scheduled_date.weekday())
-                        week_end = week_start + timedelta(days=6)
-                        week_completed = CleaningRecord.objects.filter(
-                            activity=act,
-                            scheduled_date__gte=week_start,
-                            scheduled_date__lte=week_end,
-                            status__in=['COMPLETED', 'VERIFIED']
-                        ).count()
-
-                        freq = act.frequency
-                        if freq == 'TWICE_DAILY':
-                            return day_count < 2
-                        elif freq == 'DAILY':
-                            return day_count < 1
-                        elif freq == 'EVERY_2_DAYS':
-                            # Use existing anchor if available; otherwise allow first selected to establish anchor
-                            if session_anchor:
-                                return ((scheduled_date - session_anchor).days % 2) == 0 and day_count < 1
-                            return day_count < 1
-                        elif freq == 'WEEKLY':
-                            return week_completed < 1 and day_count < 1
-                        elif freq == 'BIWEEKLY':
-                            if session_anchor:
-                                return ((scheduled_date - session_anchor).days % 14) == 0 and day_count < 1
-                            return day_count < 1
-                        elif freq == 'MONTHLY':
-                            return month_completed < 1 and day_count < 1
-                        return False
-
-                    for s in selected_days:
-                        try:
-                            sd = datetime.strptime(s, '%Y-%m-%d').date()
-                        except Exception:
-                            continue
-                        # Ensure date is within the selected month from the form's scheduled_date
-                        sched_month = form.cleaned_data['scheduled_date']
-                        if sd.year != sched_month.year or sd.month != sched_month.month:
-                            continue
-                        if not can_create_for_day(activity, sd):
-                            continue
 
-                        # For TWICE_DAILY, create up to two records per day (fill missing ones)
-                        if activity.frequency == 'TWICE_DAILY':
-                            existing_for_day = list(CleaningRecord.objects.filter(activity=activity, scheduled_date=sd).order_by('id'))
-                            missing = max(0, 2 - len(existing_for_day))
-                            slots = [dtime(9, 0), dtime(15, 0)]
-                            used_times = {r.scheduled_time for r in existing_for_day if r.scheduled_time}
-                            for _ in range(missing):
-                                rec = CleaningRecord(
+                    # Only dates within the selected month from the form's scheduled_date are created
+                    sched_month = form.cleaned_data['scheduled_date']
+                    month_days = [sd for sd in parsed_selected if (sd.year, sd.month) == (sched_month.year, sched_month.month)]
+                    # Marked date/time is the actual time of marking
+                    marked_at = timezone.now()
+
+                    with transaction.atomic():
+                        _lock_activity(activity)
+                        schedule = ActivitySchedule.load(activity, sched_month.year, sched_month.month)
+                        for sd, slot_times in schedule.plan(month_days, status, start_anchor=min(parsed_selected, default=None)):
+                            for slot_time in slot_times:
+                                created_records.append(CleaningRecord(
                                     unit=unit,
                                     activity=activity,
                                     assigned_to=assigned_to,
                                     scheduled_date=sd,
+                                    scheduled_time=slot_time,
                                     status=status,
                                     notes=notes,
-                                )
-                                for t in slots:
-                                    if t not in used_times:
-                                        rec.scheduled_time = t
-                                        used_times.add(t)
-                                        break
-                                # Completed datetime equals marked date with the slot time
-                                # Marked date/time is the actual time of marking
-                                rec.completed_date = timezone.now()
-                                rec.save()
-                                created_records.append(rec)
-                        else:
-                            rec = CleaningRecord(
-                                unit=unit,
-                                activity=activity,
-                                assigned_to=assigned_to,
-                                scheduled_date=sd,
-                                status=status,
-                                notes=notes,
+                                    completed_date=marked_at,
+                                ))
+
+                        if created_records:
+                            CleaningRecord.objects.bulk_create(created_records)
+                            # bulk_create skips the post_save counters; all records share one month and status
+                            ActivityMonthStats.apply_delta(
+                                (activity.pk, sched_month.year, sched_month.month, status), len(created_records)
                             )
-                            # Marked date/time is the actual time of marking
-                            rec.completed_date = timezone.now()
-                            rec.save()
-                            created_records.append(rec)
+                            CleaningActivity.extend_first_record_date(activity.pk, min(r.scheduled_date for r in created_records))
+                            bump_activity_versions(activity.pk)
+                            bump_user_versions(assigned_to.pk if assigned_to else None)
 
                     if created_records:
                         messages.success(request, f'Created {len(created_records)} cleaning record(s) for the selected days.')
@@ -337,7 +369,13 @@ def cleaning_record_complete(request, pk):
         record.status = 'COMPLETED'
         # Marked date/time is the actual time of marking
         record.completed_date = timezone.now()
-        record.save()
+        try:
+            with transaction.atomic():
+                record.save()
+        except IntegrityError:
+            # The unique completion slot constraint: another record already completed this slot
+            messages.error(request, 'This time slot has already been completed for this activity.')
+            return redirect('cleaning:cleaning_record_detail', pk=pk)
         messages.success(request, 'Cleaning task marked as completed.')
         return redirect('cleaning:cleaning_record_detail', pk=record.pk)
 
@@ -406,30 +444,77 @@ def cleaning_record_delete(request, pk):
 
 # ========== Cleaning Activity Views ==========
 
+def _activity_ordering(sort):
+    """Return the order_by() arguments for an activity browser ``sort`` value"""
+    first, *rest = ACTIVITY_SORTS[sort.lstrip('-')]
+    if sort.startswith('-'):
+        first = first.copy()
+        first.reverse_ordering()
+    return [first, *rest]
+
+
+def _facet_links(request, name, items, selected):
+    """Return template rows for one facet; clicking a value selects it, clicking it again clears it"""
+    links = []
+    for value, label, count in items:
+        params = request.GET.copy()
+        params.pop('page', None)
+        is_selected = selected is not None and value == selected
+        if is_selected:
+            params.pop(name, None)
+        else:
+            params[name] = str(value).lower() if isinstance(value, bool) else value
+        links.append({'label': label, 'count': count, 'selected': is_selected, 'query': params.urlencode()})
+    return links
+
+
 @login_required
 def cleaning_activity_list(request):
-    """List all cleaning activities"""
-    activities = CleaningActivity.objects.select_related('unit').all()
-    
-    # Filter by unit if provided
-    unit_id = request.GET.get('unit')
-    if unit_id:
-        activities = activities.filter(unit_id=unit_id)
-    
-    # Filter by active status
-    is_active = request.GET.get('is_active')
-    if is_active == 'true':
-        activities = activities.filter(is_active=True)
-    elif is_active == 'false':
-        activities = activities.filter(is_active=False)
-    
-    units = Unit.objects.filter(is_active=True)
-    
+    """Browse cleaning activities one page at a time, with facet counts and a sortable table"""
+    filter_form = CleaningActivityFilterForm(request.GET or None)
+    filters = filter_form.get_filters()
+
+    activities = CleaningActivity.objects.all()
+    if filters.get('q'):
+        activities = activities.filter(activity_name__istartswith=filters['q'])
+    if filters.get('unit'):
+        activities = activities.filter(unit=filters['unit'])
+
+    # Every facet comes from one GROUP BY over the search results
+    selected = {name: filters.get(name) for name in ACTIVITY_FACETS}
+    facets = facet_counts(activities, ACTIVITY_FACETS, selected, labels={
+        'frequency': dict(CleaningActivity.FREQUENCY_CHOICES),
+        'is_active': {True: 'Active', False: 'Inactive'},
+        'zone': 'unit__zone__zone_name',
+    })
+    for name, field in ACTIVITY_FACETS.items():
+        if selected[name] is not None:
+            activities = activities.filter(**{field: selected[name]})
+
+    # Sort and slice only the ids, then load the page's rows with their units:
+    # sorting narrow rows keeps deep pages cheap on large estates
+    sort = filters.get('sort', 'location')
+    page_ids = activities.order_by(*_activity_ordering(sort)).values_list('pk', flat=True)
+    paginator = Paginator(page_ids, get_page_size(request.GET.get('page_size')))
+    # The facet rows already add up to the number of matches, so skip the COUNT query
+    paginator.count = matching_total(facets, selected)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    ids = list(page_obj.object_list)
+    rows = CleaningActivity.objects.select_related('unit').in_bulk(ids)
+    page_obj.object_list = [rows[pk] for pk in ids]
+
+    unit = filters.get('unit')
     context = {
-        'activities': activities,
-        'units': units,
-        'selected_unit': unit_id,
-        'selected_active': is_active,
+        'activities': page_obj,
+        'page_obj': page_obj,
+        'filter_form': filter_form,
+        'facets': [
+            (title, _facet_links(request, name, facets[name], selected[name]))
+            for name, title in (('frequency', 'Frequency'), ('is_active', 'Status'), ('zone', 'Zone'))
+        ],
+        'sort': sort,
+        'sort_links': {key: sort_query(request.GET, key, sort) for key in ACTIVITY_SORTS},
+        'selected_unit': unit.pk if unit else '',
     }
     return render(request, 'cleaning/cleaning_activity_list.html', context)
 
@@ -654,6 +739,94 @@ def get_activities_by_unit(request, unit_id):
     })
 
 
+def _autocomplete_response(request, queryset, label):
+    """Return one page of ``queryset`` as {"results": [{"id", "text"}], "more": bool}"""
+    try:
+        page = min(max(int(request.GET.get('page', 1)), 1), AUTOCOMPLETE_MAX_PAGES)
+    except ValueError:
+        page = 1
+    start = (page - 1) * AUTOCOMPLETE_PAGE_SIZE
+    # One extra row tells whether another page exists without a COUNT
+    rows = list(queryset[start:start + AUTOCOMPLETE_PAGE_SIZE + 1])
+    more = len(rows) > AUTOCOMPLETE_PAGE_SIZE and page < AUTOCOMPLETE_MAX_PAGES
+    return JsonResponse({
+        'results': [{'id': obj.pk, 'text': label(obj)} for obj in rows[:AUTOCOMPLETE_PAGE_SIZE]],
+        'more': more,
+    })
+
+
+@login_required
+def autocomplete_units(request):
+    """AJAX endpoint: active units whose name starts with ``q``"""
+    units = Unit.objects.filter(is_active=True)
+    query = request.GET.get('q', '').strip()
+    if query:
+        units = units.filter(unit_name__istartswith=query)
+    return _autocomplete_response(request, units.order_by('location_key', 'pk'), unit_label)
+
+
+@login_required
+def autocomplete_activities(request):
+    """AJAX endpoint: active activities whose name starts with ``q``, optionally in one ``unit``"""
+    activities = CleaningActivity.objects.filter(is_active=True).select_related('unit')
+    unit_id = request.GET.get('unit')
+    if unit_id:
+        if not unit_id.isdigit():
+            return JsonResponse({'error': 'Invalid unit'}, status=400)
+        activities = activities.filter(unit_id=unit_id)
+    query = request.GET.get('q', '').strip()
+    if query:
+        activities = activities.filter(activity_name__istartswith=query)
+    return _autocomplete_response(request, activities.order_by('activity_name', 'pk'), str)
+
+
+@login_required
+def autocomplete_assistants(request):
+    """AJAX endpoint: assistants whose username, first or last name starts with ``q``"""
+    assistants = get_user_model().objects.filter(role='ASSISTANT')
+    query = request.GET.get('q', '').strip()
+    if query:
+        assistants = assistants.filter(
+            Q(username__istartswith=query) | Q(first_name__istartswith=query) | Q(last_name__istartswith=query)
+        )
+    return _autocomplete_response(request, assistants.order_by('username'), assistant_label)
+
+
+@login_required
+def autocomplete_zones(request):
+    """AJAX endpoint: zones whose name starts with ``q``"""
+    zones = Zone.objects.all()
+    query = request.GET.get('q', '').strip()
+    if query:
+        zones = zones.filter(zone_name__istartswith=query)
+    return _autocomplete_response(request, zones.order_by('zone_name', 'pk'), str)
+
+
+@login_required
+def autocomplete_sections(request):
+    """AJAX endpoint: sections whose name starts with ``q``, optionally in one ``zone``"""
+    sections = Section.objects.all()
+    zone_id = request.GET.get('zone')
+    if zone_id:
+        if not zone_id.isdigit():
+            return JsonResponse({'error': 'Invalid zone'}, status=400)
+        sections = sections.filter(zone_id=zone_id)
+    query = request.GET.get('q', '').strip()
+    if query:
+        sections = sections.filter(section_name__istartswith=query)
+    return _autocomplete_response(request, sections.order_by('section_name', 'pk'), section_label)
+
+
+@login_required
+def autocomplete_faculties(request):
+    """AJAX endpoint: faculties whose name starts with ``q``"""
+    faculties = Faculty.objects.select_related('zone')
+    query = request.GET.get('q', '').strip()
+    if query:
+        faculties = faculties.filter(faculty_name__istartswith=query)
+    return _autocomplete_response(request, faculties.order_by('faculty_name', 'pk'), str)
+
+
 @login_required
 def cleaning_activity_calendar(request, pk, year=None, month=None):
     """Monthly calendar for scheduling an activity according to its frequency"""
@@ -672,58 +845,9 @@ def cleaning_activity_calendar(request, pk, year=None, month=None):
     _, days_in_month = calendar.monthrange(year, month)
     last_day = date(year, month, days_in_month)
 
-    # Anchor for repeating schedules - use activity.created_at as seed if available
-    anchor_dt = activity.created_at.date() if hasattr(activity, 'created_at') else first_day
-    if anchor_dt > last_day:
-        anchor_dt = first_day
-
-    # Helper to decide if a date is expected per frequency
-    def expected_dates_for_month():
-        expected = {}
-        # Define default schedule times
-        am_time = dtime(9, 0)
-        pm_time = dtime(15, 0)
-
-        d = first_day
-        while d <= last_day:
-            slots = []
-            if activity.frequency == 'TWICE_DAILY':
-                slots = [am_time, pm_time]
-            elif activity.frequency == 'DAILY':
-                slots = [am_time]
-            elif activity.frequency == 'EVERY_2_DAYS':
-                if (d - anchor_dt).days % 2 == 0:
-                    slots = [am_time]
-            elif activity.frequency == 'WEEKLY':
-                if (d - anchor_dt).days % 7 == 0:
-                    slots = [am_time]
-            elif activity.frequency == 'BIWEEKLY':
-                if (d - anchor_dt).days % 14 == 0:
-                    slots = [am_time]
-            elif activity.frequency == 'MONTHLY':
-                # Occurs once per month near the anchor day
-                anchor_dom = min(anchor_dt.day, days_in_month)
-                if d.day == anchor_dom:
-                    slots = [am_time]
-
-            if slots:
-                expected[d] = slots
-            d += timedelta(days=1)
-        return expected
-
-    expected = expected_dates_for_month()
-
-    # Fetch existing records for this activity in the month
-    existing_qs = CleaningRecord.objects.filter(
-        activity=activity,
-        scheduled_date__gte=first_day,
-        scheduled_date__lte=last_day,
-    ).values('id', 'scheduled_date', 'scheduled_time', 'status', 'assigned_to_id')
-
-    existing_by_day = {}
-    for r in existing_qs:
-        sd = r['scheduled_date']
-        existing_by_day.setdefault(sd, []).append(r)
+    # Expected slots and existing records both come from the shared schedule engine
+    schedule = ActivitySchedule.load(activity, year, month)
+    expected = schedule.expected_slots(first_day, last_day)
 
     # Build calendar matrix
     cal = calendar.Calendar().monthdatescalendar(year, month)
@@ -737,9 +861,9 @@ def cleaning_activity_calendar(request, pk, year=None, month=None):
                 # Convert times to HH:MM strings
                 expected_slots = [t.strftime('%H:%M') for t in expected[d]]
             existing_list = []
-            if d in existing_by_day:
+            if is_current:
                 # Normalize times to HH:MM strings for easy comparison
-                for r in existing_by_day[d]:
+                for r in schedule.snapshot.records_on(d):
                     existing_list.append({
                         'id': r['id'],
                         'status': r['status'],
@@ -774,43 +898,38 @@ def cleaning_activity_calendar(request, pk, year=None, month=None):
 
 @login_required
 def cleaning_activity_calendar_partial(request, pk):
-    """Return a simplified month calendar for an activity (HTML fragment) for embedding."""
-    activity = get_object_or_404(CleaningActivity.objects.select_related('unit'), pk=pk)
+    """Return a simplified month calendar for an activity (HTML fragment) for embedding.
 
+    The rendered fragment is cached under the activity's cache version, so
+    repeat navigation is served without touching the database and any record
+    or activity change makes the old fragments unreachable.
+    """
     today = timezone.localdate()
     try:
         year = int(request.GET.get('year', today.year))
         month = int(request.GET.get('month', today.month))
+        date(year, month, 1)
     except ValueError:
         year, month = today.year, today.month
     lock_nav = request.GET.get('lock') in ('1', 'true', 'yes')
 
+    cache_key = calendar_partial_key(pk, year, month, lock_nav)
+    html = cache.get(cache_key)
+    if html is not None:
+        return HttpResponse(html)
+
+    activity = get_object_or_404(CleaningActivity.objects.select_related('unit'), pk=pk)
+
     first_day = date(year, month, 1)
     _, days_in_month = calendar.monthrange(year, month)
     last_day = date(year, month, days_in_month)
 
-    # Existing records for the month
-    existing_qs = CleaningRecord.objects.filter(
-        activity=activity,
-        scheduled_date__gte=first_day,
-        scheduled_date__lte=last_day,
-    ).values('id', 'scheduled_date', 'status')
-
-    by_day = {}
-    for r in existing_qs:
-        d = r['scheduled_date']
-        lst = by_day.setdefault(d, [])
-        lst.append(r)
+    # Existing records, the monthly count and the cycle anchor come from the shared schedule engine
+    schedule = ActivitySchedule.load(activity, year, month)
+    expected = schedule.expected_slots(first_day, last_day)
 
     # Count completed/verified within month (used to lock MONTHLY marking)
-    monthly_completed_count = sum(
-        1 for r in CleaningRecord.objects.filter(
-            activity=activity,
-            scheduled_date__gte=first_day,
-            scheduled_date__lte=last_day,
-            status__in=['COMPLETED', 'VERIFIED']
-        )
-    )
+    monthly_completed_count = schedule.snapshot.month_completed(first_day)
 
     # Build calendar matrix
     cal = calendar.Calendar().monthdatescalendar(year, month)
@@ -821,7 +940,7 @@ def cleaning_activity_calendar_partial(request, pk):
             if d.month != month:
                 row.append({'date': d, 'is_current': False, 'records': [], 'has_completed': False})
                 continue
-            records = by_day.get(d, [])
+            records = schedule.snapshot.records_on(d)
             has_completed = any(r['status'] in ('COMPLETED', 'VERIFIED') for r in records)
             completed_count = sum(1 for r in records if r['status'] in ('COMPLETED', 'VERIFIED'))
             row.append({
@@ -830,12 +949,10 @@ def cleaning_activity_calendar_partial(request, pk):
                 'records': records,
                 'has_completed': has_completed,
                 'completed_count': completed_count,
+                'is_expected': d in expected,
             })
         month_weeks.append(row)
 
-    # Determine biweekly anchor date: earliest existing scheduled_date for this activity (global), if any
-    earliest = CleaningRecord.objects.filter(activity=activity).order_by('scheduled_date').values_list('scheduled_date', flat=True).first()
-
     context = {
         'activity': activity,
         'unit': activity.unit,
@@ -845,9 +962,11 @@ def cleaning_activity_calendar_partial(request, pk):
         'month_weeks': month_weeks,
         'lock_nav': lock_nav,
         'monthly_completed_count': monthly_completed_count,
-        'anchor_date': earliest,
+        'anchor_date': schedule.anchor,
     }
-    return render(request, 'cleaning/partials/activity_calendar_partial.html', context)
+    html = render_to_string('cleaning/partials/activity_calendar_partial.html', context, request)
+    cache.set(cache_key, html, CALENDAR_PARTIAL_TIMEOUT)
+    return HttpResponse(html)
 
 
 @login_required
@@ -875,121 +994,193 @@ def mark_activity_completed_day(request, pk):
         except Exception:
             assigned_to = None
 
-    # Frequency-based rules
-    # Helper: get month range
-    first_day = date(scheduled_date.year, scheduled_date.month, 1)
-    _, dim = calendar.monthrange(scheduled_date.year, scheduled_date.month)
-    last_day = date(scheduled_date.year, scheduled_date.month, dim)
-
-    # Count existing records for the day/month/week
-    day_qs = CleaningRecord.objects.filter(activity=activity, scheduled_date=scheduled_date)
-    day_count = day_qs.count()
-
-    month_completed = CleaningRecord.objects.filter(
-        activity=activity,
-        scheduled_date__gte=first_day,
-        scheduled_date__lte=last_day,
-        status__in=['COMPLETED', 'VERIFIED']
-    ).count()
-
-    # Week calculation (Monday start)
-    week_start = scheduled_date - timedelta(days=scheduled_date.weekday())
-    week_end = week_start + timedelta(days=6)
-    week_completed = CleaningRecord.objects.filter(
-        activity=activity,
-        scheduled_date__gte=week_start,
-        scheduled_date__lte=week_end,
-        status__in=['COMPLETED', 'VERIFIED']
-    ).count()
-
-    # Anchor for modulo-based schedules
-    # For biweekly logic, anchor to earliest existing scheduled_date for this activity if available; otherwise allow first selection to establish anchor
-    earliest_existing = CleaningRecord.objects.filter(activity=activity).order_by('scheduled_date').values_list('scheduled_date', flat=True).first()
-    anchor_date = earliest_existing or first_day
-
-    freq = activity.frequency
-    # Enforce according to frequency
-    if freq == 'TWICE_DAILY':
-        if day_count >= 2:
-            return JsonResponse({'ok': False, 'error': 'Already marked twice for this day.'}, status=400)
-    elif freq == 'DAILY':
-        if day_count >= 1:
-            return JsonResponse({'ok': False, 'error': 'Already marked for this day.'}, status=400)
-    elif freq == 'EVERY_2_DAYS':
-        # If we have an anchor (earliest existing record), enforce every 2 days from that anchor.
-        # If no anchor yet, allow this selection (it will implicitly establish the start date).
-        if earliest_existing:
-            if ((scheduled_date - anchor_date).days % 2) != 0:
-                return JsonResponse({'ok': False, 'error': f'This day is not part of the 2-day cycle starting on {anchor_date}.'}, status=400)
-        if day_count >= 1:
-            return JsonResponse({'ok': False, 'error': 'Already marked for this day.'}, status=400)
-    elif freq == 'WEEKLY':
-        # Allow only one per week
-        if week_completed >= 1:
-            return JsonResponse({'ok': False, 'error': 'Weekly limit reached for this week.'}, status=400)
-        if day_count >= 1:
-            return JsonResponse({'ok': False, 'error': 'Already marked for this day.'}, status=400)
-    elif freq == 'BIWEEKLY':
-        # Allow only every 14 days from the start date. If no previous records exist, accept any date (it becomes the start).
-        if earliest_existing:
-            if ((scheduled_date - anchor_date).days % 14) != 0:
-                return JsonResponse({'ok': False, 'error': f'This day is not part of the 14-day cycle starting on {anchor_date}.'}, status=400)
-        if day_count >= 1:
-            return JsonResponse({'ok': False, 'error': 'Already marked for this day.'}, status=400)
-    elif freq == 'MONTHLY':
-        # Only one completion per month (any day)
-        if month_completed >= 1:
-            return JsonResponse({'ok': False, 'error': 'Monthly limit reached for this month.'}, status=400)
-        if day_count >= 1:
-            return JsonResponse({'ok': False, 'error': 'Already marked for this day.'}, status=400)
-
-    # Create or update the record as completed
-    # For TWICE_DAILY, prefer completing an existing non-completed record; otherwise create a new one
-    if freq == 'TWICE_DAILY':
-        # Try to find an existing non-completed record for this day
-        record = day_qs.exclude(status__in=['COMPLETED', 'VERIFIED']).order_by('id').first()
-        if not record:
-            # Create a new record (second mark)
-            record = CleaningRecord(
-                unit=activity.unit,
-                activity=activity,
-                assigned_to=assigned_to or request.user,
-                scheduled_date=scheduled_date,
-            )
-            # Assign a time slot if available to differentiate
-            existing_times = set(day_qs.values_list('scheduled_time', flat=True))
-            for slot in (dtime(9, 0), dtime(15, 0)):
-                if slot not in existing_times:
-                    record.scheduled_time = slot
-                    break
+    try:
+        [(record, error)] = _mark_days_completed([(activity, scheduled_date, assigned_to)], request.user)
+    except IntegrityError:
+        # The unique completion slot constraint caught a write that raced past the lock
+        return JsonResponse({'ok': False, 'error': 'This day was just marked by someone else.'}, status=409)
+
+    if error:
+        return JsonResponse({'ok': False, 'error': error}, status=400)
+    return JsonResponse({'ok': True, 'record_id': record.id, 'status': record.status})
+
+
+@login_required
+def mark_activity_days_completed(request):
+    """AJAX: Mark many days, across one or more activities, as completed in one request.
+
+    Expects a JSON body ``{"items": [{"activity_id": 1, "date": "2025-10-01", "assigned_to": 2}, ...]}``
+    (``assigned_to`` is optional) and returns one result per item, in order.
+    Every item is checked against the frequency rules and the accepted ones are
+    written together in one transaction.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'ok': False, 'error': 'Invalid method'}, status=405)
+
+    if not request.user.is_manager():
+        return JsonResponse({'ok': False, 'error': 'Permission denied'}, status=403)
+
+    try:
+        payload = json.loads(request.body)
+        raw_items = payload['items'] if isinstance(payload, dict) else payload
+        if not isinstance(raw_items, list):
+            raise ValueError
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'ok': False, 'error': 'Expected a JSON list of items'}, status=400)
+
+    if len(raw_items) > MAX_BATCH_MARK_ITEMS:
+        return JsonResponse(
+            {'ok': False, 'error': f'At most {MAX_BATCH_MARK_ITEMS} items can be marked at once'}, status=400
+        )
+
+    # Parse every item first so activities and assignees can be fetched in one query each
+    results = [None] * len(raw_items)
+    parsed = []
+    for index, item in enumerate(raw_items):
+        try:
+            activity_id = int(item.get('activity_id', item.get('activity')))
+            scheduled_date = datetime.strptime(item['date'], '%Y-%m-%d').date()
+            assigned_to_id = int(item['assigned_to']) if item.get('assigned_to') else None
+        except (AttributeError, KeyError, TypeError, ValueError):
+            results[index] = {'ok': False, 'error': 'Invalid item'}
+            continue
+        parsed.append((index, activity_id, scheduled_date, assigned_to_id))
+
+    activities = CleaningActivity.objects.select_related('unit').in_bulk({p[1] for p in parsed})
+    assignees = get_user_model().objects.in_bulk({p[3] for p in parsed if p[3]})
+
+    marks, mark_indexes = [], []
+    for index, activity_id, scheduled_date, assigned_to_id in parsed:
+        if activity_id not in activities:
+            results[index] = {'ok': False, 'error': 'Activity not found'}
+            continue
+        # Unknown assignees are ignored, as in the single-day endpoint
+        marks.append((activities[activity_id], scheduled_date, assignees.get(assigned_to_id)))
+        mark_indexes.append(index)
+
+    try:
+        outcomes = _mark_days_completed(marks, request.user)
+    except IntegrityError:
+        return JsonResponse({'ok': False, 'error': 'These days were just marked by someone else.'}, status=409)
+
+    for index, (record, error) in zip(mark_indexes, outcomes):
+        if error:
+            results[index] = {'ok': False, 'error': error}
         else:
-            if assigned_to and not record.assigned_to:
-                record.assigned_to = assigned_to
+            results[index] = {'ok': True, 'record_id': record.id, 'status': record.status}
 
-        record.status = 'COMPLETED'
-        # Marked date/time is the actual time of marking
-        record.completed_date = timezone.now()
-        record.save()
-        return JsonResponse({'ok': True, 'record_id': record.id, 'status': record.status})
-
-    # Default behavior for other frequencies: create or update single record
-    record = day_qs.order_by('id').first()
-    if not record:
-        record = CleaningRecord(
-            unit=activity.unit,
-            activity=activity,
-            assigned_to=assigned_to or request.user,
-            scheduled_date=scheduled_date,
+    for item, result in zip(raw_items, results):
+        if isinstance(item, dict):
+            result.update(activity_id=item.get('activity_id', item.get('activity')), date=item.get('date'))
+    return JsonResponse({'ok': all(r['ok'] for r in results), 'results': results})
+
+
+def _mark_days_completed(marks, user):
+    """Complete a record for each (activity, day, assigned_to) mark, creating records as needed.
+
+    Returns one (record, None) or (None, error) per mark, in order. Marks are
+    checked in order against one record snapshot per activity, so later marks
+    see earlier ones; with no records yet, an activity's earliest requested day
+    starts its 2-day and 14-day cycles. New records are bulk inserted and
+    completed ones bulk updated in a single transaction that holds the
+    activities' row locks.
+    """
+    results = [None] * len(marks)
+    by_activity = defaultdict(list)
+    for index, mark in enumerate(marks):
+        by_activity[mark[0].pk].append((index, mark))
+    if not by_activity:
+        return results
+
+    marked_at = timezone.now()
+    to_create, to_complete = [], {}
+    with transaction.atomic():
+        # Lock in id order so concurrent batches cannot deadlock each other
+        # (the batch form of _lock_activity, re-reading the stored anchors)
+        anchors = dict(
+            CleaningActivity.objects.select_for_update()
+            .filter(pk__in=by_activity).order_by('pk').values_list('pk', 'first_record_date')
         )
-    else:
-        if assigned_to and not record.assigned_to:
-            record.assigned_to = assigned_to
 
-    record.status = 'COMPLETED'
-    # Marked date/time is the actual time of marking
-    record.completed_date = timezone.now()
-    record.save()
-    return JsonResponse({'ok': True, 'record_id': record.id, 'status': record.status})
+        for activity_id, activity_marks in by_activity.items():
+            activity = activity_marks[0][1][0]
+            days = [day for _, (_, day, _) in activity_marks]
+            snapshot = RecordSnapshot.load(activity, *days_snapshot_range(days))
+            schedule = ActivitySchedule(activity, anchors.get(activity_id), snapshot)
+            start_anchor = min(days)
+
+            for index, (_, day, assigned_to) in activity_marks:
+                error = schedule.check(day, start_anchor)
+                if error:
+                    results[index] = (None, error)
+                    continue
+
+                # For TWICE_DAILY, prefer completing an existing non-completed record; otherwise create a new one.
+                # Other frequencies complete the day's first record, or create one in the morning slot.
+                day_rows = sorted(snapshot.records_on(day), key=lambda row: row['id'])
+                if activity.frequency == 'TWICE_DAILY':
+                    row = next((r for r in day_rows if r['status'] not in ('COMPLETED', 'VERIFIED')), None)
+                else:
+                    row = day_rows[0] if day_rows else None
+
+                if row:
+                    snapshot.complete(row)
+                    to_complete[row['id']] = (index, assigned_to)
+                    continue
+
+                if activity.frequency == 'TWICE_DAILY':
+                    free_slots = snapshot.free_slots(day, TWICE_DAILY_SLOTS)
+                    new_time = free_slots[0] if free_slots else None
+                else:
+                    new_time = AM_SLOT
+                snapshot.add(day, new_time, 'COMPLETED')
+                record = CleaningRecord(
+                    unit=activity.unit,
+                    activity=activity,
+                    assigned_to=assigned_to or user,
+                    scheduled_date=day,
+                    scheduled_time=new_time,
+                    status='COMPLETED',
+                    # Marked date/time is the actual time of marking
+                    completed_date=marked_at,
+                )
+                to_create.append(record)
+                results[index] = (record, None)
+
+        # bulk_create and bulk_update skip the post_save counters, so collect their changes here
+        stats_deltas = Counter()
+        completed = CleaningRecord.objects.in_bulk(list(to_complete))
+        for record_id, record in completed.items():
+            index, assigned_to = to_complete[record_id]
+            stats_deltas[record.get_stats_key()] -= 1
+            if assigned_to and not record.assigned_to_id:
+                record.assigned_to = assigned_to
+            record.status = 'COMPLETED'
+            record.completed_date = marked_at
+            stats_deltas[record.get_stats_key()] += 1
+            results[index] = (record, None)
+        if completed:
+            CleaningRecord.objects.bulk_update(completed.values(), ['status', 'completed_date', 'assigned_to'])
+
+        if to_create:
+            CleaningRecord.objects.bulk_create(to_create)
+            first_created = {}
+            for record in to_create:
+                stats_deltas[record.get_stats_key()] += 1
+                first_created[record.activity_id] = min(
+                    record.scheduled_date, first_created.get(record.activity_id, record.scheduled_date)
+                )
+            for activity_id, day in first_created.items():
+                CleaningActivity.extend_first_record_date(activity_id, day)
+
+        for key, delta in stats_deltas.items():
+            if delta:
+                ActivityMonthStats.apply_delta(key, delta)
+        # The bulk writes also skip the signals that invalidate cached calendars and summaries
+        bump_activity_versions(*by_activity)
+        bump_user_versions(*(r.assigned_to_id for r in [*completed.values(), *to_create]))
+
+    return results
 
 
 @login_required
@@ -1000,46 +1191,16 @@ def activity_performance_report(request):
         return redirect('cleaning:cleaning_record_list')
     
     # Get year and month from query params, default to current month
-    from datetime import date
     today = date.today()
     year = int(request.GET.get('year', today.year))
     month = int(request.GET.get('month', today.month))
     
     # Get optional unit filter
     unit_id = request.GET.get('unit')
-    
-    # Get all active activities
-    activities = CleaningActivity.objects.filter(is_active=True).select_related('unit')
-    
-    if unit_id:
-        activities = activities.filter(unit_id=unit_id)
-    
-    # Calculate statistics for each activity
-    activity_stats = []
-    for activity in activities:
-        expected = activity.get_expected_completions_for_month(year, month)
-        actual = activity.get_actual_completions_for_month(year, month)
-        actual_pct = activity.get_completion_percentage_for_month(year, month)
-        budgeted_pct = float(activity.budget_percentage)
-        variance = activity.get_variance_percentage_for_month(year, month)
-        
-        activity_stats.append({
-            'activity': activity,
-            'unit': activity.unit,
-            'frequency': activity.get_frequency_display(),
-            'expected_completions': expected,
-            'actual_completions': actual,
-            'actual_percentage': actual_pct,
-            'budgeted_percentage': budgeted_pct,
-            'variance': variance,
-            'variance_class': 'text-success' if variance >= 0 else 'text-danger',
-        })
-    
-    # Sort by unit name then activity name
-    activity_stats.sort(key=lambda x: (x['unit'].get_full_location(), x['activity'].activity_name))
+    activity_stats = activity_performance_stats(year, month, unit_id)
     
     # Get list of units for filter
-    units = Unit.objects.filter(is_active=True).select_related('zone', 'section')
+    units = Unit.objects.filter(is_active=True)
     
     # Generate month/year options for selection
     from datetime import timedelta
@@ -1077,61 +1238,8 @@ def faculty_cleaning_report(request, faculty_id):
     year = int(request.GET.get('year', today.year))
     month = int(request.GET.get('month', today.month))
     
-    # Get all units associated with this faculty
-    units = faculty.units.filter(is_active=True).select_related('zone', 'section').prefetch_related('cleaning_activities')
-    
-    # Prepare data for each unit
-    units_data = []
-    total_activities = 0
-    total_expected = 0
-    total_actual = 0
-    
-    for unit in units:
-        activities = unit.cleaning_activities.filter(is_active=True)
-        activity_stats = []
-        
-        unit_expected = 0
-        unit_actual = 0
-        
-        for activity in activities:
-            expected = activity.get_expected_completions_for_month(year, month)
-            actual = activity.get_actual_completions_for_month(year, month)
-            actual_pct = activity.get_completion_percentage_for_month(year, month)
-            budgeted_pct = float(activity.budget_percentage)
-            variance = activity.get_variance_percentage_for_month(year, month)
-            
-            activity_stats.append({
-                'activity': activity,
-                'frequency': activity.get_frequency_display(),
-                'expected_completions': expected,
-                'actual_completions': actual,
-                'actual_percentage': actual_pct,
-                'budgeted_percentage': budgeted_pct,
-                'variance': variance,
-                'variance_class': 'text-success' if variance >= 0 else 'text-danger',
-            })
-            
-            unit_expected += expected
-            unit_actual += actual
-        
-        # Calculate unit-level completion percentage
-        unit_completion_pct = round((unit_actual / unit_expected * 100), 2) if unit_expected > 0 else 0
-        
-        units_data.append({
-            'unit': unit,
-            'activities': activity_stats,
-            'activity_count': activities.count(),
-            'total_expected': unit_expected,
-            'total_actual': unit_actual,
-            'completion_percentage': unit_completion_pct,
-        })
-        
-        total_activities += activities.count()
-        total_expected += unit_expected
-        total_actual += unit_actual
-    
-    # Calculate faculty-level statistics
-    faculty_completion_pct = round((total_actual / total_expected * 100), 2) if total_expected > 0 else 0
+    # Unit and faculty rollups computed with a fixed number of queries
+    rollup = faculty_rollup(faculty, year, month)
     
     # Generate month/year options for selection
     months = []
@@ -1141,20 +1249,60 @@ def faculty_cleaning_report(request, faculty_id):
     
     context = {
         'faculty': faculty,
-        'units_data': units_data,
         'selected_year': year,
         'selected_month': month,
         'selected_month_display': date(year, month, 1).strftime('%B %Y'),
         'months': months,
-        'total_units': units.count(),
-        'total_activities': total_activities,
-        'total_expected': total_expected,
-        'total_actual': total_actual,
-        'faculty_completion_pct': faculty_completion_pct,
+        **rollup,
     }
     return render(request, 'cleaning/faculty_cleaning_report.html', context)
 
 
+@login_required
+def activity_performance_report_export(request):
+    """Export the activity performance report as CSV or XLSX"""
+    if not request.user.is_manager():
+        messages.error(request, 'Only managers can view performance reports.')
+        return redirect('cleaning:cleaning_record_list')
+    
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponseBadRequest('Unsupported export format.')
+    
+    today = date.today()
+    year = int(request.GET.get('year', today.year))
+    month = int(request.GET.get('month', today.month))
+    activity_stats = activity_performance_stats(year, month, request.GET.get('unit'))
+    
+    filename = f"activity-performance-{year}-{month:02d}"
+    return export_response(
+        export_format, filename, ACTIVITY_EXPORT_HEADER, activity_export_rows(activity_stats), 'Performance'
+    )
+
+
+@login_required
+def faculty_cleaning_report_export(request, faculty_id):
+    """Export the faculty cleaning report as CSV or XLSX"""
+    if not (getattr(request.user, 'is_manager', lambda: False)() or getattr(request.user, 'is_dean_office', lambda: False)()):
+        messages.error(request, 'Only managers or dean office can view faculty reports.')
+        return redirect('cleaning:cleaning_record_list')
+    
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponseBadRequest('Unsupported export format.')
+    
+    faculty = get_object_or_404(Faculty, pk=faculty_id)
+    today = date.today()
+    year = int(request.GET.get('year', today.year))
+    month = int(request.GET.get('month', today.month))
+    rollup = faculty_rollup(faculty, year, month)
+    
+    filename = f"faculty-{faculty.pk}-cleaning-{year}-{month:02d}"
+    return export_response(
+        export_format, filename, ACTIVITY_EXPORT_HEADER, faculty_export_rows(rollup['units_data']), faculty.faculty_name
+    )
+
+
 @login_required
 def faculty_list_report(request):
     """List all faculties for cleaning report access.
@@ -1165,22 +1313,24 @@ def faculty_list_report(request):
         messages.error(request, 'Only managers or dean office can view faculty reports.')
         return redirect('cleaning:cleaning_record_list')
     
-    faculties = Faculty.objects.all().order_by('faculty_name')
+    # Unit and activity counts for every faculty in one annotated query
+    faculties = Faculty.objects.annotate(
+        unit_count=Count('units', filter=Q(units__is_active=True), distinct=True),
+        activity_count=Count(
+            'units__cleaning_activities',
+            filter=Q(units__cleaning_activities__is_active=True),
+            distinct=True,
+        ),
+    ).order_by('faculty_name')
     
-    # Add unit counts to each faculty
-    faculties_data = []
-    for faculty in faculties:
-        unit_count = faculty.units.filter(is_active=True).count()
-        activity_count = CleaningActivity.objects.filter(
-            unit__faculty=faculty,
-            is_active=True
-        ).count()
-        
-        faculties_data.append({
+    faculties_data = [
+        {
             'faculty': faculty,
-            'unit_count': unit_count,
-            'activity_count': activity_count,
-        })
+            'unit_count': faculty.unit_count,
+            'activity_count': faculty.activity_count,
+        }
+        for faculty in faculties
+    ]
     
     context = {
         'faculties_data': faculties_data,
@@ -1188,5 +1338,91 @@ def faculty_list_report(request):
     return render(request, 'cleaning/faculty_list_report.html', context)
 
 
+def _report_job_denied(user, form):
+    """Return an error message if ``user`` may not queue the report in ``form``, else None"""
+    report_type = form.cleaned_data['report_type']
+    if report_type == 'ACTIVITY_PERFORMANCE' and not user.is_manager():
+        return 'Only managers can view performance reports.'
+    if report_type == 'FACULTY':
+        if not (user.is_manager() or user.is_dean_office()):
+            return 'Only managers or dean office can view faculty reports.'
+        faculty = form.cleaned_data['faculty']
+        if user.is_dean_office() and user.faculty_id and not (user.is_staff or user.is_superuser) \
+                and faculty.pk != user.faculty_id:
+            return 'You can only generate reports for your own faculty.'
+    return None
+
+
+def _report_job_payload(job):
+    """Return the JSON status of a report job for polling"""
+    return {
+        'id': job.pk,
+        'status': job.status,
+        'status_display': job.get_status_display(),
+        'progress': job.progress,
+        'rows_written': job.rows_written,
+        'error': job.error,
+        'download_url': (
+            reverse('cleaning:report_job_download', args=[job.pk]) if job.status == 'SUCCEEDED' else None
+        ),
+    }
 
 
+@login_required
+def report_job_list(request):
+    """List the user's background report jobs and queue new ones"""
+    if request.method == 'POST':
+        form = ReportJobForm(request.POST)
+        if form.is_valid():
+            error = _report_job_denied(request.user, form)
+            if error:
+                messages.error(request, error)
+                return redirect('cleaning:report_job_list')
+            
+            job = ReportJob.objects.create(
+                requested_by=request.user,
+                report_type=form.cleaned_data['report_type'],
+                export_format=form.cleaned_data['export_format'],
+                parameters=form.get_parameters(),
+            )
+            # Only hand the job to a worker once the row is visible to it
+            transaction.on_commit(lambda: generate_report.delay(job.pk))
+            
+            if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+                return JsonResponse(_report_job_payload(job), status=202)
+            messages.success(request, 'Report queued. It will be ready to download shortly.')
+            return redirect('cleaning:report_job_list')
+    else:
+        form = ReportJobForm(initial={
+            'report_type': request.GET.get('report_type', 'RECORDS'),
+            'export_format': request.GET.get('format', 'csv'),
+            'faculty': request.GET.get('faculty'),
+            'year': request.GET.get('year', date.today().year),
+            'month': request.GET.get('month', date.today().month),
+            'months': 1,
+        })
+    
+    jobs = ReportJob.objects.filter(requested_by=request.user)[:20]
+    context = {
+        'form': form,
+        'jobs': jobs,
+    }
+    return render(request, 'cleaning/report_job_list.html', context)
+
+
+@login_required
+def report_job_status(request, pk):
+    """AJAX: Return the status and progress of a report job"""
+    job = get_object_or_404(ReportJob, pk=pk)
+    if not job.can_view(request.user):
+        raise Http404
+    return JsonResponse(_report_job_payload(job))
+
+
+@login_required
+def report_job_download(request, pk):
+    """Download the file produced by a finished report job"""
+    job = get_object_or_404(ReportJob, pk=pk)
+    if not job.can_view(request.user) or job.status != 'SUCCEEDED' or not job.file:
+        raise Http404
+    return FileResponse(job.file.open('rb'), as_attachment=True, filename=job.file.name.rsplit('/', 1)[-1])
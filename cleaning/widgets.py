@@ -0,0 +1,57 @@
+"""
+Form widgets that load their options on demand.
+
+``AutocompleteSelect`` renders a normal ``<select>`` holding only the
+selected option (and the empty choice), plus a ``data-autocomplete-url``
+attribute. ``cleaning/js/autocomplete.js`` adds a search box in front of it
+and fills the select from the JSON endpoint as the user types, so a form
+page costs one query per selected value however many units, activities or
+assistants exist. The field's queryset still validates submitted values.
+"""
+from django import forms
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+
+
+class AutocompleteSelect(forms.Select):
+    """Select for a ModelChoiceField whose options come from ``url`` (a URL name) as the user types"""
+
+    class Media:
+        js = ('cleaning/js/autocomplete.js',)
+
+    def __init__(self, url, attrs=None, placeholder='Type to search...'):
+        attrs = {'class': 'form-select', **(attrs or {})}
+        super().__init__(attrs)
+        self.url = url
+        self.placeholder = placeholder
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['data-autocomplete-url'] = reverse(self.url)
+        attrs['data-autocomplete-placeholder'] = self.placeholder
+        return attrs
+
+    def _selected_choices(self, value):
+        """Yield (value, label) for the selected values only, with one query"""
+        iterator = self.choices
+        field = iterator.field
+        if field.empty_label is not None:
+            yield '', field.empty_label
+        selected = [v for v in value if v not in ('', None)]
+        if not selected:
+            return
+        try:
+            objs = list(iterator.queryset.filter(pk__in=selected))
+        except (TypeError, ValueError, ValidationError):
+            return
+        for obj in objs:
+            yield field.prepare_value(obj), field.label_from_instance(obj)
+
+    def optgroups(self, name, value, attrs=None):
+        value = [str(v) for v in value]
+        groups = []
+        for index, (option_value, option_label) in enumerate(self._selected_choices(value)):
+            option_value = '' if option_value is None else option_value
+            selected = str(option_value) in value
+            groups.append((None, [self.create_option(name, option_value, option_label, selected, index)], index))
+        return groups
@@ -0,0 +1,16 @@
+"""
+Celery application for cleaning_project.
+
+Workers are started with ``celery -A cleaning_project worker``. Settings are
+read from Django settings prefixed with ``CELERY_`` and tasks are discovered
+from each installed app's ``tasks`` module.
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cleaning_project.settings')
+
+app = Celery('cleaning_project')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -0,0 +1,137 @@
+"""
+Opt-in per-request SQL profiling and query budgets.
+
+``QueryBudgetMiddleware`` wraps every database connection with
+``connection.execute_wrapper()`` while the request is handled and records:
+
+- the number of queries and the total time spent in them,
+- repeated query shapes (the same SQL with different parameters, the usual
+  sign of an N+1 loop),
+- the total time spent handling the request.
+
+The numbers are returned in a ``Server-Timing`` header (visible in the
+browser's network panel) and logged to the ``cleaning_project.queries``
+logger, with the full profile in the record's ``query_profile`` attribute.
+
+Budgets map URL names (``'cleaning:cleaning_record_list'``) to the most
+queries a request may run. Going over budget is logged as a warning, or
+raises ``QueryBudgetExceeded`` when ``QUERY_BUDGET_ACTION = 'raise'`` (meant
+for tests). Queries run while a streaming response is consumed happen after
+the middleware returns and are not counted.
+
+Settings:
+    QUERY_PROFILING        enable the middleware (default False)
+    QUERY_BUDGETS          {url name: max queries}
+    QUERY_BUDGET_DEFAULT   budget for URLs not in QUERY_BUDGETS (default None)
+    QUERY_BUDGET_ACTION    'log' (default) or 'raise'
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('cleaning_project.queries')
+
+# Repeated shapes reported per request, most frequent first
+MAX_REPORTED_DUPLICATES = 5
+
+_IN_LIST = re.compile(r'\((?:%s, )+%s\)')
+
+
+def query_shape(sql):
+    """Return ``sql`` with variable-length IN lists collapsed, so repeats compare equal"""
+    return _IN_LIST.sub('(%s, ...)', sql)
+
+
+class QueryBudgetExceeded(Exception):
+    """A request ran more queries than its URL's budget allows"""
+
+
+class QueryProfile:
+    """Queries, SQL time and query shapes collected during one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.sql_time = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.count += 1
+            self.shapes[query_shape(sql)] += 1
+
+    @property
+    def duplicates(self):
+        """[(shape, times run)] for shapes run more than once, most frequent first"""
+        return [(shape, n) for shape, n in self.shapes.most_common(MAX_REPORTED_DUPLICATES) if n > 1]
+
+
+def get_query_budget(view_name):
+    """Return the query budget configured for a URL name, or None"""
+    budgets = getattr(settings, 'QUERY_BUDGETS', {})
+    if view_name in budgets:
+        return budgets[view_name]
+    return getattr(settings, 'QUERY_BUDGET_DEFAULT', None)
+
+
+class QueryBudgetMiddleware:
+    """Profile the SQL run by each request and enforce per-URL query budgets"""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_PROFILING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = QueryProfile()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile))
+            response = self.get_response(request)
+        total_time = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else None
+        budget = get_query_budget(view_name)
+        duplicates = profile.duplicates
+
+        response['Server-Timing'] = ', '.join([
+            f'sql;dur={profile.sql_time * 1000:.1f};desc="{profile.count} queries"',
+            f'dup;desc="{sum(n - 1 for _, n in duplicates)} repeated"',
+            f'total;dur={total_time * 1000:.1f}',
+        ])
+
+        data = {
+            'method': request.method,
+            'path': request.path,
+            'view': view_name,
+            'status': response.status_code,
+            'queries': profile.count,
+            'sql_ms': round(profile.sql_time * 1000, 1),
+            'total_ms': round(total_time * 1000, 1),
+            'duplicates': [{'sql': shape, 'count': n} for shape, n in duplicates],
+            'budget': budget,
+        }
+        logger.info(
+            '%s %s view=%s queries=%d sql_ms=%.1f total_ms=%.1f repeated_shapes=%d',
+            request.method, request.path, view_name, profile.count,
+            data['sql_ms'], data['total_ms'], len(duplicates),
+            extra={'query_profile': data},
+        )
+
+        if budget is not None and profile.count > budget:
+            message = f'{view_name} ran {profile.count} queries, over its budget of {budget}'
+            if getattr(settings, 'QUERY_BUDGET_ACTION', 'log') == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(message, extra={'query_profile': data})
+        return response
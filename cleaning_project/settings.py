@@ -49,6 +49,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    # Per-request SQL profiling and query budgets (only active when QUERY_PROFILING=True)
+    'cleaning_project.middleware.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -135,6 +137,64 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 
 
+# Uploaded and generated files (report job artifacts)
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+
+# Cache (rendered calendar fragments, invalidated through per-activity versions)
+# LocMem is private to each process, so a write in one web worker cannot
+# invalidate another's entries. Set CACHE_REDIS_URL whenever more than one
+# web process serves requests; with DEBUG off, the cleaning.W001 system check
+# warns on every manage.py command until it is set.
+if os.environ.get('CACHE_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['CACHE_REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'cleaning',
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+
+
+# Query profiling (see cleaning_project/middleware.py)
+# Set QUERY_PROFILING=True to add Server-Timing headers and per-request query logs.
+QUERY_PROFILING = os.environ.get('QUERY_PROFILING') == 'True'
+# 'log' warns when a request goes over its budget; 'raise' fails it (for tests)
+QUERY_BUDGET_ACTION = os.environ.get('QUERY_BUDGET_ACTION', 'log')
+QUERY_BUDGET_DEFAULT = None
+QUERY_BUDGETS = {}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'cleaning_project.queries': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+
+# Celery (background report generation)
+# Set CELERY_TASK_ALWAYS_EAGER=True to run tasks inline when no worker is available
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+CELERY_TASK_ALWAYS_EAGER = os.environ.get('CELERY_TASK_ALWAYS_EAGER') == 'True'
+CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_TIMEZONE = TIME_ZONE
+
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
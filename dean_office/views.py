@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 from django.apps import apps
+from django.db.models import Count, Q
 import logging
 from datetime import datetime, date, timedelta
 from django.utils import timezone
@@ -139,7 +140,7 @@ def dashboard(request):
             show_faculty_filter = False
     except Exception:
         # If anything goes wrong here, fall back to later logic
-        pass
+        logger.exception('Error scoping the dean dashboard to the user faculty')
     try:
         Faculty = apps.get_model('cleaning', 'Faculty')
         CleaningRecord = apps.get_model('cleaning', 'CleaningRecord')
@@ -189,14 +190,19 @@ def dashboard(request):
             else:
                 total_activities = 0
 
-            # records: scheduled/completed/pending counts
+            # records: scheduled/completed/pending counts in a single aggregate
             if CleaningRecord is not None:
-                qs = CleaningRecord.objects.select_related('unit')
+                qs = CleaningRecord.objects.all()
                 if selected_faculty:
                     qs = qs.filter(unit__faculty=selected_faculty)
-                total_records = qs.count()
-                completed = qs.filter(status__in=['COMPLETED', 'VERIFIED']).count()
-                pending = qs.filter(status='PENDING').count()
+                record_counts = qs.aggregate(
+                    total=Count('id'),
+                    completed=Count('id', filter=Q(status__in=['COMPLETED', 'VERIFIED'])),
+                    pending=Count('id', filter=Q(status='PENDING')),
+                )
+                total_records = record_counts['total']
+                completed = record_counts['completed']
+                pending = record_counts['pending']
             else:
                 total_records = completed = pending = 0
 
@@ -239,20 +245,19 @@ def dashboard(request):
                 scheduled_date__gte=start_of_month,
                 scheduled_date__lte=end_of_month,
             )
-            try:
-                logger.debug(
-                    "Dean dashboard monthly: faculty_id=%s range=%s..%s count=%s",
-                    getattr(selected_faculty, 'id', None), start_of_month, end_of_month, mqs.count()
-                )
-            except Exception:
-                pass
             # Order by date then time
             monthly_records = mqs.order_by('scheduled_date', 'scheduled_time')[:1000]
-            month_stats['total'] = mqs.count()
-            month_stats['pending'] = mqs.filter(status='PENDING').count()
-            month_stats['in_progress'] = mqs.filter(status='IN_PROGRESS').count()
-            month_stats['completed'] = mqs.filter(status='COMPLETED').count()
-            month_stats['verified'] = mqs.filter(status='VERIFIED').count()
+            month_stats = mqs.aggregate(
+                total=Count('id'),
+                pending=Count('id', filter=Q(status='PENDING')),
+                in_progress=Count('id', filter=Q(status='IN_PROGRESS')),
+                completed=Count('id', filter=Q(status='COMPLETED')),
+                verified=Count('id', filter=Q(status='VERIFIED')),
+            )
+            logger.debug(
+                "Dean dashboard monthly: faculty_id=%s range=%s..%s count=%s",
+                getattr(selected_faculty, 'id', None), start_of_month, end_of_month, month_stats['total']
+            )
         # Note: We intentionally avoid overriding monthly_records here. It is already
         # built from mqs above using scheduled_date and the selected_faculty scope.
     except LookupError:
@@ -300,7 +305,7 @@ def reports(request):
         if Faculty is not None:
             faculties, selected_faculty = _faculties_for_user(Faculty, request.user, request)
         if CleaningRecord is not None:
-            qs = CleaningRecord.objects.select_related('unit', 'activity')
+            qs = CleaningRecord.objects.select_related('unit', 'activity', 'assigned_to')
             if selected_faculty:
                 qs = qs.filter(unit__faculty=selected_faculty)
             data_rows = qs.order_by('-scheduled_date')[:200]
@@ -373,11 +378,11 @@ def monitoring(request):
             faculties, selected_faculty = _faculties_for_user(Faculty, request.user, request)
 
             if selected_faculty:
-                units = Unit.objects.filter(faculty=selected_faculty).order_by('-created_at')[:200]
+                units = Unit.objects.filter(faculty=selected_faculty).select_related('zone').order_by('-created_at')[:200]
                 faculty_units.append({'faculty': selected_faculty, 'units': units})
             else:
                 for f in faculties:
-                    units = Unit.objects.filter(faculty=f).order_by('-created_at')[:20]
+                    units = Unit.objects.filter(faculty=f).select_related('zone').order_by('-created_at')[:20]
                     faculty_units.append({'faculty': f, 'units': units})
     except LookupError:
         logger.debug('cleaning.Faculty or Unit model not found; monitoring page will show empty data')
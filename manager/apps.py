@@ -5,3 +5,6 @@ class ManagerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'manager'
     verbose_name = 'Manager Dashboard'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -1,5 +1,7 @@
 from django import forms
+from cleaning.forms import section_label
 from cleaning.models import Zone, Section, Faculty, Unit, CleaningActivity
+from cleaning.widgets import AutocompleteSelect
 
 
 class ZoneForm(forms.ModelForm):
@@ -25,7 +27,7 @@ class SectionForm(forms.ModelForm):
 
 class FacultyForm(forms.ModelForm):
     existing_faculty = forms.ModelChoiceField(
-        queryset=Faculty.objects.all().order_by('faculty_name'),
+        queryset=Faculty.objects.select_related('zone').order_by('faculty_name'),
         required=False,
         empty_label="-- Create New Faculty --",
         widget=forms.Select(attrs={'class': 'form-select', 'id': 'existing_faculty'}),
@@ -116,6 +118,10 @@ class UnitForm(forms.ModelForm):
         self.fields['faculty'].empty_label = "-- No Faculty (Optional) --"
         self.fields['assigned_assistant'].empty_label = "-- No Assistant Assigned (Optional) --"
         
+        # Option labels include the zone name
+        self.fields['section'].queryset = Section.objects.select_related('zone')
+        self.fields['faculty'].queryset = Faculty.objects.select_related('zone')
+        
         # Filter assigned_assistant to show only users with ASSISTANT role
         self.fields['assigned_assistant'].queryset = User.objects.filter(role='ASSISTANT').order_by('username')
         self.fields['assigned_assistant'].label_from_instance = lambda obj: f"{obj.get_full_name() or obj.username} ({obj.username})"
@@ -137,6 +143,58 @@ class UnitForm(forms.ModelForm):
         return cleaned_data
 
 
+class UnitFilterForm(forms.Form):
+    """Search box and filters for the unit directory; zone, section and faculty options load as the user types"""
+
+    STATUS_CHOICES = [('', 'All Statuses'), ('active', 'Active'), ('inactive', 'Inactive')]
+
+    search = forms.CharField(
+        required=False,
+        max_length=200,
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Search unit names and descriptions...'})
+    )
+
+    zone = forms.ModelChoiceField(
+        queryset=Zone.objects.all(),
+        required=False,
+        empty_label="All Zones",
+        widget=AutocompleteSelect('cleaning:autocomplete_zones', attrs={'id': 'id_zone'})
+    )
+
+    section = forms.ModelChoiceField(
+        queryset=Section.objects.all(),
+        required=False,
+        empty_label="All Sections",
+        widget=AutocompleteSelect('cleaning:autocomplete_sections', attrs={
+            'data-autocomplete-forward': 'zone=id_zone',
+        })
+    )
+
+    faculty = forms.ModelChoiceField(
+        queryset=Faculty.objects.select_related('zone'),
+        required=False,
+        empty_label="All Faculties",
+        widget=AutocompleteSelect('cleaning:autocomplete_faculties')
+    )
+
+    status = forms.ChoiceField(
+        choices=STATUS_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['section'].label_from_instance = section_label
+
+    def get_filters(self):
+        """Return the valid, non-empty filters as a dict"""
+        if not self.is_bound:
+            return {}
+        self.is_valid()
+        return {name: value for name, value in self.cleaned_data.items() if value not in (None, '')}
+
+
 class MonthlyScheduleActivityForm(forms.ModelForm):
     """Form for creating cleaning activities as part of monthly schedule"""
     class Meta:
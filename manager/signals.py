@@ -0,0 +1,32 @@
+"""
+Signal handlers that drop the cached manager counters when the counted rows change.
+
+``QuerySet.update()`` (for example the admin activate/deactivate actions)
+does not fire these; the counters then catch up when the short cache
+timeout expires.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import User
+from cleaning.models import Zone, Section, Faculty, Unit
+
+from .stats import clear_location_stats
+
+
+@receiver(post_save, sender=Zone)
+@receiver(post_save, sender=Section)
+@receiver(post_save, sender=Faculty)
+@receiver(post_save, sender=Unit)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=Zone)
+@receiver(post_delete, sender=Section)
+@receiver(post_delete, sender=Faculty)
+@receiver(post_delete, sender=Unit)
+@receiver(post_delete, sender=User)
+def invalidate_location_stats(sender, raw=False, update_fields=None, **kwargs):
+    """Recount on the next manager page view after a counted row changes"""
+    # Logins save last_login only, which no counter depends on
+    if raw or update_fields == frozenset({'last_login'}):
+        return
+    clear_location_stats()
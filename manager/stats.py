@@ -0,0 +1,132 @@
+"""
+Location and staff counters for the manager dashboard and reports pages,
+and the per-assistant workload figures for the assistants board.
+
+``location_stats()`` returns every counter from a single SELECT made of
+scalar COUNT subqueries and keeps the result in the cache for a short time,
+so moving between the manager pages does not recount the tables each time.
+Saving or deleting a zone, section, faculty, unit or user drops the cached
+counters (see ``signals.py``).
+
+``assistant_workload()`` annotates the assistant users with correlated
+subqueries, so every figure for every assistant comes from one SELECT that
+can be sorted and paginated in the database.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Case, Count, F, FloatField, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from accounts.models import User
+from cleaning.models import Zone, Section, Faculty, Unit, CleaningActivity, CleaningRecord
+
+LOCATION_STATS_CACHE_KEY = 'manager:location-stats'
+LOCATION_STATS_TIMEOUT = 60
+
+# Days of history behind the workload board's completion rate
+WORKLOAD_COMPLETION_DAYS = 30
+
+OPEN_STATUSES = ['PENDING', 'IN_PROGRESS']
+DONE_STATUSES = ['COMPLETED', 'VERIFIED']
+
+
+def _row_count(queryset):
+    """Return ``queryset`` as a one-row, one-column query of its row count"""
+    return queryset.order_by().values(anchor=Value(1)).annotate(row_count=Count('*')).values('row_count')
+
+
+def _count_in_one_query(**querysets):
+    """Return {name: row count} for each queryset, counted by one SELECT.
+
+    The first queryset is counted by the outer query, which has no GROUP BY
+    and so always returns one row; the others are scalar COUNT subqueries.
+    """
+    (first_name, first), *others = querysets.items()
+    row = first.order_by().values(anchor=Value(1)).annotate(
+        **{first_name: Count('*')},
+        **{name: Subquery(_row_count(queryset)) for name, queryset in others},
+    ).get()
+    return {name: row[name] for name in querysets}
+
+
+def compute_location_stats():
+    """Count zones, sections, faculties, units by status and assistants"""
+    return _count_in_one_query(
+        total_zones=Zone.objects.all(),
+        total_sections=Section.objects.all(),
+        total_faculties=Faculty.objects.all(),
+        total_units=Unit.objects.all(),
+        active_units=Unit.objects.filter(is_active=True),
+        inactive_units=Unit.objects.filter(is_active=False),
+        total_assistants=User.objects.filter(role='ASSISTANT'),
+    )
+
+
+def location_stats():
+    """Return the location and staff counters, from the cache when fresh"""
+    return cache.get_or_set(LOCATION_STATS_CACHE_KEY, compute_location_stats, LOCATION_STATS_TIMEOUT)
+
+
+def clear_location_stats():
+    """Drop the cached counters so the next page view recounts"""
+    cache.delete(LOCATION_STATS_CACHE_KEY)
+
+
+def _per_assistant(queryset, assistant_field, aggregate, output_field):
+    """Return a correlated subquery aggregating ``queryset`` rows whose ``assistant_field`` is the outer user"""
+    aggregated = (
+        queryset.filter(**{assistant_field: OuterRef('pk')})
+        .order_by()
+        .values(assistant_field)
+        .annotate(value=aggregate)
+        .values('value')
+    )
+    return Coalesce(Subquery(aggregated, output_field=output_field), Value(0), output_field=output_field)
+
+
+def assistant_workload(today=None):
+    """Return assistant users annotated with their workload figures.
+
+    ``unit_count`` and ``activity_count`` count active units assigned to
+    the assistant and their active activities; ``weekly_occurrences`` sums
+    those activities' ``get_frequency_per_week()``. ``pending_count`` and
+    ``overdue_count`` count open records assigned to the assistant (overdue
+    ones are scheduled before ``today``), and ``completion_rate`` is the
+    percentage of their records in the last 30 days that were completed, or
+    None if they had none.
+    """
+    today = today or timezone.localdate()
+    since = today - timedelta(days=WORKLOAD_COMPLETION_DAYS)
+
+    activities = CleaningActivity.objects.filter(is_active=True, unit__is_active=True)
+    per_week = Case(
+        *[When(frequency=code, then=Value(float(n))) for code, n in CleaningActivity.FREQUENCY_PER_WEEK.items()],
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    open_records = CleaningRecord.objects.filter(status__in=OPEN_STATUSES)
+    recent_records = CleaningRecord.objects.filter(scheduled_date__gte=since, scheduled_date__lt=today)
+
+    count = Count('pk')
+    return User.objects.filter(role='ASSISTANT').annotate(
+        unit_count=_per_assistant(
+            Unit.objects.filter(is_active=True), 'assigned_assistant', count, IntegerField()
+        ),
+        activity_count=_per_assistant(activities, 'unit__assigned_assistant', count, IntegerField()),
+        weekly_occurrences=_per_assistant(activities, 'unit__assigned_assistant', Sum(per_week), FloatField()),
+        pending_count=_per_assistant(open_records, 'assigned_to', count, IntegerField()),
+        overdue_count=_per_assistant(
+            open_records.filter(scheduled_date__lt=today), 'assigned_to', count, IntegerField()
+        ),
+        recent_count=_per_assistant(recent_records, 'assigned_to', count, IntegerField()),
+        recent_done_count=_per_assistant(
+            recent_records.filter(status__in=DONE_STATUSES), 'assigned_to', count, IntegerField()
+        ),
+        completion_rate=Case(
+            When(recent_count=0, then=Value(None)),
+            default=Cast(F('recent_done_count'), FloatField()) * 100.0 / F('recent_count'),
+            output_field=FloatField(),
+        ),
+    )
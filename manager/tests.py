@@ -1 +1,241 @@
-# Create your tests here.
+"""
+Tests for the manager dashboard counters, the unit directory and the workload board
+"""
+from datetime import date, timedelta
+from unittest import skipUnless
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client
+from django.urls import reverse
+from cleaning.models import Faculty, Section, Unit, Zone
+from cleaning.search import SQLITE_FTS_TRIGGERS, ensure_search_index, search_units
+from cleaning.tests.fixtures import TestDataFactory, BaseTestCase
+from manager.stats import assistant_workload, compute_location_stats, location_stats
+
+
+class LocationStatsTest(BaseTestCase, TestCase):
+    """Test location_stats and the pages that use it"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.create_test_users()
+        self.create_test_hierarchy()
+        TestDataFactory.create_unit(unit_name='Closed Unit', zone=self.zone, faculty=self.faculty, is_active=False)
+
+    def test_counts_in_one_statement(self):
+        """Test that all counters come from a single query"""
+        with self.assertNumQueries(1):
+            stats = compute_location_stats()
+
+        self.assertEqual(stats, {
+            'total_zones': 1,
+            'total_sections': 0,
+            'total_faculties': 1,
+            'total_units': 2,
+            'active_units': 1,
+            'inactive_units': 1,
+            'total_assistants': 1,
+        })
+
+    def test_counts_empty_tables(self):
+        """Test that the single query still returns one row of zeros when the first table is empty"""
+        for model in (Unit, Faculty, Zone):
+            model.objects.all().delete()
+
+        with self.assertNumQueries(1):
+            stats = compute_location_stats()
+
+        self.assertEqual(stats['total_zones'], 0)
+        self.assertEqual(stats['total_units'], 0)
+        self.assertEqual(stats['total_assistants'], 1)
+
+    def test_counters_are_cached_until_a_location_changes(self):
+        """Test that cached counters are reused and dropped when a unit is added"""
+        location_stats()
+        with self.assertNumQueries(0):
+            location_stats()
+
+        TestDataFactory.create_unit(unit_name='New Unit', zone=self.zone, faculty=self.faculty)
+        self.assertEqual(location_stats()['total_units'], 3)
+
+    def test_dashboard_and_reports_share_the_counters(self):
+        """Test that both manager pages show the same cached counters"""
+        self.login_as_manager()
+        dashboard = self.client.get(reverse('manager:dashboard'))
+        self.assertEqual(dashboard.context['total_units'], 2)
+        self.assertEqual(dashboard.context['total_assistants'], 1)
+
+        with self.assertNumQueries(4):
+            # Session, user, and the faculty and zone breakdowns; no counter queries
+            reports = self.client.get(reverse('manager:reports'))
+        self.assertEqual(reports.context['inactive_units'], 1)
+
+
+class UnitDirectoryTest(BaseTestCase, TestCase):
+    """Test the searchable, paginated unit directory"""
+
+    def setUp(self):
+        self.client = Client()
+        self.create_test_users()
+        self.create_test_hierarchy()
+        self.section = Section.objects.create(zone=self.zone, section_name='Science Block')
+        self.lab = Unit.objects.create(
+            unit_name='Chemistry Lab A', zone=self.zone, section=self.section, faculty=self.faculty,
+            description='Organic chemistry laboratory',
+        )
+        self.office = Unit.objects.create(
+            unit_name='Staff Office', zone=self.zone, faculty=self.faculty,
+            description='Next to the chemistry lab', is_active=False,
+        )
+        self.login_as_manager()
+        self.url = reverse('manager:units_list')
+
+    def _names(self, response):
+        return [unit.unit_name for unit in response.context['units']]
+
+    def test_search_matches_word_prefixes_ranked(self):
+        """Test that every word must start a word in the name or description, name matches first"""
+        response = self.client.get(self.url, {'search': 'chem lab'})
+        self.assertEqual(self._names(response), ['Chemistry Lab A', 'Staff Office'])
+        self.assertEqual(self._names(self.client.get(self.url, {'search': 'organic'})), ['Chemistry Lab A'])
+        self.assertEqual(self._names(self.client.get(self.url, {'search': 'hemistry'})), [])
+
+    def test_search_index_follows_edits(self):
+        """Test that renamed and deleted units are found under their new text only"""
+        self.lab.unit_name = 'Physics Lab'
+        self.lab.description = ''
+        self.lab.save()
+        self.assertEqual(list(search_units(Unit.objects.all(), 'physics')), [self.lab])
+        self.assertEqual(list(search_units(Unit.objects.all(), 'organic')), [])
+
+        self.office.delete()
+        self.assertEqual(list(search_units(Unit.objects.all(), 'staff')), [])
+
+    @skipUnless(connection.vendor == 'sqlite', 'The FTS5 sync triggers only exist on SQLite')
+    def test_search_triggers_exist_after_migrate(self):
+        """Test that the migrated schema has every trigger keeping the FTS table in step"""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'cleaning_unit'")
+            triggers = {row[0] for row in cursor.fetchall()}
+        self.assertLessEqual(set(SQLITE_FTS_TRIGGERS), triggers)
+
+    @skipUnless(connection.vendor == 'sqlite', 'The FTS5 sync triggers only exist on SQLite')
+    def test_missing_triggers_are_recreated(self):
+        """Test that ensure_search_index() restores a dropped trigger and re-syncs the index"""
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER cleaning_unit_fts_update')
+        self.lab.unit_name = 'Physics Lab'
+        self.lab.save()
+        self.assertEqual(list(search_units(Unit.objects.all(), 'physics')), [])
+
+        self.assertEqual(ensure_search_index(), ['cleaning_unit_fts_update'])
+        self.assertEqual(ensure_search_index(), [])
+        self.assertEqual(list(search_units(Unit.objects.all(), 'physics')), [self.lab])
+
+    def test_query_without_words_lists_everything(self):
+        """Test that punctuation-only searches are ignored rather than passed to the index"""
+        response = self.client.get(self.url, {'search': '"*:&'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['page_obj'].paginator.count, 3)
+
+    def test_filters_and_pages(self):
+        """Test that filters combine with search and page links keep them"""
+        response = self.client.get(self.url, {'search': 'chem', 'status': 'active', 'section': self.section.pk})
+        self.assertEqual(self._names(response), ['Chemistry Lab A'])
+
+        response = self.client.get(self.url, {'status': 'active', 'page_size': 1})
+        self.assertEqual(response.context['page_obj'].paginator.num_pages, 2)
+        self.assertContains(response, '?status=active&amp;page_size=1&amp;page=2')
+
+    def test_filter_dropdowns_load_no_options(self):
+        """Test that the page does not load the zone, section or faculty tables for its dropdowns"""
+        for i in range(10):
+            Section.objects.create(zone=self.zone, section_name=f'Extra {i}')
+        with self.assertNumQueries(5):
+            # Session, user, count, the page's ids and their rows
+            self.client.get(self.url)
+
+
+class AssistantWorkloadTest(BaseTestCase, TestCase):
+    """Test the per-assistant workload figures and the board that shows them"""
+
+    def setUp(self):
+        self.client = Client()
+        self.create_test_users()
+        self.create_test_hierarchy()
+        self.today = date(2025, 10, 15)
+        self.idle = TestDataFactory.create_assistant(username='idle', email='idle@test.com')
+        self.unit.assigned_assistant = self.assistant
+        self.unit.save()
+        self.daily = TestDataFactory.create_activity('Sweep floor', unit=self.unit, frequency='DAILY')
+        self.weekly = TestDataFactory.create_activity('Clean windows', unit=self.unit, frequency='WEEKLY')
+        retired = TestDataFactory.create_activity('Wax floor', unit=self.unit, frequency='TWICE_DAILY')
+        retired.is_active = False
+        retired.save()
+        closed = TestDataFactory.create_unit('Closed Unit', zone=self.zone, faculty=self.faculty,
+                                            is_active=False, assigned_assistant=self.assistant)
+        TestDataFactory.create_activity('Mop floor', unit=closed)
+
+        def record(day, status):
+            TestDataFactory.create_cleaning_record(
+                activity=self.daily, scheduled_date=self.today - timedelta(days=day),
+                status=status, assigned_to=self.assistant,
+            )
+        record(1, 'COMPLETED')
+        record(2, 'VERIFIED')
+        record(3, 'PENDING')
+        record(40, 'COMPLETED')  # outside the 30-day window
+        record(-1, 'PENDING')  # upcoming, not overdue
+
+    def _workload(self, user):
+        return assistant_workload(self.today).get(pk=user.pk)
+
+    def test_figures(self):
+        """Test each figure against the model helpers and the records created"""
+        row = self._workload(self.assistant)
+        self.assertEqual(row.unit_count, 1)
+        self.assertEqual(row.activity_count, 2)
+        self.assertEqual(row.weekly_occurrences, self.daily.get_frequency_per_week() + self.weekly.get_frequency_per_week())
+        self.assertEqual((row.pending_count, row.overdue_count), (2, 1))
+        self.assertAlmostEqual(row.completion_rate, 200 / 3)
+
+        idle = self._workload(self.idle)
+        self.assertEqual((idle.unit_count, idle.weekly_occurrences, idle.pending_count), (0, 0, 0))
+        self.assertIsNone(idle.completion_rate)
+
+    def test_one_query_for_all_assistants(self):
+        """Test that the figures of every assistant come from a single query"""
+        for i in range(5):
+            TestDataFactory.create_assistant(username=f'extra{i}', email=f'extra{i}@test.com')
+        with self.assertNumQueries(1):
+            rows = list(assistant_workload(self.today))
+        self.assertEqual(len(rows), 7)
+
+    def test_board_sorts_and_pages(self):
+        """Test the board's default busiest-first order, sort links and page size"""
+        self.login_as_manager()
+        url = reverse('manager:assistants_list')
+
+        response = self.client.get(url)
+        self.assertEqual([a.username for a in response.context['assistants']], ['assistant', 'idle'])
+        self.assertEqual(response.context['sort_links']['weekly'], 'sort=weekly')
+        self.assertContains(response, 'idle@test.com')
+
+        response = self.client.get(url, {'sort': 'completion', 'page_size': 1})
+        # Assistants without recent records sort last either way
+        self.assertEqual([a.username for a in response.context['assistants']], ['assistant'])
+        self.assertEqual(response.context['page_obj'].paginator.num_pages, 2)
+
+        response = self.client.get(url, {'sort': 'nonsense'})
+        self.assertEqual(response.context['sort'], '-weekly')
+
+    def test_board_query_count_is_fixed(self):
+        """Test that the board costs the same queries with many assistants"""
+        self.login_as_manager()
+        url = reverse('manager:assistants_list')
+        for i in range(20):
+            TestDataFactory.create_assistant(username=f'extra{i}', email=f'extra{i}@test.com')
+        with self.assertNumQueries(4):
+            # Session, user, count and the annotated page
+            self.client.get(url, {'page_size': 10})
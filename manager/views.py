@@ -1,11 +1,26 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from django.db.models import Count, Q, Sum
+from django.core.paginator import Paginator
+from django.db.models import Count, F, Q, Sum
 from django.forms import formset_factory
-from accounts.models import User
 from cleaning.models import Zone, Section, Faculty, Unit, CleaningActivity
-from .forms import ZoneForm, SectionForm, FacultyForm, UnitForm, MonthlyScheduleActivityForm
+from cleaning.pagination import get_page_size, sort_query
+from cleaning.search import search_terms, search_units
+from .stats import WORKLOAD_COMPLETION_DAYS, assistant_workload, location_stats
+from .forms import ZoneForm, SectionForm, FacultyForm, UnitForm, UnitFilterForm, MonthlyScheduleActivityForm
+
+
+# Workload board sort keys and the annotation each one orders by
+WORKLOAD_SORTS = {
+    'name': 'username',
+    'units': 'unit_count',
+    'activities': 'activity_count',
+    'weekly': 'weekly_occurrences',
+    'pending': 'pending_count',
+    'overdue': 'overdue_count',
+    'completion': 'completion_rate',
+}
 
 
 def is_manager(user):
@@ -18,15 +33,9 @@ def is_manager(user):
 def manager_dashboard(request):
     """Manager dashboard with overview statistics"""
     context = {
-        'total_zones': Zone.objects.count(),
-        'total_sections': Section.objects.count(),
-        'total_faculties': Faculty.objects.count(),
-        'total_units': Unit.objects.count(),
-        'active_units': Unit.objects.filter(is_active=True).count(),
-        'inactive_units': Unit.objects.filter(is_active=False).count(),
-        'total_assistants': User.objects.filter(role='ASSISTANT').count(),
+        **location_stats(),
         'zones': Zone.objects.all()[:5],  # Latest 5 zones
-        'recent_units': Unit.objects.select_related('section', 'faculty').order_by('-created_at')[:10],
+        'recent_units': Unit.objects.select_related('zone', 'section', 'faculty').order_by('-created_at')[:10],
     }
     return render(request, 'manager/dashboard.html', context)
 
@@ -35,7 +44,7 @@ def manager_dashboard(request):
 @user_passes_test(is_manager, login_url='login')
 def zones_list(request):
     """List all zones with their sections and units count"""
-    zones = Zone.objects.all().order_by('zone_name')
+    zones = Zone.objects.with_counts().order_by('zone_name')
     context = {
         'zones': zones,
     }
@@ -46,13 +55,13 @@ def zones_list(request):
 @user_passes_test(is_manager, login_url='login')
 def zone_detail(request, zone_id):
     """Detail view of a specific zone"""
-    zone = get_object_or_404(Zone, pk=zone_id)
-    sections = zone.sections.all().order_by('section_name')
+    zone = get_object_or_404(Zone.objects.with_counts(), pk=zone_id)
+    sections = zone.sections.with_counts().order_by('section_name')
     
     context = {
         'zone': zone,
         'sections': sections,
-        'total_sections': sections.count(),
+        'total_sections': zone.get_sections_count(),
         'total_units': Unit.objects.filter(section__zone=zone).count(),
         'active_units': Unit.objects.filter(section__zone=zone, is_active=True).count(),
     }
@@ -63,7 +72,7 @@ def zone_detail(request, zone_id):
 @user_passes_test(is_manager, login_url='login')
 def sections_list(request):
     """List all sections"""
-    sections = Section.objects.select_related('zone').all().order_by('zone', 'section_name')
+    sections = Section.objects.select_related('zone').with_counts().order_by('zone', 'section_name')
     context = {
         'sections': sections,
     }
@@ -74,14 +83,14 @@ def sections_list(request):
 @user_passes_test(is_manager, login_url='login')
 def section_detail(request, section_id):
     """Detail view of a specific section"""
-    section = get_object_or_404(Section, pk=section_id)
+    section = get_object_or_404(Section.objects.with_counts(), pk=section_id)
     units = section.units.select_related('faculty').all().order_by('unit_name')
     
     context = {
         'section': section,
         'units': units,
-        'total_units': units.count(),
-        'active_units': units.filter(is_active=True).count(),
+        'total_units': section.get_units_count(),
+        'active_units': section.get_active_units_count(),
     }
     return render(request, 'manager/section_detail.html', context)
 
@@ -90,7 +99,7 @@ def section_detail(request, section_id):
 @user_passes_test(is_manager, login_url='login')
 def faculties_list(request):
     """List all faculties"""
-    faculties = Faculty.objects.all().order_by('faculty_name')
+    faculties = Faculty.objects.select_related('zone').with_counts().order_by('faculty_name')
     context = {
         'faculties': faculties,
     }
@@ -101,14 +110,14 @@ def faculties_list(request):
 @user_passes_test(is_manager, login_url='login')
 def faculty_detail(request, faculty_id):
     """Detail view of a specific faculty"""
-    faculty = get_object_or_404(Faculty, pk=faculty_id)
-    units = faculty.units.select_related('section', 'section__zone').all().order_by('section__zone', 'section', 'unit_name')
+    faculty = get_object_or_404(Faculty.objects.with_counts(), pk=faculty_id)
+    units = faculty.units.select_related('zone', 'section').all().order_by('section__zone', 'section', 'unit_name')
     
     context = {
         'faculty': faculty,
         'units': units,
-        'total_units': units.count(),
-        'active_units': units.filter(is_active=True).count(),
+        'total_units': faculty.get_units_count(),
+        'active_units': faculty.get_active_units_count(),
     }
     return render(request, 'manager/faculty_detail.html', context)
 
@@ -116,53 +125,38 @@ def faculty_detail(request, faculty_id):
 @login_required
 @user_passes_test(is_manager, login_url='login')
 def units_list(request):
-    """List all units with filtering options"""
-    units = Unit.objects.select_related('section', 'section__zone', 'faculty').all()
-    
-    # Filter by zone
-    zone_id = request.GET.get('zone')
-    if zone_id:
-        units = units.filter(zone_id=zone_id)
-    
-    # Filter by section
-    section_id = request.GET.get('section')
-    if section_id:
-        units = units.filter(section_id=section_id)
-    
-    # Filter by faculty
-    faculty_id = request.GET.get('faculty')
-    if faculty_id:
-        units = units.filter(faculty_id=faculty_id)
-    
-    # Filter by status
-    status = request.GET.get('status')
-    if status == 'active':
+    """Unit directory: ranked full-text search, filters and one page of units at a time"""
+    filter_form = UnitFilterForm(request.GET or None)
+    filters = filter_form.get_filters()
+
+    units = Unit.objects.all()
+    for name in ('zone', 'section', 'faculty'):
+        if filters.get(name):
+            units = units.filter(**{name: filters[name]})
+    if filters.get('status') == 'active':
         units = units.filter(is_active=True)
-    elif status == 'inactive':
+    elif filters.get('status') == 'inactive':
         units = units.filter(is_active=False)
-    
-    # Search
-    search_query = request.GET.get('search')
-    if search_query:
-        units = units.filter(
-            Q(unit_name__icontains=search_query) |
-            Q(description__icontains=search_query)
-        )
-    
-    units = units.order_by('zone', 'section', 'unit_name')
-    
+
+    search_query = filters.get('search', '')
+    if search_terms(search_query):
+        units = search_units(units, search_query).order_by('-search_rank', 'location_key', 'pk')
+    else:
+        units = units.order_by('location_key', 'pk')
+
+    # Rank and slice only the ids, then load the page's rows with their relations
+    page_obj = Paginator(units.values_list('pk', flat=True), get_page_size(request.GET.get('page_size'))).get_page(
+        request.GET.get('page')
+    )
+    ids = list(page_obj.object_list)
+    rows = Unit.objects.select_related('zone', 'section', 'faculty', 'assigned_assistant').in_bulk(ids)
+    page_obj.object_list = [rows[pk] for pk in ids]
+
     context = {
-        'units': units,
-        'zones': Zone.objects.all(),
-        'sections': Section.objects.all(),
-        'faculties': Faculty.objects.all(),
-        'current_filters': {
-            'zone': zone_id,
-            'section': section_id,
-            'faculty': faculty_id,
-            'status': status,
-            'search': search_query,
-        }
+        'units': page_obj,
+        'page_obj': page_obj,
+        'filter_form': filter_form,
+        'search_query': search_query,
     }
     return render(request, 'manager/units_list.html', context)
 
@@ -182,11 +176,22 @@ def unit_detail(request, unit_id):
 @login_required
 @user_passes_test(is_manager, login_url='login')
 def assistants_list(request):
-    """List all assistants"""
-    assistants = User.objects.filter(role='ASSISTANT').order_by('username')
-    
+    """Assistant workload board: per-assistant figures from one annotated query, sortable and paginated"""
+    sort = request.GET.get('sort', '-weekly')
+    if sort.lstrip('-') not in WORKLOAD_SORTS:
+        sort = '-weekly'
+    field = F(WORKLOAD_SORTS[sort.lstrip('-')])
+    ordering = field.desc(nulls_last=True) if sort.startswith('-') else field.asc(nulls_last=True)
+
+    assistants = assistant_workload().order_by(ordering, 'username', 'pk')
+    page_obj = Paginator(assistants, get_page_size(request.GET.get('page_size'))).get_page(request.GET.get('page'))
+
     context = {
-        'assistants': assistants,
+        'assistants': page_obj,
+        'page_obj': page_obj,
+        'sort': sort,
+        'sort_links': {key: sort_query(request.GET, key, sort) for key in WORKLOAD_SORTS},
+        'completion_days': WORKLOAD_COMPLETION_DAYS,
     }
     return render(request, 'manager/assistants_list.html', context)
 
@@ -207,12 +212,13 @@ def reports(request):
         total_units=Count('sections__units')
     ).order_by('-total_units')
     
+    stats = location_stats()
     context = {
         'faculty_stats': faculty_stats,
         'zone_stats': zone_stats,
-        'total_units': Unit.objects.count(),
-        'active_units': Unit.objects.filter(is_active=True).count(),
-        'inactive_units': Unit.objects.filter(is_active=False).count(),
+        'total_units': stats['total_units'],
+        'active_units': stats['active_units'],
+        'inactive_units': stats['inactive_units'],
     }
     return render(request, 'manager/reports.html', context)
 
@@ -333,7 +339,7 @@ def zone_update(request, zone_id):
 @user_passes_test(is_manager, login_url='login')
 def zone_delete(request, zone_id):
     """Delete a zone"""
-    zone = get_object_or_404(Zone, pk=zone_id)
+    zone = get_object_or_404(Zone.objects.with_counts(), pk=zone_id)
     
     if request.method == 'POST':
         zone_name = zone.zone_name
@@ -398,7 +404,7 @@ def section_update(request, section_id):
 @user_passes_test(is_manager, login_url='login')
 def section_delete(request, section_id):
     """Delete a section"""
-    section = get_object_or_404(Section, pk=section_id)
+    section = get_object_or_404(Section.objects.with_counts(), pk=section_id)
     
     if request.method == 'POST':
         section_name = section.section_name
@@ -463,7 +469,7 @@ def faculty_update(request, faculty_id):
 @user_passes_test(is_manager, login_url='login')
 def faculty_delete(request, faculty_id):
     """Delete a faculty"""
-    faculty = get_object_or_404(Faculty, pk=faculty_id)
+    faculty = get_object_or_404(Faculty.objects.with_counts(), pk=faculty_id)
     
     if request.method == 'POST':
         faculty_name = faculty.faculty_name